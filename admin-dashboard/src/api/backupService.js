@@ -18,11 +18,17 @@ export const downloadBackupFile = async (filename) => {
   return response;
 };
 
+export const verifyBackup = async (filename) => {
+  const response = await http.post(`/admin/backup/verify/${encodeURIComponent(filename)}`);
+  return response.data;
+};
+
+// The file is sent as the raw request body so the server can pipe it
+// into the restore while it uploads
 export const restoreBackup = async (file) => {
-  const formData = new FormData();
-  formData.append("file", file);
-  const response = await http.post("/admin/backup/restore", formData, {
-    headers: { "Content-Type": "multipart/form-data" },
+  const response = await http.post("/admin/backup/restore", file, {
+    params: { filename: file.name },
+    headers: { "Content-Type": "application/octet-stream" },
   });
   return response.data;
 };
\ No newline at end of file
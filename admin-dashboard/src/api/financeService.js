@@ -1,6 +1,12 @@
 import api from './http'
 
-export async function exportFinancialStatement({ dateFrom, dateTo, service = null }) {
+const POLL_INTERVAL_MS = 1000
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms))
+
+// Starts a background export (or picks up the cached PDF), polls it until
+// done and downloads the file. onProgress receives the fraction done, 0–1.
+export async function exportFinancialStatement({ dateFrom, dateTo, service = null, onProgress = () => {} }) {
   const params = new URLSearchParams({
     date_from: dateFrom,
     date_to:   dateTo,
@@ -10,16 +16,56 @@ export async function exportFinancialStatement({ dateFrom, dateTo, service = nul
     params.append('service', service)
   }
 
-  const response = await api.get(`/admin/finance/statement/export?${params.toString()}`, {
+  let { data: job } = await api.post(`/admin/finance/statement/jobs?${params.toString()}`)
+  onProgress(job.progress)
+
+  while (job.state === 'queued' || job.state === 'running') {
+    await sleep(POLL_INTERVAL_MS)
+    ;({ data: job } = await api.get(`/admin/finance/statement/jobs/${job.job_id}`))
+    onProgress(job.progress)
+  }
+
+  if (job.state !== 'done') {
+    throw new Error(job.error || 'Financial statement export failed')
+  }
+
+  const response = await api.get(`/admin/finance/statement/jobs/${job.job_id}/download`, {
+    responseType: 'blob',
+  })
+
+  const url  = window.URL.createObjectURL(new Blob([response.data], { type: 'application/pdf' }))
+  const link = document.createElement('a')
+  link.href  = url
+  link.setAttribute('download', job.filename)
+  document.body.appendChild(link)
+  link.click()
+
+  link.remove()
+  window.URL.revokeObjectURL(url)
+}
+
+// Spreadsheet of the statement's transactions; format is 'csv' or 'xlsx'
+export async function exportFinancialTransactions({ dateFrom, dateTo, service = null, format = 'csv' }) {
+  const params = new URLSearchParams({
+    date_from: dateFrom,
+    date_to:   dateTo,
+    format,
+  })
+
+  if (service) {
+    params.append('service', service)
+  }
+
+  const response = await api.get(`/admin/finance/transactions/export?${params.toString()}`, {
     responseType: 'blob',
   })
 
   const serviceSlug = service || 'all-services'
   const fromSlug    = dateFrom.replace(/-/g, '')
   const toSlug      = dateTo.replace(/-/g, '')
-  const filename    = `financial-statement_${serviceSlug}_${fromSlug}-${toSlug}.pdf`
+  const filename    = `financial-transactions_${serviceSlug}_${fromSlug}-${toSlug}.${format}`
 
-  const url  = window.URL.createObjectURL(new Blob([response.data], { type: 'application/pdf' }))
+  const url  = window.URL.createObjectURL(new Blob([response.data]))
   const link = document.createElement('a')
   link.href  = url
   link.setAttribute('download', filename)
@@ -28,4 +74,4 @@ export async function exportFinancialStatement({ dateFrom, dateTo, service = nul
 
   link.remove()
   window.URL.revokeObjectURL(url)
-}
\ No newline at end of file
+}
@@ -10,32 +10,24 @@ export const getAllNotifications = async () => {
   }
 }
 
-export const markNotificationRead = async (notificationId) => {
+// Both take notification uids and resolve to { detail, pending }, where
+// pending lists the uids the background writer has not stored yet
+export const markReadByUid = async (uids) => {
   try {
-    const response = await api.patch(`/admin/notifications/${notificationId}/read`)
+    const response = await api.post('/admin/notifications/mark-read-by-uid', uids)
     return response.data
   } catch (err) {
-    console.error('Failed to mark notification as read:', err)
+    console.error('Failed to mark notifications as read:', err)
     throw err
   }
 }
 
-export const bulkMarkRead = async (ids) => {
+export const deleteByUid = async (uids) => {
   try {
-    const response = await api.post('/admin/notifications/mark-read', ids)
+    const response = await api.post('/admin/notifications/bulk-delete-by-uid', uids)
     return response.data
   } catch (err) {
-    console.error('Failed to bulk mark notifications as read:', err)
+    console.error('Failed to delete notifications:', err)
     throw err
   }
 }
-
-export const bulkDeleteNotifications = async (ids) => {
-  try {
-    const response = await api.post('/admin/notifications/bulk-delete', ids)
-    return response.data
-  } catch (err) {
-    console.error('Failed to bulk delete notifications:', err)
-    throw err
-  }
-}
\ No newline at end of file
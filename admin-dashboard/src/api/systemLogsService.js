@@ -6,7 +6,7 @@ export const getSystemLogs = async (params = {}) => {
     return response.data;
   } catch (error) {
     console.error("Error fetching system logs:", error);
-    return { total: 0, page: 1, page_size: 20, results: [] };
+    return { total: 0, total_is_estimate: false, page: 1, page_size: 20, next_cursor: null, results: [] };
   }
 };
 
@@ -24,6 +24,17 @@ export function useWebSocket() {
     socket.onmessage = (event) => {
       try {
         const { event: type, data } = JSON.parse(event.data)
+
+        // Heartbeat — echo the server timestamp so it can measure latency
+        if (type === 'ping') {
+          socket.send(JSON.stringify({ event: 'pong', data }))
+          return
+        }
+
+        // Kiosk online/offline/latency updates are not notifications; fleet
+        // status is read from GET /admin/kiosks/status when needed
+        if (type === 'kiosk_presence') return
+
         // Hand off to notification store
         notificationStore.handleWebSocketEvent(type, data)
       } catch (err) {
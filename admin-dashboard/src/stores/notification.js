@@ -2,11 +2,13 @@ import { defineStore } from 'pinia'
 import { ref } from 'vue'
 import {
   getAllNotifications,
-  markNotificationRead,
-  bulkMarkRead,
-  bulkDeleteNotifications,
+  markReadByUid,
+  deleteByUid,
 } from '@/api/notifications'
 
+// Waits before re-sending uids the server reported as not stored yet
+const PENDING_RETRY_MS = [500, 1000, 2000, 4000]
+
 export const useNotificationStore = defineStore('notification', () => {
   const notifications = ref([])
 
@@ -38,6 +40,7 @@ export const useNotificationStore = defineStore('notification', () => {
   function toUIFormat(n) {
     return {
       id:     n.id,
+      uid:    n.uid,
       type:   n.type,
       event:  n.event || '', 
       msg:    n.msg,
@@ -57,11 +60,30 @@ export const useNotificationStore = defineStore('notification', () => {
     }
   }
 
+  // ── Live notifications are stored in the background and arrive with a uid
+  //    only (it stands in as their id), so actions go to the server by uid.
+  //    Uids the writer has not stored yet come back as pending and are
+  //    re-sent after a short wait ─────────────────────────────────────────────
+  function uidsOf(ids) {
+    return notifications.value.filter(n => ids.includes(n.id)).map(n => n.uid)
+  }
+
+  async function applyByUid(action, uids) {
+    let pending = uids
+    for (const delay of [0, ...PENDING_RETRY_MS]) {
+      if (!pending.length) return
+      if (delay) await new Promise(resolve => setTimeout(resolve, delay))
+      pending = (await action(pending)).pending
+    }
+    if (pending.length) console.error('[NotificationStore] Notifications never stored:', pending)
+  }
+
   // ── Called by useWebSocket when a new event arrives ───────────────────────
   function handleWebSocketEvent(type, data) {
     const now = new Date()
     notifications.value.unshift({
-      id:     data.db_id,
+      id:     data.uid,
+      uid:    data.uid,
       type:   mapType(type),
       event:  type,                    // ws event name for navigation
       msg:    buildMsg(type, data),
@@ -73,22 +95,20 @@ export const useNotificationStore = defineStore('notification', () => {
 
   // ── Actions ───────────────────────────────────────────────────────────────
   async function markRead(id) {
-    const notif = notifications.value.find(n => n.id === id)
-    if (notif) notif.unread = false
-    await markNotificationRead(id)
+    await markAllRead([id])
   }
 
   async function markAllRead(ids) {
-    ids.forEach(id => {
-      const notif = notifications.value.find(n => n.id === id)
-      if (notif) notif.unread = false
+    notifications.value.forEach(n => {
+      if (ids.includes(n.id)) n.unread = false
     })
-    await bulkMarkRead(ids)
+    await applyByUid(markReadByUid, uidsOf(ids))
   }
 
   async function deleteMany(ids) {
+    const uids = uidsOf(ids)
     notifications.value = notifications.value.filter(n => !ids.includes(n.id))
-    await bulkDeleteNotifications(ids)
+    await applyByUid(deleteByUid, uids)
   }
 
   return {
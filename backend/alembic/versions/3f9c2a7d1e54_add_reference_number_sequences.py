@@ -0,0 +1,77 @@
+"""add reference number sequences
+
+Revision ID: 3f9c2a7d1e54
+Revises: e1a96c61fd1a
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1e54'
+down_revision: Union[str, Sequence[str], None] = 'e1a96c61fd1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# sequence name -> query returning the highest number already issued
+_SEQUENCES = {
+    'document_request_no_seq': (
+        "SELECT MAX(CAST(SUBSTRING(transaction_no FROM 4) AS INTEGER)) "
+        "FROM document_requests WHERE transaction_no ~ '^DR-[0-9]+$'"
+    ),
+    'id_request_no_seq': (
+        "SELECT MAX(CAST(SUBSTRING(transaction_no FROM 4) AS INTEGER)) "
+        "FROM document_requests WHERE transaction_no ~ '^ID-[0-9]+$'"
+    ),
+    'equipment_request_no_seq': (
+        "SELECT MAX(CAST(SUBSTRING(transaction_no FROM 4) AS INTEGER)) "
+        "FROM equipment_requests WHERE transaction_no ~ '^ER-[0-9]+$'"
+    ),
+    'brgy_id_number_seq': (
+        "SELECT MAX(CAST(brgy_id_number AS INTEGER)) "
+        "FROM barangay_ids WHERE brgy_id_number ~ '^[0-9]+$'"
+    ),
+}
+
+
+def _blotter_years() -> list[int]:
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT DISTINCT CAST(SUBSTRING(blotter_no FROM 1 FOR 4) AS INTEGER) "
+        "FROM blotter_records WHERE blotter_no ~ '^[0-9]{4}-[0-9]+$'"
+    )).scalars().all()
+    return sorted(set(rows) | {datetime.now().year})
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    sequences = dict(_SEQUENCES)
+    for year in _blotter_years():
+        sequences[f'blotter_no_{year}_seq'] = (
+            "SELECT MAX(CAST(SUBSTRING(blotter_no FROM 6) AS INTEGER)) "
+            f"FROM blotter_records WHERE blotter_no ~ '^{year}-[0-9]+$'"
+        )
+
+    for name, floor_sql in sequences.items():
+        op.execute(f"CREATE SEQUENCE IF NOT EXISTS {name}")
+        op.execute(
+            f"SELECT setval('{name}', GREATEST(COALESCE(({floor_sql}), 0), 1), "
+            f"COALESCE(({floor_sql}), 0) > 0)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    blotter_sequences = bind.execute(sa.text(
+        "SELECT sequencename FROM pg_sequences WHERE sequencename ~ '^blotter_no_[0-9]{4}_seq$'"
+    )).scalars().all()
+
+    for name in [*_SEQUENCES, *blotter_sequences]:
+        op.execute(f"DROP SEQUENCE IF EXISTS {name}")
@@ -0,0 +1,37 @@
+"""add kiosk_presence table
+
+Revision ID: 6d0b3e8f25a1
+Revises: a92e4f1c7d30
+Create Date: 2026-10-19 13:48:36.902514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d0b3e8f25a1'
+down_revision: Union[str, Sequence[str], None] = 'a92e4f1c7d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('kiosk_presence',
+    sa.Column('kiosk_id', sa.String(length=64), nullable=False),
+    sa.Column('app_version', sa.String(length=32), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('is_online', sa.Boolean(), nullable=False),
+    sa.Column('connected_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('latency_ms', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('kiosk_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('kiosk_presence')
@@ -0,0 +1,35 @@
+"""add image_hash to announcements
+
+Revision ID: 8b41d6e0c2f7
+Revises: 3f9c2a7d1e54
+Create Date: 2026-10-19 11:03:27.540118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b41d6e0c2f7'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d1e54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('announcements', sa.Column('image_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_announcements_image_hash'), 'announcements', ['image_hash'], unique=False)
+    # Existing images get their hash now; resized variants are rendered on first request
+    op.execute(
+        "UPDATE announcements SET image_hash = encode(sha256(image), 'hex') "
+        "WHERE image IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_announcements_image_hash'), table_name='announcements')
+    op.drop_column('announcements', 'image_hash')
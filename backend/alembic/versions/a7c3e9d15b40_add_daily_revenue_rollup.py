@@ -0,0 +1,58 @@
+"""add daily revenue rollup
+
+Revision ID: a7c3e9d15b40
+Revises: f4c81b2d9e07
+Create Date: 2026-10-19 18:05:41.208317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d15b40'
+down_revision: Union[str, Sequence[str], None] = 'f4c81b2d9e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_revenue',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('service', sa.String(length=20), nullable=False),
+    sa.Column('doctype_id', sa.SmallInteger(), nullable=False),
+    sa.Column('payment_status', sa.String(length=10), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('request_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'service', 'doctype_id', 'payment_status')
+    )
+    op.execute("""
+        INSERT INTO daily_revenue (day, service, doctype_id, payment_status, amount, request_count)
+        SELECT requested_at::date,
+               CASE WHEN doctype_id IS NULL THEN 'id_services' ELSE 'documents' END,
+               COALESCE(doctype_id, 0),
+               CASE WHEN payment_status = 'paid' THEN 'paid' ELSE 'unpaid' END,
+               SUM(COALESCE(price, 0)),
+               COUNT(*)
+        FROM document_requests
+        GROUP BY 1, 2, 3, 4
+        UNION ALL
+        SELECT requested_at::date,
+               'equipment',
+               0,
+               CASE WHEN is_refunded THEN 'refunded'
+                    WHEN payment_status = 'paid' THEN 'paid'
+                    ELSE 'unpaid' END,
+               SUM(COALESCE(total_cost, 0)),
+               COUNT(*)
+        FROM equipment_requests
+        GROUP BY 1, 4
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_revenue')
@@ -0,0 +1,34 @@
+"""add uid to notifications
+
+Revision ID: a92e4f1c7d30
+Revises: c5d27e9a4b13
+Create Date: 2026-10-19 13:02:10.417285
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a92e4f1c7d30'
+down_revision: Union[str, Sequence[str], None] = 'c5d27e9a4b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'notifications',
+        sa.Column('uid', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False)
+    )
+    op.create_unique_constraint('uq_notifications_uid', 'notifications', ['uid'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_notifications_uid', 'notifications', type_='unique')
+    op.drop_column('notifications', 'uid')
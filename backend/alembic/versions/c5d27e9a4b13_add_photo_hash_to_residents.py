@@ -0,0 +1,35 @@
+"""add photo_hash to residents
+
+Revision ID: c5d27e9a4b13
+Revises: 8b41d6e0c2f7
+Create Date: 2026-10-19 12:14:52.803316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d27e9a4b13'
+down_revision: Union[str, Sequence[str], None] = '8b41d6e0c2f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('residents', sa.Column('photo_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_residents_photo_hash'), 'residents', ['photo_hash'], unique=False)
+    # Existing photos get their hash now; variants are rendered on first request
+    op.execute(
+        "UPDATE residents SET photo_hash = encode(sha256(photo), 'hex') "
+        "WHERE photo IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_residents_photo_hash'), table_name='residents')
+    op.drop_column('residents', 'photo_hash')
@@ -0,0 +1,32 @@
+"""add finance data versions
+
+Revision ID: c5e1f08a3d72
+Revises: a7c3e9d15b40
+Create Date: 2026-10-19 19:12:07.553018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e1f08a3d72'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9d15b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('finance_data_versions',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('finance_data_versions')
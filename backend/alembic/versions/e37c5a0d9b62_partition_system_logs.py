@@ -0,0 +1,128 @@
+"""partition system_logs by month and add daily counts
+
+Revision ID: e37c5a0d9b62
+Revises: 6d0b3e8f25a1
+Create Date: 2026-10-19 14:31:05.118430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e37c5a0d9b62'
+down_revision: Union[str, Sequence[str], None] = '6d0b3e8f25a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_COLUMNS = (
+    "id, actor_id, actor_name, actor_role, action, category, level, source, "
+    "target_type, target_id, details, ip_address, endpoint, http_method, "
+    "status_code, created_at"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE system_logs RENAME TO system_logs_legacy")
+    op.execute("ALTER INDEX IF EXISTS ix_system_logs_id RENAME TO ix_system_logs_legacy_id")
+    op.execute("ALTER TABLE system_logs_legacy RENAME CONSTRAINT system_logs_pkey TO system_logs_legacy_pkey")
+
+    op.execute("""
+        CREATE TABLE system_logs (
+            id          INTEGER NOT NULL DEFAULT nextval('system_logs_id_seq'),
+            actor_id    INTEGER,
+            actor_name  VARCHAR(100),
+            actor_role  VARCHAR(50),
+            action      VARCHAR(150) NOT NULL,
+            category    logcategory NOT NULL,
+            level       loglevel NOT NULL,
+            source      logsource NOT NULL,
+            target_type VARCHAR(100),
+            target_id   INTEGER,
+            details     TEXT,
+            ip_address  VARCHAR(45),
+            endpoint    VARCHAR(200),
+            http_method VARCHAR(10),
+            status_code INTEGER,
+            created_at  TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # One partition per month from the oldest existing log through three months ahead
+    op.execute("""
+        DO $$
+        DECLARE
+            month_start date;
+            last_month  date := (date_trunc('month', now()) + interval '3 months')::date;
+        BEGIN
+            SELECT date_trunc('month', COALESCE(MIN(created_at), now()))::date
+              INTO month_start FROM system_logs_legacy;
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF system_logs FOR VALUES FROM (%L) TO (%L)',
+                    'system_logs_' || to_char(month_start, 'YYYY_MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute(f"INSERT INTO system_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM system_logs_legacy")
+    op.execute("ALTER SEQUENCE system_logs_id_seq OWNED BY system_logs.id")
+    op.drop_table('system_logs_legacy')
+
+    op.create_primary_key('system_logs_pkey', 'system_logs', ['id', 'created_at'])
+    op.create_index(op.f('ix_system_logs_id'), 'system_logs', ['id'], unique=False)
+    op.create_index('ix_system_logs_created_at_id', 'system_logs', ['created_at', 'id'], unique=False)
+
+    op.create_table('system_log_daily_counts',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('level', postgresql.ENUM('INFO', 'WARNING', 'ERROR', 'CRITICAL', name='loglevel', create_type=False), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'level')
+    )
+    op.execute("""
+        INSERT INTO system_log_daily_counts (day, level, count)
+        SELECT created_at::date, level, COUNT(*) FROM system_logs GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('system_log_daily_counts')
+
+    op.execute("ALTER TABLE system_logs RENAME TO system_logs_partitioned")
+    op.execute("ALTER INDEX ix_system_logs_id RENAME TO ix_system_logs_partitioned_id")
+    op.execute("ALTER TABLE system_logs_partitioned RENAME CONSTRAINT system_logs_pkey TO system_logs_partitioned_pkey")
+    op.execute("""
+        CREATE TABLE system_logs (
+            id          INTEGER NOT NULL DEFAULT nextval('system_logs_id_seq'),
+            actor_id    INTEGER,
+            actor_name  VARCHAR(100),
+            actor_role  VARCHAR(50),
+            action      VARCHAR(150) NOT NULL,
+            category    logcategory NOT NULL,
+            level       loglevel NOT NULL,
+            source      logsource NOT NULL,
+            target_type VARCHAR(100),
+            target_id   INTEGER,
+            details     TEXT,
+            ip_address  VARCHAR(45),
+            endpoint    VARCHAR(200),
+            http_method VARCHAR(10),
+            status_code INTEGER,
+            created_at  TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT system_logs_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f"INSERT INTO system_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM system_logs_partitioned")
+    op.execute("ALTER SEQUENCE system_logs_id_seq OWNED BY system_logs.id")
+    op.execute("DROP TABLE system_logs_partitioned")
+    op.create_index(op.f('ix_system_logs_id'), 'system_logs', ['id'], unique=False)
@@ -0,0 +1,30 @@
+"""add backup status to system config
+
+Revision ID: f4c81b2d9e07
+Revises: e37c5a0d9b62
+Create Date: 2026-10-19 15:48:22.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c81b2d9e07'
+down_revision: Union[str, Sequence[str], None] = 'e37c5a0d9b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('system_config', sa.Column('last_backup_status', sa.String(length=20), nullable=True))
+    op.add_column('system_config', sa.Column('last_backup_error', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('system_config', 'last_backup_error')
+    op.drop_column('system_config', 'last_backup_status')
@@ -3,67 +3,93 @@ app/api/admin/backup.py
  
 Router for database backup and restore operations.
 Handles manual backup triggering, backup history listing,
-individual file downloads, and SQL restore uploads.
+individual file downloads, and restore uploads (.sql, .dump, or a .tar of
+a directory-format dump), which are piped into the restore as they arrive.
+Scheduled backups kept in the deduplicating archive are listed, downloaded
+and verified alongside the backup files. The /pitr endpoints cover WAL-based
+point-in-time recovery.
 """
 
-import os
-import subprocess
+import tarfile
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.requests import ClientDisconnect
 
-from app.api.deps import get_db, get_current_admin
+from app.api.deps import get_current_admin, get_db
 from app.models.admin import Admin
-from app.services.systemconfig_service import set_last_backup
-from app.core.config import settings
+from app.schemas.backup import PitrRestoreRequest, RestorePointCreate
+from app.services import backup_archive
+from app.services.backup_service import (
+    backup_format,
+    backup_size,
+    can_stream_backup,
+    create_backup,
+    get_backup_path,
+    list_backups,
+    record_backup,
+    recorded_checksum,
+    restore_from_stream,
+    stream_backup,
+    verify_stored_backup,
+)
+from app.services.pitr_service import (
+    cancel_staged_restore,
+    create_restore_point,
+    get_pitr_status,
+    request_base_backup,
+    stage_restore,
+)
 
 router = APIRouter(prefix="/backup")
 
-BACKUP_DIR = Path(settings.BACKUP_DIR)
-BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-
 
 # =================================================================================
 # INTERNAL HELPERS
 # =================================================================================
 
-def _parse_db_url(url: str) -> dict:
-    from urllib.parse import urlparse
-    parsed = urlparse(url)
-    return {
-        "user":     parsed.username or "postgres",
-        "password": parsed.password or "",
-        "host":     parsed.hostname or "localhost",
-        "port":     str(parsed.port or 5432),
-        "dbname":   parsed.path.lstrip("/"),
-    }
+def _format_size(size_bytes: int) -> str:
+    if size_bytes >= 1_048_576:
+        return f"{size_bytes / 1_048_576:.1f} MB"
+    if size_bytes >= 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    return f"{size_bytes} B"
+
+
+def _download_response(path: Path, headers: dict | None = None) -> StreamingResponse:
+    """Streams a backup; directory-format dumps are sent as an uncompressed tar."""
+    if path.is_dir():
+        filename = f"{path.name}.tar"
+
+        def iterfile():
+            # The members are already compressed by pg_dump, so the tar is not
+            with tempfile.TemporaryFile() as buffer:
+                with tarfile.open(fileobj=buffer, mode="w") as tar:
+                    tar.add(path, arcname=path.name)
+                buffer.seek(0)
+                while chunk := buffer.read(1024 * 1024):
+                    yield chunk
+    else:
+        filename = path.name
+
+        def iterfile():
+            with open(path, "rb") as f:
+                while chunk := f.read(1024 * 1024):
+                    yield chunk
 
-
-def _run_pg_dump(dest_path: Path) -> None:
-    db = _parse_db_url(settings.DATABASE_URL)
-    env = os.environ.copy()
-    env["PGPASSWORD"] = db["password"]
-
-    result = subprocess.run(
-        [
-            "pg_dump",
-            "-h", db["host"],
-            "-p", db["port"],
-            "-U", db["user"],
-            "-F", "p",          # plain SQL
-            "-f", str(dest_path),
-            db["dbname"],
-        ],
-        env=env,
-        capture_output=True,
-        text=True,
+    return StreamingResponse(
+        iterfile(),
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            **(headers or {}),
+        },
     )
-    if result.returncode != 0:
-        raise RuntimeError(f"pg_dump failed: {result.stderr.strip()}")
 
 
 # =================================================================================
@@ -71,70 +97,108 @@ def _run_pg_dump(dest_path: Path) -> None:
 # =================================================================================
 
 @router.post("", status_code=200)
-def trigger_manual_backup(
-    db: Session = Depends(get_db),
+async def trigger_manual_backup(
     _admin: Admin = Depends(get_current_admin),
 ):
-    timestamp   = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    filename    = f"backup_manual_{timestamp}.sql"
-    saved_path  = BACKUP_DIR / filename
-
+    """
+    Streams a fresh dump to the client while the same bytes are written to
+    BACKUP_DIR. Directory-format dumps cannot be streamed, so they are
+    written first and then sent as a tar.
+    """
     try:
-        _run_pg_dump(saved_path)
+        if can_stream_backup():
+            filename, body = await stream_backup("manual")
+            return StreamingResponse(
+                body,
+                media_type="application/octet-stream",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{filename}"',
+                    "X-Backup-Filename": filename,
+                },
+            )
+        saved_path = await run_in_threadpool(create_backup, "manual")
     except RuntimeError as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         )
 
-    set_last_backup(db)
-
-    def iterfile():
-        with open(saved_path, "rb") as f:
-            yield from f
-
-    return StreamingResponse(
-        iterfile(),
-        media_type="application/octet-stream",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-            "X-Backup-Filename": filename,
-        },
-    )
+    await run_in_threadpool(record_backup)
+    return _download_response(saved_path, {"X-Backup-Filename": f"{saved_path.name}.tar"})
 
 
 @router.get("/history")
 def list_backup_history(
     _admin: Admin = Depends(get_current_admin),
 ):
-    files = sorted(BACKUP_DIR.glob("backup_*.sql"), reverse=True)
     history = []
-    for f in files:
-        stat = f.stat()
-        size_bytes = stat.st_size
-        if size_bytes >= 1_048_576:
-            size_str = f"{size_bytes / 1_048_576:.1f} MB"
-        elif size_bytes >= 1024:
-            size_str = f"{size_bytes / 1024:.1f} KB"
-        else:
-            size_str = f"{size_bytes} B"
-
+    for f in list_backups():
+        size_bytes = backup_size(f)
         btype = "auto" if "_auto_" in f.name else "manual"
 
-        mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        mtime = datetime.fromtimestamp(f.stat().st_mtime, tz=timezone.utc)
+        checksum = recorded_checksum(f)
 
         history.append({
             "filename": f.name,
             "type":     btype,
-            "size":     size_str,
+            "format":   backup_format(f),
+            "storage":  "file",
+            "size":     _format_size(size_bytes),
             "size_bytes": size_bytes,
+            "sha256":   checksum,
             "created_at": mtime.isoformat(),
-            "status":   "success", 
+            "status":   "verified" if checksum else "unverified",
         })
 
+    for snapshot in backup_archive.list_snapshots():
+        history.append({
+            "filename": snapshot["name"],
+            "type":     "auto" if "_auto_" in snapshot["name"] else "manual",
+            "format":   "plain",
+            "storage":  "archive",
+            "size":     _format_size(snapshot["size"]),
+            "size_bytes": snapshot["size"],
+            "sha256":   snapshot["sha256"],
+            "created_at": snapshot["created_at"],
+            "status":   "verified" if snapshot["verified_at"] else "unverified",
+        })
+
+    history.sort(key=lambda b: b["created_at"], reverse=True)
     return history
 
 
+@router.get("/archive")
+def get_archive_usage(
+    _admin: Admin = Depends(get_current_admin),
+):
+    """Logical size of the archived snapshots against what is actually stored."""
+    snapshots = backup_archive.list_snapshots()
+    logical = sum(s["size"] for s in snapshots)
+    stored = backup_archive.archive_size()
+    return {
+        "snapshots":     len(snapshots),
+        "logical_bytes": logical,
+        "stored_bytes":  stored,
+        "logical":       _format_size(logical),
+        "stored":        _format_size(stored),
+    }
+
+
+@router.post("/verify/{filename}")
+def verify_backup_file(
+    filename: str,
+    _admin: Admin = Depends(get_current_admin),
+):
+    """Re-checks a stored backup against the checksum recorded when it was made."""
+    try:
+        return verify_stored_backup(filename)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Backup file not found.")
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
 # =================================================================================
 # DOWNLOAD & RESTORE
 # =================================================================================
@@ -144,10 +208,19 @@ def download_backup(
     filename: str,
     _admin: Admin = Depends(get_current_admin),
 ):
-    safe = BACKUP_DIR / Path(filename).name
-    if not safe.exists() or not safe.is_file():
-        raise HTTPException(status_code=404, detail="Backup file not found.")
+    safe = get_backup_path(filename)
+    if safe is None:
+        if backup_archive.get_snapshot(filename) is None:
+            raise HTTPException(status_code=404, detail="Backup file not found.")
+        # Reassembled from the archive's chunks as it is sent
+        return StreamingResponse(
+            backup_archive.iter_snapshot(filename),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
 
+    if safe.is_dir():
+        return _download_response(safe)
     return FileResponse(
         path=str(safe),
         media_type="application/octet-stream",
@@ -157,40 +230,79 @@ def download_backup(
 
 @router.post("/restore", status_code=200)
 async def restore_backup(
-    file: UploadFile = File(...),
+    request: Request,
+    filename: str = Query(..., description="Name of the uploaded backup file"),
     _admin: Admin = Depends(get_current_admin),
 ):
-    if not file.filename.endswith(".sql"):
-        raise HTTPException(status_code=400, detail="Only .sql files are accepted.")
+    """
+    Restores from the raw request body (the backup file itself, not a
+    multipart form), piping it into the restore as it is received.
+    """
+    try:
+        await restore_from_stream(filename, request.stream())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    except ClientDisconnect:
+        raise HTTPException(status_code=400, detail="Upload was interrupted.")
 
-    db_info = _parse_db_url(settings.DATABASE_URL)
-    env = os.environ.copy()
-    env["PGPASSWORD"] = db_info["password"]
+    return {"detail": "Database restored successfully."}
 
-    with tempfile.NamedTemporaryFile(suffix=".sql", delete=False) as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
 
-    try:
-        result = subprocess.run(
-            [
-                "psql",
-                "-h", db_info["host"],
-                "-p", db_info["port"],
-                "-U", db_info["user"],
-                "-d", db_info["dbname"],
-                "-f", tmp_path,
-            ],
-            env=env,
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Restore failed: {result.stderr.strip()}"
-            )
-    finally:
-        os.unlink(tmp_path)
+# =================================================================================
+# POINT-IN-TIME RECOVERY
+# =================================================================================
 
-    return {"detail": "Database restored successfully."}
\ No newline at end of file
+@router.get("/pitr")
+def get_pitr_overview(
+    db: Session = Depends(get_db),
+    _admin: Admin = Depends(get_current_admin),
+):
+    """Archiver health, the restorable window, base backups and restore points."""
+    return get_pitr_status(db)
+
+
+@router.post("/pitr/base-backup", status_code=202)
+async def trigger_base_backup(
+    _admin: Admin = Depends(get_current_admin),
+):
+    """
+    Hands a base backup to the job runner and returns at once; it is listed
+    under GET /pitr when pg_basebackup finishes.
+    """
+    await run_in_threadpool(request_base_backup)
+    return {"detail": "Base backup requested. It will be listed once the job runner finishes it."}
+
+
+@router.post("/pitr/restore-points", status_code=201)
+def add_restore_point(
+    payload: RestorePointCreate,
+    db: Session = Depends(get_db),
+    _admin: Admin = Depends(get_current_admin),
+):
+    """Marks a named point (e.g. before a bulk import) that a restore can target."""
+    return create_restore_point(db, payload.name)
+
+
+@router.post("/pitr/restore", status_code=202)
+def stage_pitr_restore(
+    payload: PitrRestoreRequest,
+    db: Session = Depends(get_db),
+    _admin: Admin = Depends(get_current_admin),
+):
+    """
+    Stages a restore to *target_time*. It is applied when the database
+    container next restarts; until then it can be cancelled.
+    """
+    return {
+        "detail": "Restore staged. Restart the database container to apply it.",
+        "staged_restore": stage_restore(db, payload.target_time),
+    }
+
+
+@router.delete("/pitr/restore", status_code=204)
+def cancel_pitr_restore(
+    _admin: Admin = Depends(get_current_admin),
+):
+    cancel_staged_restore()
@@ -6,12 +6,14 @@ Handles document type configuration, template uploads, request lifecycle
 (approve, reject, release, payment, undo), PDF generation, and notes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Body
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Body, Query
 from fastapi.responses import StreamingResponse, FileResponse
 from pathlib import Path
 from io import BytesIO
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from app.api.deps import get_db, get_current_admin
 from app.core.websocket_manager import ws_manager
 from app.schemas.document import (
     DocumentTypeAdminOut,
@@ -46,6 +48,7 @@ from app.services.document_service import (
     check_resident_eligibility
 )
 from app.services.document_service import PDF_STORAGE_DIR
+from app.services.export_service import export_document_requests, export_response, spreadsheet_filename
 
 router = APIRouter(prefix="/documents")
 
@@ -228,6 +231,22 @@ def list_document_requests(db: Session = Depends(get_db),):
     return [_format_request_for_admin(req) for req in requests]
 
 
+@router.get(
+    "/requests/export",
+    summary="[Admin] Export document requests as CSV or XLSX",
+    description="Streams every matching request as a spreadsheet, oldest first.",
+)
+def export_document_requests_file(
+    format:    str = Query("csv", description="'csv' or 'xlsx'"),
+    date_from: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to:   Optional[date] = Query(None, description="End date   (YYYY-MM-DD)"),
+    request_status: Optional[str] = Query(None, alias="status", description="Only requests in this status"),
+    current_admin=Depends(get_current_admin),
+):
+    chunks = export_document_requests(format, date_from, date_to, request_status)
+    return export_response(chunks, format, spreadsheet_filename("document-requests", format, date_from, date_to))
+
+
 @router.get( "/requests/{request_id}", response_model=DocumentRequestAdminDetail, )
 def get_document_request(request_id: int, db: Session = Depends(get_db),):
     request = get_document_request_by_id(db, request_id)
@@ -6,10 +6,11 @@ Handles inventory CRUD and equipment request lifecycle
 (approve, reject, pickup, return, payment, refund, undo, notes).
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from app.api.deps import get_db, get_current_admin
 from app.core.websocket_manager import ws_manager
 from app.schemas.equipment import (
     EquipmentInventoryOut,
@@ -19,6 +20,7 @@ from app.schemas.equipment import (
     EquipmentRequestAdminDetail,
 )
 from app.services import equipment_service
+from app.services.export_service import export_equipment_requests, export_response, spreadsheet_filename
 
 router = APIRouter(prefix="/equipment")
 
@@ -162,6 +164,22 @@ def get_equipment_requests(db: Session = Depends(get_db)):
     return [_format_request_for_admin(req) for req in requests]
 
 
+@router.get(
+    "/requests/export",
+    summary="[Admin] Export equipment requests as CSV or XLSX",
+    description="Streams every matching request, with its items, as a spreadsheet, oldest first.",
+)
+def export_equipment_requests_file(
+    format:    str = Query("csv", description="'csv' or 'xlsx'"),
+    date_from: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to:   Optional[date] = Query(None, description="End date   (YYYY-MM-DD)"),
+    request_status: Optional[str] = Query(None, alias="status", description="Only requests in this status"),
+    current_admin=Depends(get_current_admin),
+):
+    chunks = export_equipment_requests(format, date_from, date_to, request_status)
+    return export_response(chunks, format, spreadsheet_filename("equipment-requests", format, date_from, date_to))
+
+
 @router.get("/requests/{request_id}", response_model=EquipmentRequestAdminDetail)
 def get_equipment_request_detail(request_id: int, db: Session = Depends(get_db)):
     result = equipment_service.get_equipment_request_by_id(db, request_id)
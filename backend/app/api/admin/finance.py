@@ -1,21 +1,40 @@
 """
 app/api/admin/finance.py
  
-Router for financial statement exports.
+Router for financial statement exports and revenue summaries.
 Generates PDF financial statements covering Document Services,
-I.D Services, and/or Equipment Borrowing for a given date range.
-Accessible by all admin roles.
+I.D Services, and/or Equipment Borrowing for a given date range — as
+background jobs with progress, cached per period and data version — streams
+the same transactions as CSV/XLSX, and serves daily / monthly / yearly totals
+read from the daily_revenue rollup.
+Accessible by all admin roles; rebuilding the rollup needs a superadmin.
 """
 
 from datetime import date
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import Response
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_admin
-from app.services.finance_service import generate_financial_statement_pdf
+from app.api.deps import get_db, get_current_admin, require_superadmin
+from app.services.export_service import (
+    export_financial_transactions,
+    export_response,
+    spreadsheet_filename,
+)
+from app.services.finance_export_service import (
+    export_filename,
+    get_export_file,
+    get_export_status,
+    get_or_build_statement,
+    start_export,
+)
+from app.services.revenue_service import (
+    SUMMARY_PERIODS,
+    get_revenue_summary,
+    rebuild_daily_revenue,
+)
 
 router = APIRouter(prefix="/finance")
 
@@ -25,10 +44,11 @@ router = APIRouter(prefix="/finance")
     summary="[Admin] Export financial statement as PDF",
     description=(
         "Generates a PDF financial statement covering Document Services, "
-        "I.D Services, and/or Equipment Borrowing for a given date range. "
-        "Accessible by all admin roles."
+        "I.D Services, and/or Equipment Borrowing for a given date range, "
+        "in this request. Served from the statement cache when the period's "
+        "data has not changed. Accessible by all admin roles."
     ),
-    response_class=Response,
+    response_class=FileResponse,
     responses={
         200: {
             "content": {"application/pdf": {}},
@@ -45,38 +65,137 @@ def export_financial_statement(
     ),
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin), 
+):
+    path = get_or_build_statement(db, date_from, date_to, service)
+    return FileResponse(path, media_type="application/pdf", filename=export_filename(path.stem))
+
+
+@router.get(
+    "/transactions/export",
+    summary="[Admin] Export financial transactions as CSV or XLSX",
+    description=(
+        "Streams the transactions a financial statement covers, one row each, "
+        "as a spreadsheet. Accessible by all admin roles."
+    ),
+)
+def export_financial_transactions_file(
+    date_from: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    date_to:   date = Query(..., description="End date   (YYYY-MM-DD)"),
+    service:   Optional[str] = Query(
+        None,
+        description="Filter: 'documents', 'id_services', 'equipment', or omit for all",
+    ),
+    format:    str = Query("csv", description="'csv' or 'xlsx'"),
+    current_admin=Depends(get_current_admin),
+):
+    chunks = export_financial_transactions(format, date_from, date_to, service)
+    name = f"financial-transactions_{service or 'all-services'}"
+    return export_response(chunks, format, spreadsheet_filename(name, format, date_from, date_to))
+
+
+@router.post(
+    "/statement/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="[Admin] Start a financial statement export",
+    description=(
+        "Queues generation of a PDF financial statement in the background and "
+        "returns its job. A statement whose period has not changed since it "
+        "was last generated comes back already done. Accessible by all admin roles."
+    ),
+)
+def start_financial_statement_export(
+    date_from: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    date_to:   date = Query(..., description="End date   (YYYY-MM-DD)"),
+    service:   Optional[str] = Query(
+        None,
+        description="Filter: 'documents', 'id_services', 'equipment', or omit for all",
+    ),
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
+):
+    return start_export(db, date_from, date_to, service)
+
+
+@router.get(
+    "/statement/jobs/{job_id}",
+    summary="[Admin] Financial statement export status",
+    description="State (queued, running, done, failed) and progress (0–1) of an export job.",
+)
+def get_financial_statement_export(
+    job_id: str,
+    current_admin=Depends(get_current_admin),
+):
+    return get_export_status(job_id)
+
+
+@router.get(
+    "/statement/jobs/{job_id}/download",
+    summary="[Admin] Download a finished financial statement",
+    response_class=FileResponse,
+    responses={
+        200: {
+            "content": {"application/pdf": {}},
+            "description": "PDF file download",
+        }
+    },
+)
+def download_financial_statement_export(
+    job_id: str,
+    current_admin=Depends(get_current_admin),
+):
+    path = get_export_file(job_id)
+    return FileResponse(path, media_type="application/pdf", filename=export_filename(job_id))
+
+
+@router.get(
+    "/summary",
+    summary="[Admin] Revenue summary by period and service",
+    description=(
+        "Collected, pending and refunded totals per day, month or year and per "
+        "service, plus a breakdown by document type. Read from the daily "
+        "revenue rollup. Accessible by all admin roles."
+    ),
+)
+def get_finance_summary(
+    date_from: date = Query(..., description="Start date (YYYY-MM-DD)"),
+    date_to:   date = Query(..., description="End date   (YYYY-MM-DD)"),
+    group_by:  str  = Query("month", description="'day', 'month' or 'year'"),
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin),
 ):
     if date_from > date_to:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="date_from must be on or before date_to",
         )
+    if group_by not in SUMMARY_PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid group_by '{group_by}'. Use: day, month, year",
+        )
 
-    allowed_services = {"documents", "id_services", "equipment", None}
-    if service not in allowed_services:
+    return get_revenue_summary(db, date_from, date_to, group_by)
+
+
+@router.post(
+    "/summary/rebuild",
+    summary="[Superadmin] Rebuild the daily revenue rollup",
+    description=(
+        "Recomputes the rollup from the request tables for the given range, "
+        "or for all history if no range is given."
+    ),
+)
+def rebuild_finance_summary(
+    date_from: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to:   Optional[date] = Query(None, description="End date   (YYYY-MM-DD)"),
+    db: Session = Depends(get_db),
+    current_admin=Depends(require_superadmin),
+):
+    if date_from and date_to and date_from > date_to:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid service filter '{service}'. Use: documents, id_services, equipment",
+            detail="date_from must be on or before date_to",
         )
 
-    pdf_bytes = generate_financial_statement_pdf(
-        db=db,
-        date_from=date_from,
-        date_to=date_to,
-        service_filter=service,
-    )
-
-    service_slug = service or "all-services"
-    filename = (
-        f"financial-statement_{service_slug}"
-        f"_{date_from.strftime('%Y%m%d')}-{date_to.strftime('%Y%m%d')}.pdf"
-    )
-
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-            "Content-Length": str(len(pdf_bytes)),
-        },
-    )
\ No newline at end of file
+    rows = rebuild_daily_revenue(db, date_from, date_to)
+    return {"detail": f"Daily revenue rebuilt ({rows} rows)."}
@@ -0,0 +1,25 @@
+"""
+app/api/admin/kiosks.py
+
+Router for kiosk fleet monitoring.
+Lists every kiosk that has connected, whether it is online right now, and
+its last heartbeat round-trip latency. Live changes are pushed to the admin
+websocket as "kiosk_presence" events.
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.schemas.kiosk_presence import KioskPresenceOut
+from app.services.kiosk_presence_service import get_fleet_status
+
+router = APIRouter(prefix="/kiosks")
+
+
+# =================================================================================
+# FLEET STATUS
+# =================================================================================
+
+@router.get("/status", response_model=list[KioskPresenceOut])
+def kiosk_fleet_status(db: Session = Depends(get_db)):
+    return get_fleet_status(db)
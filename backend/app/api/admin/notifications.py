@@ -4,8 +4,11 @@ app/api/admin/notifications.py
 Router for admin notification management.
 Handles listing all notifications and marking individual
 or multiple notifications as read, as well as bulk deletion.
+The by-uid variants also cover live notifications the background writer
+has not stored yet; they return those uids as "pending" for a retry.
 """
 
+from uuid import UUID
 from fastapi import APIRouter, Depends, Body
 from sqlalchemy.orm import Session
 from app.api.deps import get_db
@@ -15,6 +18,8 @@ from app.services.notification_service import (
     mark_read,
     mark_many_read,
     delete_many,
+    mark_read_by_uid,
+    delete_by_uid,
 )
 
 router = APIRouter(prefix="/notifications")
@@ -48,4 +53,16 @@ def bulk_mark_read(ids: list[int] = Body(...), db: Session = Depends(get_db)):
 @router.post("/bulk-delete")
 def bulk_delete_notifications(ids: list[int] = Body(...), db: Session = Depends(get_db)):
     count = delete_many(db, ids)
-    return {"detail": f"{count} notifications deleted"}
\ No newline at end of file
+    return {"detail": f"{count} notifications deleted"}
+
+
+@router.post("/mark-read-by-uid")
+def bulk_mark_read_by_uid(uids: list[UUID] = Body(...), db: Session = Depends(get_db)):
+    pending = mark_read_by_uid(db, uids)
+    return {"detail": f"{len(uids) - len(pending)} notifications marked as read", "pending": pending}
+
+
+@router.post("/bulk-delete-by-uid")
+def bulk_delete_by_uid(uids: list[UUID] = Body(...), db: Session = Depends(get_db)):
+    pending = delete_by_uid(db, uids)
+    return {"detail": f"{len(uids) - len(pending)} notifications deleted", "pending": pending}
@@ -4,9 +4,11 @@ app/api/admin/residents.py
 Router for resident record management.
 Handles listing, detail retrieval, creation, update of personal info,
 address, and RFID assignment, as well as resident deletion and purok lookup.
+Also serves the resized resident photo variants to signed-in admins.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List
 from app.schemas.resident import (
@@ -31,10 +33,15 @@ from app.services.resident_service import (
     reset_resident_pin,
     get_all_puroks
 )
-from app.api.deps import get_db
+from app.services.image_service import resolve_variant_file
+from app.api.deps import get_current_admin, get_db
+from app.models.admin import Admin
 
 router = APIRouter(prefix="/residents")
 
+# Content-hashed, so never stale; private keeps personal photos out of shared caches
+PHOTO_CACHE = "private, max-age=31536000, immutable"
+
 
 # =================================================================================
 # RESIDENT LISTING
@@ -123,4 +130,14 @@ def reset_resident_pin_endpoint(resident_id: int, db: Session = Depends(get_db))
 
 @router.get("/utils/puroks", response_model=List[PurokResponse])
 def list_puroks(db: Session = Depends(get_db)):
-    return get_all_puroks(db)
\ No newline at end of file
+    return get_all_puroks(db)
+
+
+@router.get("/photos/{filename}")
+def get_resident_photo(
+    filename: str,
+    db: Session = Depends(get_db),
+    _admin: Admin = Depends(get_current_admin),
+):
+    path, media_type = resolve_variant_file(db, filename, "resident_photo")
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": PHOTO_CACHE})
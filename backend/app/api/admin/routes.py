@@ -13,7 +13,7 @@ from app.api.admin import (
     document, auth, residents, equipment, feedback, announcement,
     blotter, transaction, faqs, id, audit, search, systemlogs,
     contact, systemconfig, backup, adminaccounts, finance,
-    notifications, sms,
+    notifications, sms, kiosks,
 )
 
 router = APIRouter()
@@ -43,6 +43,7 @@ router.include_router(adminaccounts.router)
 router.include_router(finance.router)
 router.include_router(notifications.router)
 router.include_router(sms.router)
+router.include_router(kiosks.router)
 
 
 # =================================================================================
@@ -13,7 +13,13 @@ from app.core.websocket_manager import ws_manager
 from app.api.deps import get_db, get_current_admin
 from app.models.admin import Admin
 from app.schemas.systemconfig import SystemConfigRead, SystemConfigUpdate
-from app.services.systemconfig_service import get_config, update_config
+from app.services.systemconfig_service import (
+    get_config,
+    update_config,
+    get_logo_bytes,
+    set_logo,
+    clear_logo,
+)
 from app.services.backup_service import apply_new_schedule
 
 router = APIRouter(prefix="/settings")
@@ -73,10 +79,7 @@ async def upload_brgy_logo(
     if len(contents) / (1024 * 1024) > MAX_LOGO_SIZE_MB:
         raise HTTPException(status_code=413, detail=f"File too large. Max size is {MAX_LOGO_SIZE_MB} MB.")
 
-    config = get_config(db)
-    config.brgy_logo = contents
-    config.brgy_logo_content_type = file.content_type
-    db.commit()
+    set_logo(db, contents)
 
     await ws_manager.broadcast_to_kiosk("config_updated", {"has_logo": True})
 
@@ -86,11 +89,8 @@ def get_brgy_logo(
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin),
 ):
-    config = get_config(db)
-    if not config.brgy_logo:
-        raise HTTPException(status_code=404, detail="No logo uploaded.")
-    content_type = getattr(config, "brgy_logo_content_type", None) or "image/png"
-    return Response(content=config.brgy_logo, media_type=content_type)
+    logo_bytes, content_type = get_logo_bytes(db)
+    return Response(content=logo_bytes, media_type=content_type)
 
 
 @router.delete("/logo", status_code=204)
@@ -98,9 +98,6 @@ async def delete_brgy_logo(
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin),
 ):
-    config = get_config(db)
-    config.brgy_logo = None
-    config.brgy_logo_content_type = None
-    db.commit()
+    clear_logo(db)
 
     await ws_manager.broadcast_to_kiosk("config_updated", {"has_logo": False})
\ No newline at end of file
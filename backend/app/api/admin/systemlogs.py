@@ -4,20 +4,61 @@ app/api/admin/systemlogs.py
 Router for system log access and analysis.
 Handles paginated log listing with rich filtering options,
 individual log detail retrieval, and a daily summary count by log level.
+
+Listing pages with an opaque keyset cursor over (created_at, id) so deep
+pages cost the same as the first, and reports an estimated total instead of
+counting every matching row.
 """
 
-from fastapi import APIRouter, Depends, Query
+import base64
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, func, select, text, tuple_
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
  
 from app.api.deps import get_db, get_current_admin
 from app.models.admin import Admin
-from app.models.systemlogs import SystemLog, LogSource, LogLevel, LogCategory
+from app.models.systemlogs import SystemLog, SystemLogDailyCount, LogSource, LogLevel, LogCategory
 from app.schemas.systemlogs import SystemLogRead, SystemLogListResponse
  
 router = APIRouter(prefix="/system-logs")
+
+# Filtered totals are counted exactly up to this many rows, then reported as "at least"
+COUNT_CAP = 10_000
+ 
+ 
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _encode_cursor(log: SystemLog) -> str:
+    raw = f"{log.created_at.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _estimate_total(db: Session, query) -> tuple[int, bool]:
+    """Returns (total, is_estimate)."""
+    if query.whereclause is None:
+        # Unfiltered: planner statistics summed over the monthly partitions
+        estimate = db.execute(text(
+            "SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'system_logs'::regclass"
+        )).scalar_one()
+        return int(estimate), True
+
+    capped = query.with_entities(SystemLog.id).limit(COUNT_CAP + 1).subquery()
+    total = db.execute(select(func.count()).select_from(capped)).scalar_one()
+    return min(total, COUNT_CAP), total > COUNT_CAP
  
  
 # =================================================================================
@@ -35,7 +76,8 @@ def get_system_logs(
     search:      Optional[str]         = Query(None, description="Search within action text"),
     date_from:   Optional[datetime]    = Query(None, description="Start of date range (ISO 8601)"),
     date_to:     Optional[datetime]    = Query(None, description="End of date range (ISO 8601)"),
-    page:        int                   = Query(1,  ge=1,         description="Page number"),
+    cursor:      Optional[str]         = Query(None, description="next_cursor from the previous page"),
+    page:        int                   = Query(1,  ge=1,         description="Page number (offset paging, used when no cursor is given)"),
     page_size:   int                   = Query(20, ge=1, le=100, description="Results per page"),
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin),
@@ -56,19 +98,25 @@ def get_system_logs(
     if filters:
         query = query.filter(and_(*filters))
  
-    total = query.count()
-    logs = (
-        query
-        .order_by(desc(SystemLog.created_at))
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    total, total_is_estimate = _estimate_total(db, query)
+
+    ordered = query.order_by(desc(SystemLog.created_at), desc(SystemLog.id))
+    if cursor:
+        ordered = ordered.filter(tuple_(SystemLog.created_at, SystemLog.id) < _decode_cursor(cursor))
+    else:
+        ordered = ordered.offset((page - 1) * page_size)
+
+    # One extra row tells us whether another page exists
+    logs = ordered.limit(page_size + 1).all()
+    has_more = len(logs) > page_size
+    logs = logs[:page_size]
  
     return SystemLogListResponse(
         total=total,
+        total_is_estimate=total_is_estimate,
         page=page,
         page_size=page_size,
+        next_cursor=_encode_cursor(logs[-1]) if has_more else None,
         results=logs,
     )
  
@@ -82,15 +130,12 @@ def get_log_summary(
     db: Session = Depends(get_db),
     current_admin: Admin = Depends(get_current_admin),
 ):
-    from sqlalchemy import func, cast, Date
-    from datetime import date
- 
     today = date.today()
  
+    # Maintained by the log flusher, so this is a handful of rows, not a scan
     results = (
-        db.query(SystemLog.level, func.count(SystemLog.id).label("count"))
-        .filter(func.cast(SystemLog.created_at, Date) == today)
-        .group_by(SystemLog.level)
+        db.query(SystemLogDailyCount.level, SystemLogDailyCount.count)
+        .filter(SystemLogDailyCount.day == today)
         .all()
     )
  
@@ -117,6 +162,5 @@ def get_log_detail(
 ):
     log = db.query(SystemLog).filter(SystemLog.id == log_id).first()
     if not log:
-        from fastapi import HTTPException, status
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Log entry not found")
     return log
\ No newline at end of file
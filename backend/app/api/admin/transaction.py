@@ -2,14 +2,17 @@
 app/api/admin/transaction.py
 
 Router for resident transaction history.
-Exposes a single endpoint to retrieve the combined document
-and equipment transaction history for a given resident.
+Retrieves the combined document and equipment transaction history for a
+given resident, and exports the history as a CSV or XLSX spreadsheet.
 """
 
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.api.deps import get_db
+from app.api.deps import get_db, get_current_admin
 from app.schemas.transaction import TransactionHistoryOut
+from app.services.export_service import export_response, export_transaction_history, spreadsheet_filename
 from app.services.transaction_service import get_transaction_history
 
 router = APIRouter(prefix="/transactions")
@@ -19,9 +22,26 @@ router = APIRouter(prefix="/transactions")
 # TRANSACTION HISTORY
 # =================================================================================
 
+@router.get(
+    "/history/export",
+    summary="[Admin] Export transaction history as CSV or XLSX",
+    description="Streams the transaction history, for every resident or just one, as a spreadsheet.",
+)
+def export_transaction_history_file(
+    format:      str = Query("csv", description="'csv' or 'xlsx'"),
+    date_from:   Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to:     Optional[date] = Query(None, description="End date   (YYYY-MM-DD)"),
+    resident_id: Optional[int] = Query(None, description="Only this resident's transactions"),
+    current_admin=Depends(get_current_admin),
+):
+    chunks = export_transaction_history(format, date_from, date_to, resident_id)
+    return export_response(chunks, format, spreadsheet_filename("transaction-history", format, date_from, date_to))
+
+
 @router.get(
     "/history/{resident_id}",
     response_model=list[TransactionHistoryOut]
 )
 def get_resident_transaction_history(resident_id: int, db: Session = Depends(get_db)):
-    return get_transaction_history(db, resident_id)
\ No newline at end of file
+    return get_transaction_history(db, resident_id)
+
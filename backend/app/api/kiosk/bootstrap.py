@@ -0,0 +1,31 @@
+"""
+app/api/kiosk/bootstrap.py
+
+Router for the kiosk bootstrap bundle.
+Serves every admin-managed dataset the kiosk needs in one response,
+with a strong ETag so refreshes after idle timeouts are a single
+conditional request that usually ends in 304 Not Modified.
+"""
+
+from fastapi import APIRouter, Depends, Header, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.schemas.bootstrap import KioskBootstrapOut
+from app.services.bootstrap_service import get_bootstrap_bundle, etag_matches
+
+router = APIRouter(prefix="/bootstrap")
+
+
+@router.get("", response_model=KioskBootstrapOut)
+def get_kiosk_bootstrap(
+    if_none_match: str | None = Header(None),
+    db: Session = Depends(get_db),
+):
+    etag, body = get_bootstrap_bundle(db)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
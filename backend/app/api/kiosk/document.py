@@ -66,7 +66,7 @@ async def submit_document_request(
             "document_type": "Document",
             "transaction_no": getattr(result, 'transaction_no', ''),
         },
-        db=db
+        persist=True
     )
     return result
 
@@ -55,7 +55,7 @@ async def create_equipment_request(
             "resident_name": resident_name,
             "transaction_no": getattr(result, 'transaction_no', ''),
         },
-        db=db
+        persist=True
     )
     return result
 
@@ -40,6 +40,6 @@ async def submit_feedback(
             "resident_name": resident_name,
             "rating": getattr(payload, 'rating', None),
         },
-        db=db
+        persist=True
     )
     return result
\ No newline at end of file
@@ -125,7 +125,7 @@ async def apply(payload: IDApplicationRequest, db: Session = Depends(get_db)):
             "resident_name": resident_name,
             "transaction_no": getattr(result, 'transaction_no', ''),
         },
-        db=db
+        persist=True
     )
     return result
 
@@ -183,6 +183,6 @@ async def submit_lost_card_report(payload: ReportLostCardRequest, db: Session =
             "event": "new_lost_card_report",
             "resident_name": resident_name,
         },
-        db=db
+        persist=True
     )
     return result
\ No newline at end of file
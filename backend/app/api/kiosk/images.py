@@ -0,0 +1,26 @@
+"""
+app/api/kiosk/images.py
+
+Router for processed announcement image variants.
+Serves content-hashed image files (announcement banners and thumbnails)
+with immutable cache headers, so the kiosk browser downloads each image once.
+Resident photo variants are not served here: they are personal data and go
+through the authenticated /admin/residents/photos route with private caching.
+"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.services.image_service import resolve_variant_file
+
+router = APIRouter(prefix="/images")
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+@router.get("/{filename}")
+def get_image_variant(filename: str, db: Session = Depends(get_db)):
+    path, media_type = resolve_variant_file(db, filename, "announcement")
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": IMMUTABLE_CACHE})
@@ -85,6 +85,6 @@ async def link_rfid(payload: LinkRFIDRequest, db: Session = Depends(get_db)):
             "type": "Document",
             "resident_name": f"Resident #{payload.resident_id}",
         },
-        db=db
+        persist=True
     )
     return result
\ No newline at end of file
@@ -10,7 +10,7 @@ from fastapi import APIRouter
 from app.api.kiosk import (
     auth, document, residents, equipment, feedback,
     announcement, transaction, faqs, id, registration,
-    contact, systemconfig, exitkiosk,
+    contact, systemconfig, exitkiosk, bootstrap, images,
 )
 
 router = APIRouter()
@@ -32,6 +32,8 @@ router.include_router(registration.router)
 router.include_router(contact.router)
 router.include_router(systemconfig.router)
 router.include_router(exitkiosk.router)
+router.include_router(bootstrap.router)
+router.include_router(images.router)
 
 
 # =================================================================================
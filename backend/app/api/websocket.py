@@ -8,8 +8,10 @@ async def admin_websocket(websocket: WebSocket):
     await ws_manager.connect_admin(websocket)
     try:
         while True:
-            await websocket.receive_text()
+            ws_manager.handle_message(websocket, await websocket.receive_text())
     except WebSocketDisconnect:
+        pass
+    finally:
         ws_manager.disconnect(websocket)
 
 
@@ -18,6 +20,8 @@ async def kiosk_websocket(websocket: WebSocket):
     await ws_manager.connect_kiosk(websocket)
     try:
         while True:
-            await websocket.receive_text()
+            ws_manager.handle_message(websocket, await websocket.receive_text())
     except WebSocketDisconnect:
+        pass
+    finally:
         ws_manager.disconnect(websocket)
\ No newline at end of file
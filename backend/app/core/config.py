@@ -10,6 +10,74 @@ class Settings(BaseSettings):
 
     BACKUP_DIR: str = "./backups/barangay"
 
+    # pg_dump output: "custom" (.dump), "directory" (.dir, dumped and
+    # restored in parallel) or "plain" (.sql, restored through psql)
+    BACKUP_FORMAT:      str = "custom"
+    BACKUP_COMPRESSION: int = 6
+    BACKUP_JOBS:        int = 4
+
+    # Every dump is checked (pg_restore --list, or pg_dump's completion
+    # marker for plain dumps) and its SHA-256 recorded; BACKUP_VERIFY_RESTORE
+    # also restores it into a scratch database. Scheduled backups go to the deduplicating archive
+    # (app/services/backup_archive.py) and are thinned to the newest per
+    # day / ISO week / month for the given number of periods
+    BACKUP_VERIFY_RESTORE: bool = False
+    BACKUP_DEDUP:          bool = True
+    BACKUP_KEEP_DAILY:     int  = 7
+    BACKUP_KEEP_WEEKLY:    int  = 4
+    BACKUP_KEEP_MONTHLY:   int  = 12
+
+    # Scheduled backups and log maintenance run in `python -m app.job_runner`;
+    # set this only for single-process setups without a job runner
+    RUN_JOBS_IN_API: bool = False
+
+    # Point-in-time recovery: Postgres archives WAL into WAL_ARCHIVE_DIR
+    # (see backend/postgres/), the job runner takes a base backup every
+    # BASE_BACKUP_INTERVAL_DAYS and keeps the newest BASE_BACKUPS_KEPT
+    PITR_ENABLED:             bool = False
+    WAL_ARCHIVE_DIR:          str  = "./backups/wal"
+    BASE_BACKUP_DIR:          str  = "./backups/base"
+    PITR_STAGING_DIR:         str  = "./backups/pitr"
+    BASE_BACKUP_INTERVAL_DAYS: int = 7
+    BASE_BACKUPS_KEPT:        int  = 2
+
+    # Financial statement PDFs, cached per period / service / data version
+    # (app/services/finance_export_service.py) and built by a small thread pool
+    FINANCE_EXPORT_DIR:     str = "./generated_docs/finance"
+    FINANCE_EXPORT_WORKERS: int = 2
+
+    # Upper bound on how long a worker trusts its cached SystemConfig and
+    # kiosk bootstrap bundle if a change notification is ever missed
+    CONFIG_CACHE_TTL: int = 300
+
+    # Per-socket outbound buffer; a client that lets it fill, or stalls on a
+    # single send longer than the timeout, is disconnected
+    WS_QUEUE_SIZE:   int   = 100
+    WS_SEND_TIMEOUT: float = 10.0
+
+    # Heartbeat: every socket is pinged each interval and dropped after
+    # this long without any inbound frame
+    WS_PING_INTERVAL: float = 20.0
+    WS_PING_TIMEOUT:  float = 60.0
+
+    # Admin notifications are bulk-inserted by a background writer
+    NOTIFICATION_FLUSH_MS:   int = 250
+    NOTIFICATION_BATCH_SIZE: int = 200
+
+    # System logs are buffered in memory and bulk-inserted in the background;
+    # the oldest pending entries are dropped once the buffer is full
+    SYSTEM_LOG_BUFFER_SIZE: int = 10000
+    SYSTEM_LOG_BATCH_SIZE:  int = 500
+    SYSTEM_LOG_FLUSH_MS:    int = 500
+
+    # Monthly system_logs partitions older than this are dropped
+    SYSTEM_LOG_RETENTION_MONTHS: int = 12
+
+    # Development/staging SQL inspector (app/core/query_inspector.py)
+    QUERY_INSPECTOR:             bool  = False
+    QUERY_SLOW_MS:               float = 200.0
+    QUERY_N_PLUS_ONE_THRESHOLD:  int   = 5
+
     # SMS Gateway (A7670E)
     SMS_PORT:        str   = "/dev/ttyUSB2"
     SMS_BAUD:        int   = 115200
@@ -0,0 +1,198 @@
+"""
+app/core/metrics.py
+
+Prometheus instrumentation for the backend.
+Defines every metric the app exports, the ASGI middleware that times each
+HTTP request (latency, in-flight count, DB queries and DB time per request),
+the SQLAlchemy hooks that feed the per-request DB figures, and the text
+exposition served at GET /metrics.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory before start-up so /metrics aggregates every worker's samples.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+# =================================================================================
+# METRIC DEFINITIONS
+# =================================================================================
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    multiprocess_mode="livesum",
+)
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of SQL statements executed per HTTP request.",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250),
+)
+HTTP_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per HTTP request.",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+PDF_CONVERSIONS = Counter(
+    "pdf_conversions_total",
+    "DOCX to PDF conversions through LibreOffice.",
+    ["kind", "outcome"],
+)
+PDF_CONVERSION_SECONDS = Histogram(
+    "pdf_conversion_duration_seconds",
+    "Time spent converting DOCX to PDF.",
+    ["kind"],
+    buckets=(0.5, 1, 2, 3, 5, 8, 13, 21, 30),
+)
+SMS_MESSAGES = Counter(
+    "sms_messages_total",
+    "SMS messages handed to the modem.",
+    ["outcome"],
+)
+WEBSOCKET_CLIENTS = Gauge(
+    "websocket_clients",
+    "Connected websocket clients.",
+    ["role"],
+    multiprocess_mode="livesum",
+)
+
+
+# =================================================================================
+# PER-REQUEST DB ACCOUNTING
+# =================================================================================
+
+class _RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set by the middleware; sync endpoints run in a threadpool that copies this
+# context, so the same stats object is updated from the worker thread
+_request_stats: ContextVar[_RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - conn.info.get("query_started", time.perf_counter())
+
+
+# =================================================================================
+# MIDDLEWARE
+# =================================================================================
+
+def _route_label(scope: Scope) -> str:
+    """
+    The matched route's full template, never the raw path, to keep cardinality
+    bounded. An included router keeps its own APIRoute, whose path_format lacks
+    the /admin or /kiosk prefix; FastAPI records the prefixed template as the
+    effective route context.
+    """
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path_format = getattr(context, "path_format", None)
+    if path_format is None:
+        path_format = getattr(scope.get("route"), "path_format", None)
+    return path_format or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses are timed to the last byte."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+
+            route_label = _route_label(scope)
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route_label, str(status_code)).observe(
+                time.perf_counter() - started
+            )
+            HTTP_DB_QUERIES.labels(route_label).observe(stats.queries)
+            HTTP_DB_SECONDS.labels(route_label).observe(stats.db_seconds)
+
+
+# =================================================================================
+# HELPERS FOR INSTRUMENTED CODE
+# =================================================================================
+
+@contextmanager
+def track_pdf_conversion(kind: str):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        PDF_CONVERSIONS.labels(kind, "error").inc()
+        raise
+    PDF_CONVERSIONS.labels(kind, "ok").inc()
+    PDF_CONVERSION_SECONDS.labels(kind).observe(time.perf_counter() - started)
+
+
+# =================================================================================
+# EXPOSITION
+# =================================================================================
+
+def render_metrics() -> tuple[bytes, str]:
+    if _MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
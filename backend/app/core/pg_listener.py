@@ -0,0 +1,141 @@
+"""
+app/core/pg_listener.py
+
+Postgres LISTEN/NOTIFY bridge shared by every uvicorn worker.
+A daemon thread holds one dedicated connection, LISTENs on every subscribed
+channel and hands each notification payload to the registered callbacks.
+Callbacks run on the listener thread and must not block.
+"""
+
+import logging
+import select
+import threading
+from typing import Callable
+
+import psycopg2
+import psycopg2.extensions
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 5.0
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7999
+RECONNECT_SECONDS = 5.0
+
+_callbacks: dict[str, list[Callable[[str | None], None]]] = {}
+_lock = threading.Lock()
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _dsn() -> str:
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def _dispatch(channel: str, payload: str | None) -> None:
+    with _lock:
+        callbacks = list(_callbacks.get(channel, []))
+    for callback in callbacks:
+        try:
+            callback(payload)
+        except Exception:
+            logger.exception("LISTEN callback failed for channel %s", channel)
+
+
+def _listen_forever(conn) -> None:
+    listening: set[str] = set()
+    while not _stop.is_set():
+        with _lock:
+            pending = set(_callbacks) - listening
+        if pending:
+            with conn.cursor() as cur:
+                for channel in pending:
+                    cur.execute(f'LISTEN "{channel}"')
+            listening |= pending
+            # Anything published before we were listening was missed
+            for channel in pending:
+                _dispatch(channel, None)
+
+        if select.select([conn], [], [], POLL_SECONDS) == ([], [], []):
+            continue
+
+        conn.poll()
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            _dispatch(notify.channel, notify.payload)
+
+
+def _run() -> None:
+    while not _stop.is_set():
+        conn = None
+        try:
+            conn = psycopg2.connect(_dsn())
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            logger.info("Postgres listener connected.")
+            _listen_forever(conn)
+        except Exception as exc:
+            logger.warning("Postgres listener disconnected: %s", exc)
+            _stop.wait(RECONNECT_SECONDS)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+# =================================================================================
+# PUBLIC API
+# =================================================================================
+
+def subscribe(channel: str, callback: Callable[[str | None], None]) -> None:
+    """
+    Registers a callback for a channel. The callback receives the payload
+    string, or None whenever the listener (re)connects and notifications
+    may have been missed — treat None as "resync from the database".
+    """
+    with _lock:
+        _callbacks.setdefault(channel, []).append(callback)
+
+
+def publish(db: Session, channel: str, payload: str = "") -> None:
+    """Queues a NOTIFY on the caller's transaction; every worker receives it on commit."""
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": payload},
+    )
+
+
+def notify(channel: str, payload: str = "") -> None:
+    """
+    Sends a NOTIFY immediately on a pooled connection, outside any request
+    transaction. Blocking — call it from a worker thread in async code.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": channel, "payload": payload},
+        )
+
+
+def start_listener() -> None:
+    global _thread
+    if _thread and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="pg-listener", daemon=True)
+    _thread.start()
+
+
+def stop_listener() -> None:
+    _stop.set()
+    if _thread:
+        _thread.join(timeout=POLL_SECONDS + 1)
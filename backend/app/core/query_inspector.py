@@ -0,0 +1,181 @@
+"""
+app/core/query_inspector.py
+
+Development/staging SQL inspector, enabled with QUERY_INSPECTOR=true.
+Records every statement a request executes, then:
+  - flags statement shapes repeated QUERY_N_PLUS_ONE_THRESHOLD+ times in one
+    request as a likely N+1 (lazy loads, per-row queries in a loop),
+  - logs statements slower than QUERY_SLOW_MS together with their EXPLAIN plan,
+  - adds an X-Query-Summary header to every response whose body is sent in
+    one piece; a streamed body (file downloads, CSV/XLSX exports) keeps
+    querying after the headers go out, so its summary is logged once the
+    last chunk is sent instead.
+Costs nothing when disabled: no event hooks or middleware are installed.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("query_inspector")
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\?")
+_IN_LISTS = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _RequestQueries:
+    __slots__ = ("shapes", "count", "db_seconds", "slow")
+
+    def __init__(self):
+        self.shapes: Counter[str] = Counter()
+        self.count = 0
+        self.db_seconds = 0.0
+        self.slow = 0
+
+    def n_plus_one(self) -> list[tuple[str, int]]:
+        threshold = settings.QUERY_N_PLUS_ONE_THRESHOLD
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def summary(self) -> str:
+        return (
+            f"queries={self.count}; db_ms={self.db_seconds * 1000:.1f}; "
+            f"slow={self.slow}; n_plus_one={len(self.n_plus_one())}"
+        )
+
+
+_current: ContextVar[_RequestQueries | None] = ContextVar("request_queries", default=None)
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _shape(statement: str) -> str:
+    """Reduces a statement to its shape so the same query with different values matches."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDERS.sub("?", _LITERALS.sub("?", shape))
+    return _IN_LISTS.sub("IN (?...)", shape)
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    # Inside a savepoint so a failing EXPLAIN cannot abort the request's
+    # transaction. AUTOCOMMIT connections (job locks, bulk COPY) have no
+    # transaction to protect, and SAVEPOINT outside one is an error
+    savepoint = not getattr(conn.connection.dbapi_connection, "autocommit", False)
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT query_inspector")
+        try:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT query_inspector")
+            return plan
+        except Exception as exc:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT query_inspector")
+            return f"(EXPLAIN failed: {exc})"
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["inspector_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("inspector_started", time.perf_counter())
+    queries = _current.get()
+    if queries is not None:
+        queries.count += 1
+        queries.db_seconds += elapsed
+        queries.shapes[_shape(statement)] += 1
+
+    if elapsed * 1000 < settings.QUERY_SLOW_MS:
+        return
+    if queries is not None:
+        queries.slow += 1
+
+    plan = ""
+    if not executemany and statement.lstrip()[:6].upper() in ("SELECT", "WITH"):
+        plan = "\n" + _explain(conn, statement, parameters)
+    logger.warning("Slow query (%.1f ms): %s%s", elapsed * 1000, _WHITESPACE.sub(" ", statement), plan)
+
+
+# =================================================================================
+# MIDDLEWARE
+# =================================================================================
+
+class QueryInspectorMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = _RequestQueries()
+        token = _current.set(queries)
+
+        start = None
+        streamed = False
+
+        def with_summary(message):
+            headers = list(message.get("headers", []))
+            headers.append((b"x-query-summary", queries.summary().encode()))
+            return {**message, "headers": headers}
+
+        async def send_wrapper(message):
+            nonlocal start, streamed
+            if message["type"] == "http.response.start":
+                # Held back until the first body message shows whether the
+                # body is complete, i.e. whether the summary is final
+                start = message
+                return
+            if start is not None:
+                complete = message["type"] == "http.response.body" and not message.get("more_body", False)
+                streamed = not complete
+                await send(with_summary(start) if complete else start)
+                start = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+            if start is not None:
+                await send(with_summary(start))
+        finally:
+            _current.reset(token)
+            if streamed:
+                logger.info("Streamed %s %s: %s", scope["method"], scope["path"], queries.summary())
+            for shape, n in queries.n_plus_one():
+                logger.warning(
+                    "Possible N+1 on %s %s: %d× %s",
+                    scope["method"], scope["path"], n, shape,
+                )
+
+
+# =================================================================================
+# INSTALLATION
+# =================================================================================
+
+def install_query_inspector(app: FastAPI) -> None:
+    """Hooks the inspector into every engine and the app, if enabled in config."""
+    if not settings.QUERY_INSPECTOR:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.add_middleware(QueryInspectorMiddleware)
+    logger.warning("Query inspector enabled — not intended for production.")
@@ -1,30 +1,274 @@
-from typing import List
-from fastapi import WebSocket
-from sqlalchemy.orm import Session
+"""
+app/core/websocket_manager.py
+
+Real-time fan-out to connected admin dashboards and kiosks.
+Every socket gets a bounded outbound queue drained by its own writer task,
+so a broadcast only serializes the message once and enqueues it — it never
+waits on a client. A client that falls too far behind (queue full) or stalls
+on a single send is disconnected; dashboards and kiosks re-sync on reconnect.
+
+With several uvicorn workers each one only holds its own sockets, so every
+broadcast is also published on a Postgres NOTIFY channel. The other workers
+receive it through the shared listener and relay it to their local sockets.
+
+A heartbeat task pings every socket (JSON ping/pong — browsers do not expose
+protocol ping frames) and drops any that stay silent past WS_PING_TIMEOUT.
+Kiosks identify themselves with ?kiosk_id=&version= on connect; their
+presence and round-trip latency are recorded for the admin fleet view.
+"""
+
+import asyncio
 import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from fastapi import WebSocket
+from app.core.config import settings
+from app.core.metrics import WEBSOCKET_CLIENTS
+from app.core.pg_listener import MAX_PAYLOAD_BYTES, notify, subscribe
+from app.services import kiosk_presence_service
+
+logger = logging.getLogger(__name__)
+
+WS_CHANNEL = "ws_broadcast"
+
+# Identifies this worker so it can skip its own relayed broadcasts
+WORKER_ID = uuid.uuid4().hex
+
+# Close code 1013 = "try again later"; clients reconnect and re-fetch state
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class _Client:
+    def __init__(self, websocket: WebSocket, role: str):
+        self.websocket = websocket
+        self.role = role
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=settings.WS_QUEUE_SIZE)
+        self.writer: asyncio.Task | None = None
+        self.connected_at = datetime.now(timezone.utc)
+        self.last_seen = time.monotonic()
+        self.latency_ms: int | None = None
+        self.kiosk_id: str | None = None
+        self.app_version: str | None = None
+
+    def presence(self, online: bool) -> dict:
+        return {
+            "kiosk_id":     self.kiosk_id,
+            "app_version":  self.app_version,
+            "online":       online,
+            "connected_at": self.connected_at.isoformat(),
+            "last_seen_at": datetime.now(timezone.utc).isoformat(),
+            "latency_ms":   self.latency_ms,
+        }
+
+
+def _now_ms() -> float:
+    return time.monotonic() * 1000
+
 
 class WebSocketManager:
     def __init__(self):
-        self.admin_connections: List[WebSocket] = []
-        self.kiosk_connections: List[WebSocket] = []
+        self.admin_connections: set[WebSocket] = set()
+        self.kiosk_connections: set[WebSocket] = set()
+        self._clients: dict[WebSocket, _Client] = {}
+        self._background: set[asyncio.Task] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._registries = {
+            "admin": self.admin_connections,
+            "kiosk": self.kiosk_connections,
+        }
+
+    # =================================================================================
+    # CONNECTION LIFECYCLE
+    # =================================================================================
+
+    async def _register(self, websocket: WebSocket, role: str, registry: set[WebSocket]) -> _Client:
+        # Relayed broadcasts arrive on the listener thread and are handed to this loop
+        self._loop = asyncio.get_running_loop()
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._run_heartbeat(), name="ws-heartbeat")
 
-    async def connect_admin(self, websocket: WebSocket):
         await websocket.accept()
-        self.admin_connections.append(websocket)
+        client = _Client(websocket, role)
+        client.writer = asyncio.create_task(self._writer(client), name=f"ws-writer-{role}")
+        self._clients[websocket] = client
+        registry.add(websocket)
+        WEBSOCKET_CLIENTS.labels(role).inc()
+        return client
+
+    async def connect_admin(self, websocket: WebSocket):
+        await self._register(websocket, "admin", self.admin_connections)
 
     async def connect_kiosk(self, websocket: WebSocket):
-        await websocket.accept()
-        self.kiosk_connections.append(websocket)
+        client = await self._register(websocket, "kiosk", self.kiosk_connections)
+        client.kiosk_id = (websocket.query_params.get("kiosk_id") or "")[:64] or None
+        client.app_version = (websocket.query_params.get("version") or "")[:32] or None
+        if client.kiosk_id:
+            self._spawn(self._record(
+                kiosk_presence_service.record_connect,
+                client.kiosk_id, client.app_version,
+                websocket.client.host if websocket.client else None,
+                client.connected_at,
+            ))
+            self._spawn(self.broadcast_to_admin("kiosk_presence", client.presence(online=True)))
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.admin_connections:
-            self.admin_connections.remove(websocket)
-        if websocket in self.kiosk_connections:
-            self.kiosk_connections.remove(websocket)
-
-    async def broadcast_to_admin(self, event: str, data: dict, db: Session = None):
-        if db:
-            from app.services.notification_service import save_notification
+        self.admin_connections.discard(websocket)
+        self.kiosk_connections.discard(websocket)
+        client = self._clients.pop(websocket, None)
+        if client is None:
+            return
+        WEBSOCKET_CLIENTS.labels(client.role).dec()
+        if client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        if client.kiosk_id:
+            self._spawn(self._record(
+                kiosk_presence_service.record_disconnect, client.kiosk_id, client.connected_at
+            ))
+            self._spawn(self.broadcast_to_admin("kiosk_presence", client.presence(online=False)))
+
+    def _evict(self, client: _Client, reason: str):
+        """Drops a client that cannot keep up and closes its socket in the background."""
+        if client.websocket not in self._clients:
+            return
+        logger.warning("Disconnecting %s websocket: %s", client.role, reason)
+        self.disconnect(client.websocket)
+        self._spawn(self._close(client.websocket))
+
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    async def _record(self, fn, *args):
+        """Runs a blocking presence write off the event loop."""
+        try:
+            await asyncio.to_thread(fn, *args)
+        except Exception as exc:
+            logger.warning("Could not record kiosk presence: %s", exc)
+
+    async def _writer(self, client: _Client):
+        try:
+            while True:
+                message = await client.queue.get()
+                await asyncio.wait_for(
+                    client.websocket.send_text(message),
+                    timeout=settings.WS_SEND_TIMEOUT,
+                )
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self._evict(client, "send timed out")
+        except Exception as exc:
+            self._evict(client, f"send failed ({exc})")
+
+    # =================================================================================
+    # HEARTBEAT & INBOUND MESSAGES
+    # =================================================================================
+
+    def _send(self, client: _Client, event: str, data: dict):
+        try:
+            client.queue.put_nowait(json.dumps({"event": event, "data": data}))
+        except asyncio.QueueFull:
+            self._evict(client, "outbound queue full")
+
+    async def _run_heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.WS_PING_INTERVAL)
+            now = time.monotonic()
+            for client in list(self._clients.values()):
+                if now - client.last_seen > settings.WS_PING_TIMEOUT:
+                    self._evict(client, "heartbeat timed out")
+                else:
+                    self._send(client, "ping", {"ts": _now_ms()})
+
+    def handle_message(self, websocket: WebSocket, text: str):
+        """Called by the socket endpoints for every inbound frame."""
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        client.last_seen = time.monotonic()
+
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+        event, data = message.get("event"), message.get("data") or {}
+
+        if event == "ping":
+            self._send(client, "pong", data)
+        elif event == "pong" and isinstance(data.get("ts"), (int, float)):
+            client.latency_ms = max(0, round(_now_ms() - data["ts"]))
+            if client.kiosk_id:
+                self._spawn(self._record(
+                    kiosk_presence_service.record_heartbeat,
+                    client.kiosk_id, client.connected_at, client.latency_ms,
+                ))
+                self._spawn(self.broadcast_to_admin("kiosk_presence", client.presence(online=True)))
+
+    # =================================================================================
+    # FAN-OUT
+    # =================================================================================
+
+    def _fan_out(self, registry: set[WebSocket], message: str):
+        for websocket in list(registry):
+            client = self._clients.get(websocket)
+            if client is None:
+                continue
+            try:
+                client.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._evict(client, "outbound queue full")
+
+    def _deliver(self, targets: tuple[str, ...], message: str):
+        for target in targets:
+            self._fan_out(self._registries[target], message)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _relay(self, payload: str):
+        try:
+            await asyncio.to_thread(notify, WS_CHANNEL, payload)
+        except Exception as exc:
+            logger.warning("Could not relay websocket broadcast to other workers: %s", exc)
+
+    async def _publish(self, targets: tuple[str, ...], message: str):
+        """Delivers locally right away and relays to the other workers in the background."""
+        self._deliver(targets, message)
+
+        payload = json.dumps({"origin": WORKER_ID, "targets": targets, "message": message})
+        if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+            logger.warning("Websocket broadcast too large to relay across workers (%d bytes)", len(payload))
+            return
+        self._spawn(self._relay(payload))
+
+    def _on_relay(self, payload: str | None):
+        """Listener-thread callback for broadcasts published by any worker."""
+        # Broadcasts are fire-and-forget; clients re-sync on reconnect, so a
+        # listener reconnect (payload None) needs no replay
+        if not payload or self._loop is None:
+            return
+        try:
+            relayed = json.loads(payload)
+        except ValueError:
+            return
+        if relayed.get("origin") == WORKER_ID:
+            return
+        targets = tuple(t for t in relayed.get("targets", ()) if t in self._registries)
+        self._loop.call_soon_threadsafe(self._deliver, targets, relayed["message"])
+
+    async def broadcast_to_admin(self, event: str, data: dict, persist: bool = False):
+        if persist:
+            from app.services.notification_service import enqueue_notification
             type_map = {
                 "new_transaction":       "Document",
                 "new_equipment_request": "Equipment",
@@ -42,35 +286,24 @@ class WebSocketManager:
                 "new_lost_card_report":  f"Lost card reported by {name}",
                 "new_rfid_linked":       f"New RFID card linked for {name}",
             }
-            notif = save_notification(
-                db,
+            notif = enqueue_notification(
                 type=type_map.get(event, "Document"),
                 msg=msg_map.get(event, "New notification"),
                 event=event,
             )
-            # Include DB id in the broadcast so frontend can track it
-            data["db_id"] = notif.id
+            # The row is written in the background; the frontend matches it
+            # to its database id by uid
+            data["uid"] = str(notif["uid"])
             data["event"] = event
-            data["created_at"] = notif.created_at.isoformat()
+            data["created_at"] = notif["created_at"].isoformat()
 
-        # ── Broadcast to connected clients ────────────────────────────────────
-        message = json.dumps({"event": event, "data": data})
-        for connection in self.admin_connections.copy():
-            try:
-                await connection.send_text(message)
-            except Exception:
-                self.disconnect(connection)
+        await self._publish(("admin",), json.dumps({"event": event, "data": data}))
 
     async def broadcast_to_kiosk(self, event: str, data: dict):
-        message = json.dumps({"event": event, "data": data})
-        for connection in self.kiosk_connections.copy():
-            try:
-                await connection.send_text(message)
-            except Exception:
-                self.disconnect(connection)
+        await self._publish(("kiosk",), json.dumps({"event": event, "data": data}))
 
     async def broadcast_to_all(self, event: str, data: dict):
-        await self.broadcast_to_admin(event, data)
-        await self.broadcast_to_kiosk(event, data)
+        await self._publish(("admin", "kiosk"), json.dumps({"event": event, "data": data}))
 
-ws_manager = WebSocketManager()
\ No newline at end of file
+ws_manager = WebSocketManager()
+subscribe(WS_CHANNEL, ws_manager._on_relay)
@@ -0,0 +1,120 @@
+"""
+app/job_runner.py
+
+Standalone process that owns the scheduled jobs — database backups and
+system log maintenance — so pg_dump never runs inside a uvicorn worker:
+
+    python -m app.job_runner
+
+Any number of runners may be started. Each one tries to take a session-level
+advisory lock held on a dedicated connection; the one that gets it runs the
+scheduler and the others wait as standbys. If the active runner dies, its
+connection and lock go with it and a standby takes over.
+
+Schedule changes made in the admin dashboard reach the runner through the
+system config change notification, and on-demand PITR base backups through
+their own notification; backup results are written back to
+SystemConfig (last_backup_at / last_backup_status / last_backup_error).
+"""
+
+import logging
+import signal
+import sys
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.pg_listener import start_listener, stop_listener, subscribe
+from app.db.session import engine
+from app.services.backup_service import queue_base_backup, queue_reschedule, start_scheduler, stop_scheduler
+from app.services.pitr_service import BASE_BACKUP_CHANNEL
+from app.services.systemconfig_service import CONFIG_CHANNEL
+from app.services.systemlogs_service import run_log_maintenance
+
+logger = logging.getLogger("job_runner")
+
+JOB_RUNNER_LOCK = "scheduled_job_runner"
+
+# How often a standby retries the lock and the active runner checks its connection
+LOCK_POLL_SECONDS = 15.0
+
+
+# =================================================================================
+# LEADER LOCK
+# =================================================================================
+
+def _try_lock() -> Connection | None:
+    conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        acquired = conn.execute(
+            text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": JOB_RUNNER_LOCK}
+        ).scalar()
+    except Exception:
+        conn.close()
+        raise
+    if acquired:
+        return conn
+    conn.close()
+    return None
+
+
+def _wait_for_lock(stop: threading.Event) -> Connection | None:
+    waiting = False
+    while not stop.is_set():
+        try:
+            conn = _try_lock()
+        except Exception as exc:
+            logger.warning("Could not reach the database for the job lock: %s", exc)
+            conn = None
+        if conn is not None:
+            return conn
+        if not waiting:
+            logger.info("Another job runner is active — standing by.")
+            waiting = True
+        stop.wait(LOCK_POLL_SECONDS)
+    return None
+
+
+# =================================================================================
+# ENTRY POINT
+# =================================================================================
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    lock_conn = _wait_for_lock(stop)
+    if lock_conn is None:
+        return 0
+    logger.info("Job runner lock acquired — starting scheduled jobs.")
+
+    start_listener()
+    subscribe(CONFIG_CHANNEL, queue_reschedule)
+    subscribe(BASE_BACKUP_CHANNEL, queue_base_backup)
+    exit_code = 0
+    try:
+        run_log_maintenance()
+        start_scheduler()
+        while not stop.wait(LOCK_POLL_SECONDS):
+            # Losing this connection means losing the lock; exit so a standby
+            # (or the supervisor's restart) takes over instead of running twice
+            lock_conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        logger.error("Job runner lost its lock connection: %s", exc)
+        exit_code = 1
+    finally:
+        stop_scheduler()
+        stop_listener()
+        try:
+            lock_conn.close()
+        except Exception:
+            pass
+    logger.info("Job runner stopped.")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
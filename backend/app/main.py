@@ -1,20 +1,34 @@
 import os
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from app.api.admin.routes import router as admin_router
 from app.api.kiosk.routes import router as kiosk_router
 from app.api.websocket import router as ws_router
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.query_inspector import install_query_inspector
+from app.core.pg_listener import start_listener, stop_listener
+from app.services.notification_service import start_notification_writer, stop_notification_writer
+from app.services.systemlogs_service import run_log_maintenance, start_log_writer, stop_log_writer
 from app.services.backup_service import start_scheduler, stop_scheduler
+from app.core.config import settings
 
 load_dotenv()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    start_scheduler()
+    start_listener()
+    run_log_maintenance()
+    start_log_writer()
+    start_notification_writer()
+    if settings.RUN_JOBS_IN_API:
+        start_scheduler()
     yield
     stop_scheduler()
+    await stop_notification_writer()
+    stop_log_writer()
+    stop_listener()
 
 app = FastAPI(title="Barangay Kiosk Backend", lifespan=lifespan)
 
@@ -33,7 +47,11 @@ app.add_middleware(
     allow_credentials=allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    # The kiosk reads the bootstrap bundle's ETag to send it back as If-None-Match
+    expose_headers=["ETag"],
 )
+app.add_middleware(MetricsMiddleware)
+install_query_inspector(app)
 
 app.include_router(admin_router, prefix="/admin", tags=["Admin"])
 app.include_router(kiosk_router, prefix="/kiosk", tags=["Kiosk"])
@@ -41,4 +59,9 @@ app.include_router(ws_router, tags=["WebSocket"])
 
 @app.get("/")
 def root():
-    return {"message": "Backend is running"}
\ No newline at end of file
+    return {"message": "Backend is running"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
\ No newline at end of file
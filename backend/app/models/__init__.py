@@ -8,9 +8,11 @@ from .blotter import BlotterRecord
 from .transaction import TransactionHistory 
 from .faqs import FAQ
 from .audit import AdminAuditLog
-from .systemlogs import SystemLog
+from .systemlogs import SystemLog, SystemLogDailyCount
 from .contact import ContactInformation
 from .systemconfig import SystemConfig
 from .barangayid import BarangayID
 from .notification import Notification
-from .sms import SMSLog
\ No newline at end of file
+from .sms import SMSLog
+from .kiosk import KioskPresence
+from .revenue import DailyRevenue, FinanceDataVersion
\ No newline at end of file
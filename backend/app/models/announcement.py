@@ -12,5 +12,6 @@ class Announcement(Base):
     event_time = Column(String(32))
     location = Column(String(255), nullable=False)
     image = Column(LargeBinary)
+    image_hash = Column(String(64), index=True)
     is_active = Column(Boolean, nullable=False, server_default="true")
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
\ No newline at end of file
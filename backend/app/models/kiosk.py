@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from app.db.base import Base
+
+
+class KioskPresence(Base):
+    __tablename__ = "kiosk_presence"
+
+    kiosk_id     = Column(String(64), primary_key=True)
+    app_version  = Column(String(32), nullable=True)
+    ip_address   = Column(String(45), nullable=True)
+    is_online    = Column(Boolean, nullable=False, default=False)
+    connected_at = Column(DateTime(timezone=True), nullable=True)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True)
+    latency_ms   = Column(Integer, nullable=True)   # last heartbeat round trip
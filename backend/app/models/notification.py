@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.db.base import Base  # adjust import to match your project
 
@@ -6,6 +7,7 @@ class Notification(Base):
     __tablename__ = "notifications"
 
     id         = Column(Integer, primary_key=True, index=True)
+    uid        = Column(UUID(as_uuid=True), nullable=False, unique=True, server_default=func.gen_random_uuid())  # sent in the live event
     type       = Column(String(50), nullable=False)   # Document, Equipment, Feedback, etc.
     msg        = Column(Text, nullable=False)
     is_read    = Column(Boolean, default=False)
@@ -29,6 +29,7 @@ class Resident(Base):
     failed_pin_attempts = Column(Integer, nullable=False, default=0, server_default='0')
     locked_until = Column(DateTime(timezone=True), nullable=True)
     photo = Column(LargeBinary, nullable=True)
+    photo_hash = Column(String(64), nullable=True, index=True)
     registered_at = Column(TIMESTAMP, server_default=func.current_timestamp())
 
     blotter_records_as_complainant = relationship("BlotterRecord", foreign_keys="BlotterRecord.complainant_id", back_populates="complainant")
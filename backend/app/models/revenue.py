@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, Date, Integer, Numeric, SmallInteger, String
+
+from app.db.base import Base
+
+
+class DailyRevenue(Base):
+    """
+    Per-day request totals by service, document type and payment status,
+    kept up to date by the request lifecycle functions (revenue_service).
+    """
+    __tablename__ = "daily_revenue"
+
+    day            = Column(Date, primary_key=True)
+    service        = Column(String(20), primary_key=True)      # documents | id_services | equipment
+    doctype_id     = Column(SmallInteger, primary_key=True, default=0)  # 0 unless service is documents
+    payment_status = Column(String(10), primary_key=True)      # paid | unpaid | refunded
+    amount         = Column(Numeric(12, 2), nullable=False, default=0)
+    request_count  = Column(Integer, nullable=False, default=0)
+
+
+class FinanceDataVersion(Base):
+    """
+    Per-day counter bumped whenever a request dated that day (or a name shown
+    on it) changes; cached financial statements are keyed on these.
+    """
+    __tablename__ = "finance_data_versions"
+
+    day     = Column(Date, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, LargeBinary
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, LargeBinary, Text
 from sqlalchemy.sql import func
 
 from app.db.base import Base
@@ -21,6 +21,8 @@ class SystemConfig(Base):
     backup_schedule = Column(String(20), nullable=False, default="manual")
     backup_time = Column(String(5), nullable=True, default="02:00")
     last_backup_at = Column(DateTime(timezone=True), nullable=True)
+    last_backup_status = Column(String(20), nullable=True)
+    last_backup_error = Column(Text, nullable=True)
     updated_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Index, Enum as SAEnum
 from sqlalchemy.sql import func
 import enum
 
@@ -31,9 +31,19 @@ class LogCategory(str, enum.Enum):
 
 
 class SystemLog(Base):
+    """
+    Range-partitioned by month on created_at (system_logs_YYYY_MM); partitions
+    are created ahead of time and dropped after the retention period by
+    systemlogs_service.run_log_maintenance.
+    """
     __tablename__ = "system_logs"
+    __table_args__ = (
+        Index("ix_system_logs_created_at_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    # created_at is part of the key because Postgres requires the partition key in it
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
     # Who triggered it
     actor_id = Column(Integer, nullable=True)           # Admin ID (null for kiosk/system events)
@@ -60,7 +70,16 @@ class SystemLog(Base):
     status_code = Column(Integer, nullable=True)        # HTTP status if applicable
 
     # Timestamp (auto-set on insert)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=True)
 
     def __repr__(self):
-        return f"<SystemLog [{self.level.upper()}] {self.source} | {self.action} @ {self.created_at}>"
\ No newline at end of file
+        return f"<SystemLog [{self.level.upper()}] {self.source} | {self.action} @ {self.created_at}>"
+
+
+class SystemLogDailyCount(Base):
+    """Per-day, per-level log counts, kept up to date by the log flusher."""
+    __tablename__ = "system_log_daily_counts"
+
+    day   = Column(Date, primary_key=True)
+    level = Column(SAEnum(LogLevel), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
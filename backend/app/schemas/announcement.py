@@ -48,7 +48,8 @@ class AnnouncementKioskOut(BaseModel):
     event_date: date
     event_time: Optional[str]
     location: str
-    image_base64: Optional[str] 
+    image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -66,6 +67,7 @@ class AnnouncementAdminOut(BaseModel):
     location: str
     is_active: bool
     has_image: bool 
+    thumbnail_url: Optional[str] = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
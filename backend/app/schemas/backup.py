@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class RestorePointCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=60, pattern=r"^[A-Za-z0-9_.-]+$")
+
+
+class PitrRestoreRequest(BaseModel):
+    target_time: datetime
@@ -0,0 +1,28 @@
+"""
+app/schemas/bootstrap.py
+
+Pydantic schema for the kiosk bootstrap bundle.
+Groups every piece of admin-managed data the kiosk needs at start-up
+into a single versioned response.
+"""
+
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+from app.schemas.announcement import AnnouncementKioskOut
+from app.schemas.contact import ContactInformationOut
+from app.schemas.document import DocumentTypeKioskOut
+from app.schemas.equipment import EquipmentInventoryOut
+from app.schemas.faqs import FAQKioskOut
+from app.schemas.systemconfig import KioskSystemConfigRead
+
+
+class KioskBootstrapOut(BaseModel):
+    generated_at:   datetime
+    config:         KioskSystemConfigRead
+    document_types: List[DocumentTypeKioskOut]
+    equipment:      List[EquipmentInventoryOut]
+    faqs:           List[FAQKioskOut]
+    contact:        ContactInformationOut
+    announcements:  List[AnnouncementKioskOut]
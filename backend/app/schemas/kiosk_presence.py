@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class KioskPresenceOut(BaseModel):
+    kiosk_id:     str
+    app_version:  Optional[str] = None
+    ip_address:   Optional[str] = None
+    online:       bool
+    connected_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+    latency_ms:   Optional[int] = None
+
+    model_config = {"from_attributes": True}
@@ -1,8 +1,10 @@
 from pydantic import BaseModel
 from datetime import datetime
+from uuid import UUID
 
 class NotificationOut(BaseModel):
     id:         int
+    uid:        UUID
     type:       str
     event:      str
     msg:        str
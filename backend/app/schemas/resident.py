@@ -141,7 +141,8 @@ class ResidentDetailResponse(BaseModel):
     gender: str
     birthdate: str 
     age: int
-    photo: Optional[str] = None    
+    photo_url: Optional[str] = None
+    photo_thumbnail_url: Optional[str] = None
     
     email: Optional[str] = None
     phone_number: Optional[str] = None
@@ -22,12 +22,47 @@ class SystemConfigRead(BaseModel):
     backup_schedule: str
     backup_time:     Optional[str]
     last_backup_at:  Optional[datetime]
+    last_backup_status: Optional[str] = None
+    last_backup_error:  Optional[str] = None
 
     updated_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class SystemConfigSnapshot(BaseModel):
+    """Immutable, logo-free copy of the config row held by the in-process cache."""
+    id: int
+
+    brgy_name:    Optional[str] = None
+    brgy_subname: Optional[str] = None
+    has_logo:     bool = False
+
+    rfid_expiry_days:     int = 365
+    rfid_reminder_days:   int = 30
+    auto_logout_duration: int = 1800
+    max_failed_attempts:  int = 5
+    lockout_minutes:      int = 15
+
+    default_view:        str = "dashboard"
+    maintenance_mode:    bool = False
+    maintenance_message: Optional[str] = None
+
+    backup_schedule: str = "manual"
+    backup_time:     Optional[str] = None
+    last_backup_at:  Optional[datetime] = None
+    last_backup_status: Optional[str] = None
+    last_backup_error:  Optional[str] = None
+
+    updated_at: datetime
+
+    model_config = {"frozen": True}
+
+    @property
+    def version(self) -> str:
+        return self.updated_at.isoformat()
+
+
 class SystemConfigUpdate(BaseModel):
     brgy_name:    Optional[str] = Field(None, max_length=150)
     brgy_subname: Optional[str] = Field(None, max_length=200)
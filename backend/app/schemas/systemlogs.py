@@ -51,6 +51,8 @@ class SystemLogRead(BaseModel):
 
 class SystemLogListResponse(BaseModel):
     total: int
+    total_is_estimate: bool = False
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
     results: list[SystemLogRead]
\ No newline at end of file
@@ -8,13 +8,14 @@ and kiosk display functionality.
 
 import base64
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from fastapi import HTTPException, status, UploadFile
 from app.models.announcement import Announcement
 from app.schemas.announcement import (
     AnnouncementCreate,
     AnnouncementUpdate
 )
+from app.services.image_service import process_image, image_url
 
 
 # =================================================================================
@@ -37,7 +38,8 @@ def _format_announcement_for_kiosk(announcement: Announcement) -> dict:
         "event_date": announcement.event_date,
         "event_time": announcement.event_time,
         "location": announcement.location,
-        "image_base64": _encode_image_to_base64(announcement.image) if announcement.image else None,
+        "image_url": image_url(announcement.image_hash, "kiosk"),
+        "thumbnail_url": image_url(announcement.image_hash, "thumb"),
         "created_at": announcement.created_at,
     }
 
@@ -51,7 +53,8 @@ def _format_announcement_for_admin(announcement: Announcement) -> dict:
         "event_time": announcement.event_time,
         "location": announcement.location,
         "is_active": announcement.is_active,
-        "has_image": announcement.image is not None,
+        "has_image": announcement.image_hash is not None,
+        "thumbnail_url": image_url(announcement.image_hash, "thumb"),
         "created_at": announcement.created_at,
     }
 
@@ -69,6 +72,7 @@ def get_active_announcements(db: Session) -> list[dict]:
 
     announcements = (
         db.query(Announcement)
+        .options(defer(Announcement.image))
         .filter(Announcement.is_active == True)
         .order_by(Announcement.event_date.asc())
         .all()
@@ -83,6 +87,7 @@ def get_active_announcements(db: Session) -> list[dict]:
 def get_all_announcements(db: Session) -> list[dict]:
     announcements = (
         db.query(Announcement)
+        .options(defer(Announcement.image))
         .order_by(Announcement.created_at.desc())
         .all()
     )
@@ -108,8 +113,10 @@ def create_announcement(
     image_file: Optional[UploadFile] = None
 ) -> dict:
     image_data = None
+    image_hash = None
     if image_file:
         image_data = image_file.file.read()
+        image_hash = process_image(image_data, "announcement")
     
     announcement = Announcement(
         title=payload.title,
@@ -118,7 +125,8 @@ def create_announcement(
         event_time=payload.event_time,
         location=payload.location,
         is_active=payload.is_active,
-        image=image_data
+        image=image_data,
+        image_hash=image_hash,
     )
     
     db.add(announcement)
@@ -149,8 +157,10 @@ def update_announcement(
     
     if remove_image:
         announcement.image = None
+        announcement.image_hash = None
     elif image_file:
         announcement.image = image_file.file.read()
+        announcement.image_hash = process_image(announcement.image, "announcement")
     
     db.commit()
     db.refresh(announcement)
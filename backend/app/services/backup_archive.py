@@ -0,0 +1,246 @@
+"""
+app/services/backup_archive.py
+
+Content-deduplicating store for scheduled backups. Each snapshot is a plain
+SQL dump cut into content-defined chunks; chunks are stored once, zlib
+compressed, under their SHA-256, and a snapshot is just a JSON manifest
+listing its chunks. Consecutive nightly dumps of a mostly unchanged database
+share almost every chunk, so the archive grows with the changed data only.
+
+Chunk boundaries fall on dump lines (one COPY row each) whose CRC matches a
+mask once a chunk has reached CHUNK_MIN_BYTES. They depend on content,
+not offsets, so rows inserted early in a table only change the chunks
+around them.
+
+Snapshot names follow backup file names (backup_auto_<timestamp>.sql),
+so the history, download and verify endpoints treat both alike.
+"""
+
+import json
+import logging
+import os
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from hashlib import sha256
+from pathlib import Path
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR  = Path(settings.BACKUP_DIR) / "archive"
+CHUNK_DIR    = ARCHIVE_DIR / "chunks"
+SNAPSHOT_DIR = ARCHIVE_DIR / "snapshots"
+
+CHUNK_MIN_BYTES = 256 * 1024
+CHUNK_MAX_BYTES = 4 * 1024 * 1024
+# After the minimum size, roughly one line in 64 ends a chunk
+_BOUNDARY_MASK  = 0x3F
+
+# pg_dump's last line in a plain dump that ran to completion
+DUMP_COMPLETE_MARKER = b"-- PostgreSQL database dump complete"
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _chunk_path(digest: str) -> Path:
+    return CHUNK_DIR / digest[:2] / digest
+
+
+def _manifest_path(name: str) -> Path:
+    return SNAPSHOT_DIR / f"{Path(name).name}.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _store_chunk(data: bytes) -> str:
+    digest = sha256(data).hexdigest()
+    path = _chunk_path(digest)
+    if not path.exists():
+        _write_atomic(path, zlib.compress(data, settings.BACKUP_COMPRESSION))
+    return digest
+
+
+def _read_chunk(digest: str) -> bytes:
+    data = zlib.decompress(_chunk_path(digest).read_bytes())
+    if sha256(data).hexdigest() != digest:
+        raise ValueError(f"Chunk {digest[:12]} is corrupt.")
+    return data
+
+
+# =================================================================================
+# SNAPSHOTS
+# =================================================================================
+
+def ingest(lines: Iterable[bytes]) -> dict:
+    """
+    Chunks and stores a plain dump given as an iterable of lines (such as
+    pg_dump's stdout). Returns what commit_snapshot() needs; nothing is
+    visible in the archive until then.
+    """
+    chunks: list[str] = []
+    whole = sha256()
+    size = 0
+    buffer: list[bytes] = []
+    buffered = 0
+    last_line = b""
+
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        whole.update(line)
+        if line.strip():
+            last_line = line
+        if buffered >= CHUNK_MAX_BYTES or (
+            buffered >= CHUNK_MIN_BYTES and zlib.crc32(line) & _BOUNDARY_MASK == 0
+        ):
+            chunks.append(_store_chunk(b"".join(buffer)))
+            size += buffered
+            buffer, buffered = [], 0
+
+    if buffer:
+        chunks.append(_store_chunk(b"".join(buffer)))
+        size += buffered
+
+    return {
+        "chunks":   chunks,
+        "size":     size,
+        "sha256":   whole.hexdigest(),
+        "complete": last_line.strip() == DUMP_COMPLETE_MARKER,
+    }
+
+
+def commit_snapshot(name: str, ingested: dict) -> dict:
+    manifest = {
+        "name":       name,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "size":       ingested["size"],
+        "sha256":     ingested["sha256"],
+        "chunks":     ingested["chunks"],
+        "verified_at": None,
+    }
+    _write_atomic(_manifest_path(name), json.dumps(manifest).encode())
+    return manifest
+
+
+def get_snapshot(name: str) -> dict | None:
+    try:
+        return json.loads(_manifest_path(name).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def delete_snapshot(name: str) -> None:
+    """Removes the manifest; its chunks go at the next collect_garbage()."""
+    _manifest_path(name).unlink(missing_ok=True)
+
+
+def list_snapshots() -> list[dict]:
+    """Every snapshot manifest, newest first."""
+    manifests = []
+    for path in SNAPSHOT_DIR.glob("*.json"):
+        try:
+            manifests.append(json.loads(path.read_text()))
+        except ValueError:
+            logger.warning("Unreadable snapshot manifest: %s", path.name)
+    return sorted(manifests, key=lambda m: m["created_at"], reverse=True)
+
+
+def iter_snapshot(name: str) -> Iterator[bytes]:
+    """Yields the snapshot's dump chunk by chunk. Raises ValueError on a corrupt chunk."""
+    manifest = get_snapshot(name)
+    if manifest is None:
+        raise FileNotFoundError(name)
+    for digest in manifest["chunks"]:
+        yield _read_chunk(digest)
+
+
+def verify_snapshot(name: str) -> dict:
+    """
+    Re-reads every chunk and checks it and the whole dump against their
+    checksums, then records the verification time. Raises ValueError if
+    anything does not match.
+    """
+    manifest = get_snapshot(name)
+    if manifest is None:
+        raise FileNotFoundError(name)
+
+    whole = sha256()
+    tail = b""
+    try:
+        for chunk in iter_snapshot(name):
+            whole.update(chunk)
+            tail = (tail + chunk)[-256:]
+    except (OSError, zlib.error) as exc:
+        raise ValueError(f"Snapshot {name} is unreadable: {exc}")
+    if whole.hexdigest() != manifest["sha256"]:
+        raise ValueError(f"Snapshot {name} does not match its checksum.")
+    if DUMP_COMPLETE_MARKER not in tail:
+        raise ValueError(f"Snapshot {name} is truncated.")
+
+    manifest["verified_at"] = datetime.now(timezone.utc).isoformat()
+    _write_atomic(_manifest_path(name), json.dumps(manifest).encode())
+    return manifest
+
+
+# =================================================================================
+# RETENTION
+# =================================================================================
+
+def apply_retention(daily: int, weekly: int, monthly: int) -> list[str]:
+    """
+    Keeps the newest snapshot of each of the last *daily* days, *weekly*
+    ISO weeks and *monthly* months, deletes the rest, and returns their names.
+    """
+    keep: set[str] = set()
+    tiers = (
+        (daily,   lambda t: t.strftime("%Y-%m-%d")),
+        (weekly,  lambda t: "%d-W%02d" % t.isocalendar()[:2]),
+        (monthly, lambda t: t.strftime("%Y-%m")),
+    )
+    snapshots = list_snapshots()
+    for limit, period_of in tiers:
+        periods: set[str] = set()
+        for manifest in snapshots:
+            period = period_of(datetime.fromisoformat(manifest["created_at"]))
+            if period in periods:
+                continue
+            if len(periods) >= limit:
+                break
+            periods.add(period)
+            keep.add(manifest["name"])
+
+    removed = []
+    for manifest in snapshots:
+        if manifest["name"] not in keep:
+            delete_snapshot(manifest["name"])
+            removed.append(manifest["name"])
+            logger.info("Pruned snapshot: %s", manifest["name"])
+    return removed
+
+
+def collect_garbage() -> int:
+    """
+    Deletes chunks no snapshot references and returns how many. Must not run
+    while ingest() is writing a snapshot that has not been committed yet.
+    """
+    referenced = {digest for m in list_snapshots() for digest in m["chunks"]}
+    removed = 0
+    for path in CHUNK_DIR.glob("*/*"):
+        if path.name not in referenced and not path.name.endswith(".tmp"):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def archive_size() -> int:
+    """Bytes actually stored, after deduplication and compression."""
+    return sum(p.stat().st_size for p in CHUNK_DIR.glob("*/*"))
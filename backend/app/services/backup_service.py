@@ -3,28 +3,53 @@ app/services/backup_service.py
  
 Automated database backup service using APScheduler and pg_dump.
 Supports daily and weekly schedules configurable via the system config.
-Backups are stored in the configured BACKUP_DIR and pruned to the 30 most recent.
+Scheduled backups go to the deduplicating archive in BACKUP_DIR/archive and
+are thinned by a daily/weekly/monthly retention policy (with BACKUP_DEDUP off
+they are stored as files and pruned to the 30 most recent).
 All times are expressed in Asia/Manila (PH) timezone.
+
+Backups are written in BACKUP_FORMAT: compressed custom-format archives
+(.dump) by default, or directory-format dumps (.dir) that pg_dump writes
+with BACKUP_JOBS parallel workers. Both are restored with a parallel
+pg_restore; plain .sql dumps from before remain restorable through psql.
+Every backup is verified once written and its SHA-256 is kept next to it
+(<file>.sha256) or in its archive manifest, so it can be re-checked later.
+
+The scheduler runs in the standalone job runner (app/job_runner.py), not in
+the API workers, unless RUN_JOBS_IN_API is set. The outcome of every
+scheduled backup is recorded on SystemConfig.
 """
 
+import asyncio
+import hashlib
+import io
 import os
 import logging
+import queue
+import shutil
 import subprocess
+import tarfile
+import tempfile
+from collections.abc import AsyncIterator, Iterable
 from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import urlparse
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from app.db.session import SessionLocal
-from app.services.systemconfig_service import get_config, set_last_backup
+from app.services import backup_archive
+from app.services.pitr_service import run_scheduled_base_backup
+from app.services.systemconfig_service import get_config, set_backup_failed, set_last_backup
+from app.services.systemlogs_service import run_log_maintenance
 from app.core.config import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Directory where backup .sql files are written
+# Directory where backups are written
 BACKUP_DIR = Path(settings.BACKUP_DIR)
 BACKUP_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -32,6 +57,25 @@ PH_TIMEZONE = "Asia/Manila"
 
 _scheduler = BackgroundScheduler(timezone=PH_TIMEZONE)
 _JOB_ID = "auto_backup"
+_LOG_MAINTENANCE_JOB_ID = "system_log_maintenance"
+_BASE_BACKUP_JOB_ID = "pitr_base_backup"
+
+# format name -> (pg_dump -F flag, file suffix)
+BACKUP_FORMATS = {
+    "plain":     ("p", ".sql"),
+    "custom":    ("c", ".dump"),
+    "directory": ("d", ".dir"),
+}
+BACKUP_SUFFIXES = {suffix: name for name, (_, suffix) in BACKUP_FORMATS.items()}
+
+AUTO_BACKUPS_KEPT = 30
+
+CHECKSUM_SUFFIX = ".sha256"
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Dumps still being written after their client disconnected
+_background: set[asyncio.Task] = set()
 
 
 # =================================================================================
@@ -49,6 +93,37 @@ def _parse_db_url(url: str) -> dict:
     }
 
 
+def pg_command(program: str) -> tuple[list[str], dict, str]:
+    """Connection arguments and environment for a Postgres client program."""
+    db_info = _parse_db_url(settings.DATABASE_URL)
+    env = os.environ.copy()
+    env["PGPASSWORD"] = db_info["password"]
+    args = [program, "-h", db_info["host"], "-p", db_info["port"], "-U", db_info["user"]]
+    return args, env, db_info["dbname"]
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+    _checksum_path(path).unlink(missing_ok=True)
+
+
+def _run(args: list[str], env: dict | None, what: str) -> None:
+    result = subprocess.run(args, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{what} failed: {result.stderr.strip()}")
+
+
+def record_backup() -> None:
+    db = SessionLocal()
+    try:
+        set_last_backup(db)
+    finally:
+        db.close()
+
+
 def _build_trigger(schedule: str, backup_time: str) -> CronTrigger:
     try:
         hour, minute = backup_time.split(":")
@@ -63,6 +138,495 @@ def _build_trigger(schedule: str, backup_time: str) -> CronTrigger:
         return CronTrigger(hour=int(hour), minute=int(minute), timezone=PH_TIMEZONE)
 
 
+# =================================================================================
+# BACKUP FILES
+# =================================================================================
+
+def backup_format(path: Path) -> str | None:
+    return BACKUP_SUFFIXES.get(path.suffix)
+
+
+def backup_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+    return path.stat().st_size
+
+
+def list_backups() -> list[Path]:
+    """Every backup in BACKUP_DIR, newest first."""
+    return sorted(
+        (p for p in BACKUP_DIR.glob("backup_*") if backup_format(p)),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+
+
+def get_backup_path(filename: str) -> Path | None:
+    path = BACKUP_DIR / Path(filename).name
+    return path if path.exists() and backup_format(path) else None
+
+
+def _checksum_path(path: Path) -> Path:
+    return path.with_name(path.name + CHECKSUM_SUFFIX)
+
+
+def _checksum(path: Path) -> str:
+    """SHA-256 of a dump file, or of a directory dump's files in name order."""
+    digest = hashlib.sha256()
+    for f in sorted(path.iterdir()) if path.is_dir() else [path]:
+        if path.is_dir():
+            digest.update(f.name.encode() + b"\0")
+        with open(f, "rb") as fh:
+            while chunk := fh.read(1024 * 1024):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def recorded_checksum(path: Path) -> str | None:
+    try:
+        return _checksum_path(path).read_text().split()[0]
+    except (FileNotFoundError, IndexError):
+        return None
+
+
+def prune_backups(kind: str = "auto", keep: int = AUTO_BACKUPS_KEPT) -> None:
+    for old in [p for p in list_backups() if p.name.startswith(f"backup_{kind}_")][keep:]:
+        _remove(old)
+        logger.info("Pruned old backup: %s", old.name)
+
+
+# =================================================================================
+# VERIFICATION
+# =================================================================================
+
+def _plain_dump_complete(path: Path) -> bool:
+    with open(path, "rb") as f:
+        f.seek(max(0, path.stat().st_size - 256))
+        return backup_archive.DUMP_COMPLETE_MARKER in f.read()
+
+
+def _trial_restore(source: Path | Iterable[bytes]) -> None:
+    """
+    Restores a dump file, or a plain dump given as chunks, into a scratch
+    database that is dropped afterwards. Raises RuntimeError on any error.
+    """
+    psql, env, dbname = pg_command("psql")
+    scratch = f"{dbname}_verify"
+    admin = psql + ["-d", dbname, "-v", "ON_ERROR_STOP=1", "-c"]
+    _run(admin + [f'DROP DATABASE IF EXISTS "{scratch}"'], env, "Trial restore")
+    _run(admin + [f'CREATE DATABASE "{scratch}"'], env, "Trial restore")
+    try:
+        plain = psql + ["-q", "-d", scratch, "-v", "ON_ERROR_STOP=1"]
+        if not isinstance(source, Path):
+            with tempfile.TemporaryFile() as stderr:
+                proc = subprocess.Popen(
+                    plain, env=env, stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL, stderr=stderr,
+                )
+                try:
+                    for chunk in source:
+                        proc.stdin.write(chunk)
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+                except BaseException:
+                    proc.kill()
+                    raise
+                finally:
+                    returncode = proc.wait()
+                if returncode != 0:
+                    stderr.seek(0)
+                    raise RuntimeError(f"Trial restore failed: {stderr.read().decode(errors='replace').strip()}")
+        elif backup_format(source) == "plain":
+            _run(plain + ["-f", str(source)], env, "Trial restore")
+        else:
+            args, env, _ = pg_command("pg_restore")
+            args += [
+                "-d", scratch, "--no-owner", "--exit-on-error",
+                "-j", str(max(1, settings.BACKUP_JOBS)),
+                str(source),
+            ]
+            _run(args, env, "Trial restore")
+    finally:
+        _run(admin + [f'DROP DATABASE IF EXISTS "{scratch}"'], env, "Dropping the scratch database")
+
+
+def _check_dump(path: Path) -> str:
+    """
+    pg_restore --list proves an archive's table of contents is readable; a
+    plain dump must end with pg_dump's completion marker. BACKUP_VERIFY_RESTORE
+    additionally restores it into a scratch database. Records and returns
+    the dump's SHA-256; raises RuntimeError if a check fails.
+    """
+    if backup_format(path) == "plain":
+        if not _plain_dump_complete(path):
+            raise RuntimeError("dump is truncated")
+    else:
+        _run(["pg_restore", "--list", str(path)], None, "pg_restore --list")
+    if settings.BACKUP_VERIFY_RESTORE:
+        _trial_restore(path)
+    checksum = _checksum(path)
+    _checksum_path(path).write_text(f"{checksum}  {path.name}\n")
+    return checksum
+
+
+def verify_backup(path: Path) -> str:
+    """Checks a freshly written dump; one that fails is deleted and RuntimeError raised."""
+    try:
+        return _check_dump(path)
+    except (RuntimeError, OSError) as exc:
+        _remove(path)
+        raise RuntimeError(f"Backup verification failed: {exc}")
+
+
+def verify_stored_backup(filename: str) -> dict:
+    """
+    Re-checks a stored backup or archive snapshot against the checksum
+    recorded when it was made. Raises FileNotFoundError if there is no such
+    backup and ValueError if it no longer matches.
+    """
+    if backup_archive.get_snapshot(filename) is not None:
+        manifest = backup_archive.verify_snapshot(filename)
+        return {"filename": filename, "sha256": manifest["sha256"], "verified_at": manifest["verified_at"]}
+
+    path = get_backup_path(filename)
+    if path is None:
+        raise FileNotFoundError(filename)
+    recorded = recorded_checksum(path)
+    if recorded is None:
+        # Made before checksums were recorded: check it and record one now
+        try:
+            recorded = _check_dump(path)
+        except RuntimeError as exc:
+            raise ValueError(str(exc))
+    elif _checksum(path) != recorded:
+        raise ValueError("Backup does not match its recorded checksum.")
+    return {
+        "filename":    filename,
+        "sha256":      recorded,
+        "verified_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+# =================================================================================
+# DUMP & RESTORE
+# =================================================================================
+
+def create_backup(kind: str) -> Path:
+    """
+    Dumps the database to BACKUP_DIR as backup_<kind>_<timestamp> in
+    BACKUP_FORMAT and verifies it. Raises RuntimeError if pg_dump or the
+    verification fails.
+    """
+    fmt = settings.BACKUP_FORMAT if settings.BACKUP_FORMAT in BACKUP_FORMATS else "custom"
+    flag, suffix = BACKUP_FORMATS[fmt]
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    dest = BACKUP_DIR / f"backup_{kind}_{timestamp}{suffix}"
+
+    args, env, dbname = pg_command("pg_dump")
+    args += ["-F", flag, "-f", str(dest)]
+    if fmt != "plain":
+        args += ["-Z", str(settings.BACKUP_COMPRESSION)]
+    if fmt == "directory":
+        args += ["-j", str(max(1, settings.BACKUP_JOBS))]
+    args.append(dbname)
+
+    result = subprocess.run(args, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        _remove(dest)
+        raise RuntimeError(f"pg_dump failed: {result.stderr.strip()}")
+    verify_backup(dest)
+    return dest
+
+
+def archive_backup(kind: str) -> dict:
+    """
+    Streams a plain dump straight into the deduplicating archive, then
+    re-reads and checks the stored snapshot (and trial-restores it if
+    BACKUP_VERIFY_RESTORE). Returns the snapshot manifest. Raises
+    RuntimeError if pg_dump or the verification fails.
+    """
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    name = f"backup_{kind}_{timestamp}.sql"
+
+    args, env, dbname = pg_command("pg_dump")
+    args += ["-F", "p", dbname]
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(args, env=env, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            ingested = backup_archive.ingest(proc.stdout)
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"pg_dump failed: {stderr.read().decode(errors='replace').strip()}")
+    if not ingested["complete"]:
+        raise RuntimeError("Backup verification failed: dump is truncated")
+
+    backup_archive.commit_snapshot(name, ingested)
+    try:
+        manifest = backup_archive.verify_snapshot(name)
+        if settings.BACKUP_VERIFY_RESTORE:
+            _trial_restore(backup_archive.iter_snapshot(name))
+    except (ValueError, RuntimeError) as exc:
+        backup_archive.delete_snapshot(name)
+        raise RuntimeError(f"Backup verification failed: {exc}")
+    return manifest
+
+
+def prune_archive() -> None:
+    removed = backup_archive.apply_retention(
+        settings.BACKUP_KEEP_DAILY, settings.BACKUP_KEEP_WEEKLY, settings.BACKUP_KEEP_MONTHLY,
+    )
+    chunks = backup_archive.collect_garbage()
+    if removed:
+        logger.info("Archive retention removed %d snapshot(s) and %d chunk(s).", len(removed), chunks)
+
+
+def restore_from_path(path: Path) -> None:
+    """
+    Restores a backup over the current database. Plain .sql dumps go through
+    psql; custom and directory dumps through a parallel pg_restore.
+    Raises RuntimeError if the restore fails.
+    """
+    if backup_format(path) == "plain":
+        args, env, dbname = pg_command("psql")
+        args += ["-d", dbname, "-f", str(path)]
+    else:
+        args, env, dbname = pg_command("pg_restore")
+        args += [
+            "-d", dbname,
+            "--clean", "--if-exists", "--no-owner",
+            "-j", str(max(1, settings.BACKUP_JOBS)),
+            str(path),
+        ]
+
+    result = subprocess.run(args, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Restore failed: {result.stderr.strip()}")
+
+
+# =================================================================================
+# STREAMING DUMP & RESTORE
+# =================================================================================
+
+def can_stream_backup() -> bool:
+    # pg_dump can only write a directory-format dump to disk, not to stdout
+    return settings.BACKUP_FORMAT in ("plain", "custom")
+
+
+def _finish_background_dump(task: asyncio.Task) -> None:
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background backup failed: %s", task.exception())
+
+
+async def stream_backup(kind: str) -> tuple[str, AsyncIterator[bytes]]:
+    """
+    Starts pg_dump writing to stdout and returns the archive's filename and
+    an iterator over its bytes. Every chunk is written to BACKUP_DIR as it
+    is yielded, so the client download and the stored archive are produced
+    in one pass; if the client disconnects the archive is still completed.
+    Raises RuntimeError if pg_dump fails before producing any output.
+    """
+    flag, suffix = BACKUP_FORMATS[settings.BACKUP_FORMAT]
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    dest = BACKUP_DIR / f"backup_{kind}_{timestamp}{suffix}"
+    partial = dest.with_name(dest.name + ".part")
+
+    args, env, dbname = pg_command("pg_dump")
+    args += ["-F", flag]
+    if flag == "c":
+        args += ["-Z", str(settings.BACKUP_COMPRESSION)]
+    args.append(dbname)
+
+    proc = await asyncio.create_subprocess_exec(
+        *args, env=env, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    stderr_task = asyncio.create_task(proc.stderr.read())
+    out = open(partial, "wb")
+
+    async def complete() -> None:
+        """Drains whatever the client did not take into the archive and finalizes it."""
+        try:
+            while chunk := await proc.stdout.read(STREAM_CHUNK_SIZE):
+                out.write(chunk)
+        finally:
+            out.close()
+        returncode = await proc.wait()
+        stderr = (await stderr_task).decode(errors="replace").strip()
+        if returncode != 0:
+            partial.unlink(missing_ok=True)
+            raise RuntimeError(f"pg_dump failed: {stderr}")
+        partial.rename(dest)
+        await asyncio.to_thread(verify_backup, dest)
+        await asyncio.to_thread(record_backup)
+        logger.info("Streamed backup saved: %s", dest)
+
+    first = await proc.stdout.read(STREAM_CHUNK_SIZE)
+    if not first:
+        await complete()
+
+    async def body() -> AsyncIterator[bytes]:
+        chunk = first
+        finished = False
+        try:
+            while chunk:
+                out.write(chunk)
+                yield chunk
+                chunk = await proc.stdout.read(STREAM_CHUNK_SIZE)
+            finished = True
+            # Raising here aborts the response, so the client sees a failed download
+            await complete()
+        finally:
+            if not finished:
+                task = asyncio.create_task(complete())
+                _background.add(task)
+                task.add_done_callback(_finish_background_dump)
+
+    return dest.name, body()
+
+
+class _ChunkReader(io.RawIOBase):
+    """Blocking file-like view of chunks fed from the event loop, for tarfile."""
+
+    def __init__(self, maxsize: int = 16):
+        self.chunks: queue.Queue[bytes | None] = queue.Queue(maxsize)
+        self._pending = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            if self._eof:
+                return 0
+            chunk = self.chunks.get()
+            if chunk is None:
+                self._eof = True
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def abort(self) -> None:
+        """Ends the stream early, waking a reader blocked on an empty queue; never blocks."""
+        # Drop what is queued so the sentinel fits; the reader only takes from the queue
+        while True:
+            try:
+                self.chunks.get_nowait()
+            except queue.Empty:
+                break
+        self.chunks.put_nowait(None)
+
+
+def _extract_directory_dump(fileobj, dest: Path) -> None:
+    """Unpacks a tarred directory-format dump as it streams in, keeping only its flat data files."""
+    with tarfile.open(fileobj=fileobj, mode="r|") as tar:
+        for member in tar:
+            name = Path(member.name).name
+            if not member.isfile() or not name or name.startswith("."):
+                continue
+            with open(dest / name, "wb") as out:
+                shutil.copyfileobj(tar.extractfile(member), out)
+    if not (dest / "toc.dat").exists():
+        raise ValueError("Archive is not a directory-format backup.")
+
+
+async def _restore_directory_archive(chunks: AsyncIterator[bytes]) -> None:
+    workdir = Path(tempfile.mkdtemp(suffix=".dir"))
+    reader = _ChunkReader()
+    extract = asyncio.create_task(
+        asyncio.to_thread(_extract_directory_dump, io.BufferedReader(reader), workdir)
+    )
+    try:
+        async for chunk in chunks:
+            while not extract.done():
+                try:
+                    reader.chunks.put_nowait(chunk)
+                    break
+                except queue.Full:
+                    await asyncio.sleep(0.01)
+            if extract.done():
+                break
+        while not extract.done():
+            try:
+                reader.chunks.put_nowait(None)
+                break
+            except queue.Full:
+                await asyncio.sleep(0.01)
+        try:
+            await extract
+        except (tarfile.TarError, ValueError) as exc:
+            raise ValueError(f"Invalid directory backup archive: {exc}")
+
+        # Extracted data is needed on disk anyway for a parallel pg_restore
+        await asyncio.to_thread(restore_from_path, workdir)
+    finally:
+        # Cancelling the task cannot stop its thread, which may be blocked on
+        # the queue; end the stream and let it finish before removing workdir
+        if not extract.done():
+            reader.abort()
+        try:
+            await extract
+        except Exception:
+            pass  # already reported, or the abort's own truncated-archive error
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+async def restore_from_stream(filename: str, chunks: AsyncIterator[bytes]) -> None:
+    """
+    Restores an uploaded backup while it is still being received: .sql and
+    .dump uploads are piped straight into psql / pg_restore's stdin, and a
+    .tar of a directory dump is unpacked as it arrives. Raises ValueError
+    for an unsupported or malformed upload, RuntimeError if the restore fails.
+    """
+    suffix = Path(filename).suffix
+    if suffix == ".tar":
+        await _restore_directory_archive(chunks)
+        return
+
+    fmt = BACKUP_SUFFIXES.get(suffix)
+    if fmt == "plain":
+        args, env, dbname = pg_command("psql")
+        args += ["-q", "-d", dbname]
+    elif fmt == "custom":
+        # Piped input cannot be restored with -j; pg_restore needs to seek for that
+        args, env, dbname = pg_command("pg_restore")
+        args += ["-d", dbname, "--clean", "--if-exists", "--no-owner"]
+    else:
+        raise ValueError("Only .sql, .dump or .tar backup files are accepted.")
+
+    proc = await asyncio.create_subprocess_exec(
+        *args, env=env,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr_task = asyncio.create_task(proc.stderr.read())
+    try:
+        async for chunk in chunks:
+            proc.stdin.write(chunk)
+            await proc.stdin.drain()
+        proc.stdin.close()
+    except (BrokenPipeError, ConnectionResetError):
+        # The restore exited early; its stderr explains why
+        pass
+    except BaseException:
+        proc.kill()
+        await proc.wait()
+        raise
+
+    returncode = await proc.wait()
+    stderr = (await stderr_task).decode(errors="replace").strip()
+    if returncode != 0:
+        raise RuntimeError(f"Restore failed: {stderr}")
+
+
 # =================================================================================
 # BACKUP EXECUTION
 # =================================================================================
@@ -78,40 +642,22 @@ def _do_backup() -> None:
             logger.info("Scheduled backup skipped — schedule is set to manual.")
             return
 
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        filename  = f"backup_auto_{timestamp}.sql"
-        dest      = BACKUP_DIR / filename
-
-        db_info = _parse_db_url(settings.DATABASE_URL)
-        env = os.environ.copy()
-        env["PGPASSWORD"] = db_info["password"]
-
-        result = subprocess.run(
-            [
-                "pg_dump",
-                "-h", db_info["host"],
-                "-p", db_info["port"],
-                "-U", db_info["user"],
-                "-F", "p",
-                "-f", str(dest),
-                db_info["dbname"],
-            ],
-            env=env,
-            capture_output=True,
-            text=True,
-        )
-
-        if result.returncode != 0:
-            logger.error("Scheduled pg_dump failed: %s", result.stderr.strip())
+        try:
+            if settings.BACKUP_DEDUP:
+                saved = archive_backup("auto")["name"]
+            else:
+                saved = create_backup("auto").name
+        except (RuntimeError, OSError) as exc:
+            logger.error("Scheduled backup failed: %s", exc)
+            set_backup_failed(db, str(exc))
             return
 
-        logger.info("Scheduled backup saved: %s", dest)
+        logger.info("Scheduled backup saved: %s", saved)
         set_last_backup(db)
-
-        auto_files = sorted(BACKUP_DIR.glob("backup_auto_*.sql"), reverse=True)
-        for old in auto_files[30:]:
-            old.unlink(missing_ok=True)
-            logger.info("Pruned old backup: %s", old.name)
+        if settings.BACKUP_DEDUP:
+            prune_archive()
+        else:
+            prune_backups("auto")
 
     except Exception as exc:
         logger.exception("Unexpected error during scheduled backup: %s", exc)
@@ -150,6 +696,23 @@ def _reschedule() -> None:
 
 def start_scheduler() -> None:
     _reschedule()
+    # Creates next months' system_logs partitions and drops expired ones
+    _scheduler.add_job(
+        run_log_maintenance,
+        trigger=CronTrigger(hour=0, minute=15),
+        id=_LOG_MAINTENANCE_JOB_ID,
+        replace_existing=True,
+        misfire_grace_time=3600,
+    )
+    if settings.PITR_ENABLED:
+        # WAL is archived continuously; base backups bound how much of it a restore replays
+        _scheduler.add_job(
+            run_scheduled_base_backup,
+            trigger=IntervalTrigger(days=settings.BASE_BACKUP_INTERVAL_DAYS),
+            id=_BASE_BACKUP_JOB_ID,
+            replace_existing=True,
+            misfire_grace_time=3600,
+        )
     _scheduler.start()
 
     job = _scheduler.get_job(_JOB_ID)
@@ -167,6 +730,19 @@ def stop_scheduler() -> None:
         logger.info("Backup scheduler stopped.")
 
 
+def queue_reschedule(_payload: str | None = None) -> None:
+    """Re-reads the schedule on the scheduler's own thread; safe to call from LISTEN callbacks."""
+    if _scheduler.running:
+        _scheduler.add_job(_reschedule, id="reschedule_backup", replace_existing=True)
+
+
+def queue_base_backup(payload: str | None = None) -> None:
+    """Runs a requested base backup on the scheduler's threads; safe to call from LISTEN callbacks."""
+    # None only means the listener reconnected, not that anyone asked for a backup
+    if payload is not None and settings.PITR_ENABLED and _scheduler.running:
+        _scheduler.add_job(run_scheduled_base_backup, id="pitr_base_backup_requested", replace_existing=True)
+
+
 def apply_new_schedule() -> None:
     if _scheduler.running:
         _reschedule()
@@ -12,6 +12,7 @@ from fastapi import HTTPException, status
 from app.models.blotter import BlotterRecord
 from app.models.resident import Resident, Address
 from app.schemas.blotter import BlotterRecordCreate, BlotterRecordUpdate
+from app.services.numbering_service import next_blotter_no
 
 
 # =================================================================================
@@ -31,21 +32,7 @@ def _get_record(db: Session, blotter_id: int) -> BlotterRecord | None:
 
 
 def _generate_blotter_no(db: Session) -> str:
-    year = datetime.now().year
-    year_prefix = f"{year}-"
-    count = (
-        db.query(BlotterRecord)
-        .filter(BlotterRecord.blotter_no.like(f"{year_prefix}%"))
-        .count()
-    )
-
-    while True:
-        sequence = count + 1
-        blotter_no = f"{year}-{sequence:05d}"
-        exists = db.query(BlotterRecord).filter_by(blotter_no=blotter_no).first()
-        if not exists:
-            return blotter_no
-        count += 1
+    return next_blotter_no(db, datetime.now().year)
 
 
 def _validate_resident(db: Session, resident_id: int) -> Resident:
@@ -0,0 +1,173 @@
+"""
+app/services/bootstrap_service.py
+
+Service layer for the kiosk bootstrap bundle.
+Builds one serialized bundle of document types, equipment, FAQs, contact
+information, announcements and kiosk config, and keeps it in memory with a
+strong ETag until any of the underlying admin data changes.
+
+Changes are detected with ORM session events on the tracked models, which
+NOTIFY every worker inside the writing transaction — so the bundle is
+invalidated on commit no matter which service made the change.
+"""
+
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, defer
+
+from app.core.config import settings
+from app.core.pg_listener import subscribe
+from app.models.announcement import Announcement
+from app.models.contact import ContactInformation
+from app.models.document import DocumentType
+from app.models.equipment import EquipmentInventory
+from app.models.faqs import FAQ
+from app.models.systemconfig import SystemConfig
+from app.schemas.bootstrap import KioskBootstrapOut
+from app.services.announcement_service import get_active_announcements
+from app.services.contact_service import get_or_create_contact
+from app.services.equipment_service import get_available_equipment
+from app.services.faqs_service import get_kiosk_faqs
+from app.services.systemconfig_service import CONFIG_CHANNEL, get_config
+
+BUNDLE_CHANNEL = "kiosk_bundle_changed"
+
+_TRACKED_MODELS = (
+    Announcement,
+    ContactInformation,
+    DocumentType,
+    EquipmentInventory,
+    FAQ,
+    SystemConfig,
+)
+
+_SESSION_FLAG = "kiosk_bundle_dirty"
+
+_bundle_lock = threading.Lock()
+_build_lock = threading.Lock()
+_cached_bundle: tuple[str, bytes] | None = None
+_cached_at = 0.0
+_generation = 0
+
+
+# =================================================================================
+# INVALIDATION
+# =================================================================================
+
+def invalidate_bundle(_payload: str | None = None) -> None:
+    global _cached_bundle, _generation
+    with _bundle_lock:
+        _cached_bundle = None
+        _generation += 1
+
+
+subscribe(BUNDLE_CHANNEL, invalidate_bundle)
+subscribe(CONFIG_CHANNEL, invalidate_bundle)
+
+
+def notify_bundle_changed(session: Session) -> None:
+    """
+    Invalidates the bundle on every worker when the session's transaction
+    commits. The session events call this for ORM writes; raw SQL against a
+    tracked table has to call it itself.
+    """
+    if session.info.get(_SESSION_FLAG):
+        return
+    session.info[_SESSION_FLAG] = True
+    # NOTIFY is transactional: delivered to every worker only if this commits
+    session.connection().execute(
+        text("SELECT pg_notify(:channel, '')"), {"channel": BUNDLE_CHANNEL}
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _TRACKED_MODELS):
+            notify_bundle_changed(session)
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _TRACKED_MODELS):
+        notify_bundle_changed(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop(_SESSION_FLAG, False):
+        invalidate_bundle()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_after_rollback(session):
+    session.info.pop(_SESSION_FLAG, None)
+
+
+# =================================================================================
+# BUNDLE
+# =================================================================================
+
+def _build_bundle(db: Session) -> tuple[str, bytes]:
+    document_types = (
+        db.query(DocumentType)
+        .options(defer(DocumentType.file))
+        .filter(
+            DocumentType.is_available.is_(True),
+            DocumentType.is_id_application.is_(False),
+        )
+        .order_by(DocumentType.doctype_name.asc())
+        .all()
+    )
+
+    bundle = KioskBootstrapOut(
+        generated_at=datetime.now(timezone.utc),
+        config=get_config(db),
+        document_types=document_types,
+        equipment=get_available_equipment(db),
+        faqs=get_kiosk_faqs(db),
+        contact=get_or_create_contact(db),
+        announcements=get_active_announcements(db),
+    )
+
+    # Hash everything except generated_at so identical data keeps the same ETag
+    content = bundle.model_dump_json(exclude={"generated_at"}).encode()
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    return etag, bundle.model_dump_json().encode()
+
+
+def get_bootstrap_bundle(db: Session) -> tuple[str, bytes]:
+    """Returns (etag, JSON body) for the current bundle, rebuilding it only after a change."""
+    global _cached_bundle, _cached_at
+    with _bundle_lock:
+        if _cached_bundle is not None and time.monotonic() - _cached_at < settings.CONFIG_CACHE_TTL:
+            return _cached_bundle
+
+    # Serialize rebuilds so a burst of kiosks after an edit triggers one build
+    with _build_lock:
+        with _bundle_lock:
+            if _cached_bundle is not None and time.monotonic() - _cached_at < settings.CONFIG_CACHE_TTL:
+                return _cached_bundle
+            generation = _generation
+
+        bundle = _build_bundle(db)
+
+        with _bundle_lock:
+            if generation == _generation:
+                _cached_bundle = bundle
+                _cached_at = time.monotonic()
+        return bundle
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
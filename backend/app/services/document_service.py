@@ -6,7 +6,6 @@ Handles PDF generation via LibreOffice, eligibility checks, request lifecycle
 (approve, reject, release, payment, undo), and blotter summaries.
 """
 
-import random
 import subprocess
 import tempfile
 import os
@@ -16,6 +15,7 @@ from datetime import datetime, date
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
 from docxtpl import DocxTemplate
+from app.core.metrics import track_pdf_conversion
 from app.models.document import DocumentType, DocumentRequest
 from app.models.resident import Resident
 from app.models.blotter import BlotterRecord
@@ -29,6 +29,8 @@ from app.schemas.document import (
 )
 from pathlib import Path
 from app.services.transaction_service import record_document_transaction
+from app.services.numbering_service import next_transaction_no
+from app.services.revenue_service import bump_data_versions, record_revenue_change, revenue_entry
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 PDF_STORAGE_DIR = BASE_DIR / "storage" / "documents"
@@ -60,24 +62,25 @@ def _convert_docx_to_pdf(docx_bytes: bytes) -> bytes:
         else:
             soffice_cmd = "soffice"
         
-        try:
-            subprocess.run(
-                [
-                    soffice_cmd,
-                    "--headless",
-                    "--convert-to", "pdf",
-                    "--outdir", temp_dir,
-                    docx_path
-                ],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=30
-            )
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"LibreOffice conversion failed: {e.stderr.decode()}")
-        except FileNotFoundError:
-            raise Exception("LibreOffice not found. Install with: sudo apt-get install libreoffice")
+        with track_pdf_conversion("document"):
+            try:
+                subprocess.run(
+                    [
+                        soffice_cmd,
+                        "--headless",
+                        "--convert-to", "pdf",
+                        "--outdir", temp_dir,
+                        docx_path
+                    ],
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=30
+                )
+            except subprocess.CalledProcessError as e:
+                raise Exception(f"LibreOffice conversion failed: {e.stderr.decode()}")
+            except FileNotFoundError:
+                raise Exception("LibreOffice not found. Install with: sudo apt-get install libreoffice")
         
         pdf_path = os.path.join(temp_dir, "document.pdf")
         if not os.path.exists(pdf_path):
@@ -211,12 +214,7 @@ def _check_existing_pending_request(db: Session, resident_id: int, doctype_id: i
 
 
 def _generate_transaction_no(db: Session) -> str:
-    while True:
-        number = random.randint(1000, 9999)
-        transaction_no = f"DR-{number}"
-        exists = db.query(DocumentRequest).filter_by(transaction_no=transaction_no).first()
-        if not exists:
-            return transaction_no
+    return next_transaction_no(db, "DR")
 
 
 # =================================================================================
@@ -448,6 +446,7 @@ def create_document_request(db: Session, payload: DocumentRequestCreate) -> Docu
     )
 
     db.add(request)
+    record_revenue_change(db, None, revenue_entry(request))
     db.commit()
     db.refresh(request)
 
@@ -696,7 +695,9 @@ def mark_request_paid(db: Session, request_id: int):
     req = _get_request(db, request_id)
     if not req:
         return False
+    before = revenue_entry(req)
     req.payment_status = "paid"
+    record_revenue_change(db, before, revenue_entry(req))
     db.commit()
     return True
 
@@ -705,7 +706,9 @@ def mark_request_unpaid(db: Session, request_id: int):
     req = _get_request(db, request_id)
     if not req:
         return False
+    before = revenue_entry(req)
     req.payment_status = "unpaid"
+    record_revenue_change(db, before, revenue_entry(req))
     db.commit()
     return True
 
@@ -755,12 +758,17 @@ def delete_request(db: Session, request_id: int):
     req = _get_request(db, request_id)
     if not req:
         return False
+    record_revenue_change(db, revenue_entry(req), None)
     db.delete(req)
     db.commit()
     return True
 
 
 def bulk_delete_requests(db: Session, ids: list[int]):
+    for req in db.query(DocumentRequest).filter(DocumentRequest.id.in_(ids)).all():
+        record_revenue_change(db, revenue_entry(req), None)
+    # A bulk delete skips the session events that keep statement versions current
+    bump_data_versions(db, "document_request", ids)
     count = db.query(DocumentRequest).filter(DocumentRequest.id.in_(ids)).delete(synchronize_session=False)
     db.commit()
     return count
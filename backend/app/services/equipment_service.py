@@ -4,12 +4,16 @@ app/services/equipment_service.py
 Service layer for equipment inventory management and borrowing requests.
 Handles availability validation, cost calculation, request lifecycle
 (approve, reject, pickup, return, payment, refund, undo), and notes.
+
+Stock is taken and returned with conditional UPDATEs covering all of a
+request's items at once (_reserve_equipment / _release_equipment), so
+concurrent kiosks and admins cannot oversubscribe an item and only requests
+for the same items ever wait on each other.
 """
 
-import random
 from datetime import datetime
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, text
 from fastapi import HTTPException, status
 from app.models.equipment import EquipmentInventory, EquipmentRequest, EquipmentRequestItem
 from app.models.resident import Resident, ResidentRFID
@@ -22,28 +26,47 @@ from app.schemas.equipment import (
 )
 from app.services.transaction_service import record_equipment_transaction
 from app.services.resident_service import get_resident_autofill_data
+from app.services.numbering_service import next_transaction_no
+from app.services.revenue_service import record_revenue_change, revenue_entry
+
+
+# Locks the wanted inventory rows in id order first, so two requests for
+# overlapping items cannot deadlock, then takes each quantity only where it
+# is still available. Rows that come back are the items actually reserved.
+_RESERVE_SQL = """
+    WITH wanted (item_id, quantity) AS (VALUES {values}),
+    locked AS MATERIALIZED (
+        SELECT e.id FROM equipment_inventory e
+        JOIN wanted w ON w.item_id = e.id
+        ORDER BY e.id
+        FOR UPDATE OF e
+    )
+    UPDATE equipment_inventory e
+    SET available_quantity = e.available_quantity - w.quantity
+    FROM wanted w, locked l
+    WHERE e.id = w.item_id AND l.id = e.id AND e.available_quantity >= w.quantity
+    RETURNING e.id
+"""
+
+_RELEASE_SQL = """
+    WITH wanted (item_id, quantity) AS (VALUES {values}),
+    locked AS MATERIALIZED (
+        SELECT e.id FROM equipment_inventory e
+        JOIN wanted w ON w.item_id = e.id
+        ORDER BY e.id
+        FOR UPDATE OF e
+    )
+    UPDATE equipment_inventory e
+    SET available_quantity = LEAST(e.total_quantity, e.available_quantity + w.quantity)
+    FROM wanted w, locked l
+    WHERE e.id = w.item_id AND l.id = e.id
+"""
 
 
 # =================================================================================
 # INTERNAL HELPERS
 # =================================================================================
 
-def _validate_equipment_item(db: Session, item_id: int) -> EquipmentInventory:
-    equipment = (
-        db.query(EquipmentInventory)
-        .filter(EquipmentInventory.id == item_id)
-        .first()
-    )
-
-    if not equipment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Equipment item with ID {item_id} not found"
-        )
-
-    return equipment
-
-
 def _validate_resident(db: Session, resident_id: int) -> Resident:
     resident = db.query(Resident).filter(Resident.id == resident_id).first()
 
@@ -56,24 +79,98 @@ def _validate_resident(db: Session, resident_id: int) -> Resident:
     return resident
 
 
-def _check_equipment_availability(
-    db: Session,
-    item_id: int,
-    requested_quantity: int
-) -> bool:
-    equipment = _validate_equipment_item(db, item_id)
-
-    if equipment.available_quantity < requested_quantity:
+def _get_equipment_items(db: Session, item_ids) -> dict[int, EquipmentInventory]:
+    """All requested inventory rows in one query; 404 if any is missing."""
+    item_ids = set(item_ids)
+    found = {
+        equipment.id: equipment
+        for equipment in db.query(EquipmentInventory).filter(EquipmentInventory.id.in_(item_ids))
+    }
+    missing = sorted(item_ids - found.keys())
+    if missing:
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Only {equipment.available_quantity} units of '{equipment.name}' available"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Equipment item with ID {missing[0]} not found"
         )
+    return found
+
+
+def _quantities(items) -> dict[int, int]:
+    """item_id -> total quantity, for payload items or EquipmentRequestItem rows."""
+    totals: dict[int, int] = {}
+    for item in items:
+        totals[item.item_id] = totals.get(item.item_id, 0) + item.quantity
+    return totals
+
+
+def _inventory_statement(sql: str, quantities: dict[int, int]):
+    values = ", ".join(
+        f"(CAST(:item_{i} AS integer), CAST(:qty_{i} AS integer))" for i in range(len(quantities))
+    )
+    params = {}
+    for i, (item_id, quantity) in enumerate(sorted(quantities.items())):
+        params[f"item_{i}"] = item_id
+        params[f"qty_{i}"] = quantity
+    return text(sql.format(values=values)), params
+
+
+def _notify_stock_changed(db: Session) -> None:
+    # The stock UPDATEs are raw SQL, which the bootstrap session events do not
+    # see; the kiosk bundle carries available_quantity
+    from app.services.bootstrap_service import notify_bundle_changed
+    notify_bundle_changed(db)
+
+
+def _reserve_equipment(db: Session, quantities: dict[int, int]) -> None:
+    """
+    Takes every quantity out of available stock in one conditional UPDATE,
+    or none of them: if any item falls short, what was taken is put back and
+    409 is raised naming the item. Does not commit.
+    """
+    if not quantities:
+        return
+
+    stmt, params = _inventory_statement(_RESERVE_SQL, quantities)
+    reserved = {row.id for row in db.execute(stmt, params)}
+    if reserved:
+        _notify_stock_changed(db)
+    short = sorted(quantities.keys() - reserved)
+    if not short:
+        return
+
+    if reserved:
+        _release_equipment(db, {item_id: quantities[item_id] for item_id in reserved})
+    equipment = (
+        db.query(EquipmentInventory)
+        .populate_existing()
+        .filter(EquipmentInventory.id == short[0])
+        .first()
+    )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Only {equipment.available_quantity} units of '{equipment.name}' available"
+    )
 
-    return True
+
+def _release_equipment(db: Session, quantities: dict[int, int]) -> None:
+    """Puts quantities back into available stock, capped at each item's total. Does not commit."""
+    if not quantities:
+        return
+    stmt, params = _inventory_statement(_RELEASE_SQL, quantities)
+    db.execute(stmt, params)
+    _notify_stock_changed(db)
+
+
+def _request_quantities(db: Session, request_id: int) -> dict[int, int]:
+    return _quantities(
+        db.query(EquipmentRequestItem)
+        .filter(EquipmentRequestItem.equipment_request_id == request_id)
+        .all()
+    )
 
 
 def _calculate_total_cost(
-    db: Session,
+    equipment: dict[int, EquipmentInventory],
     items: list,
     borrow_date: datetime,
     return_date: datetime
@@ -84,42 +181,14 @@ def _calculate_total_cost(
     total_cost = 0
     
     for item in items:
-        equipment = _validate_equipment_item(db, item.item_id)
-        item_cost = float(equipment.rate_per_day) * item.quantity * days
+        item_cost = float(equipment[item.item_id].rate_per_day) * item.quantity * days
         total_cost += item_cost
     
     return total_cost
 
 
 def _generate_transaction_no(db: Session) -> str:
-    while True:
-        number = random.randint(1000, 9999)
-        transaction_no = f"ER-{number}"
-        exists = db.query(EquipmentRequest).filter_by(transaction_no=transaction_no).first()
-        if not exists:
-            return transaction_no
-
-
-def _update_equipment_availability(db: Session, request_id: int, action: str):
-    request = db.query(EquipmentRequest).filter(EquipmentRequest.id == request_id).first()
-    
-    if not request:
-        return
-    
-    for item in request.items:
-        equipment = db.query(EquipmentInventory).filter(
-            EquipmentInventory.id == item.item_id
-        ).first()
-        
-        if not equipment:
-            continue
-        
-        if action == "decrease":
-            equipment.available_quantity -= item.quantity
-        elif action == "increase":
-            equipment.available_quantity += item.quantity
-        
-        equipment.available_quantity = max(0, min(equipment.available_quantity, equipment.total_quantity))
+    return next_transaction_no(db, "ER")
 
 
 def _get_request(db: Session, request_id: int):
@@ -166,16 +235,11 @@ def create_equipment_request(
     if payload.resident_id is not None:
         _validate_resident(db, payload.resident_id)
     
-    for item in payload.items:
-        _validate_equipment_item(db, item.item_id)
-        _check_equipment_availability(
-            db,
-            item.item_id,
-            item.quantity
-        )
+    equipment = _get_equipment_items(db, (item.item_id for item in payload.items))
+    _reserve_equipment(db, _quantities(payload.items))
     
     total_cost = _calculate_total_cost(
-        db,
+        equipment,
         payload.items,
         payload.borrow_date,
         payload.return_date
@@ -205,7 +269,7 @@ def create_equipment_request(
     
     db.flush()
 
-    _update_equipment_availability(db, request.id, "decrease")
+    record_revenue_change(db, None, revenue_entry(request))
 
     db.commit()
     db.refresh(request)
@@ -405,7 +469,7 @@ def reject_equipment_request(db: Session, request_id: int):
         return False
     
     if req.status == "Pending":
-        _update_equipment_availability(db, request_id, "increase")
+        _release_equipment(db, _request_quantities(db, request_id))
 
     req.status = "Rejected"
     db.commit()
@@ -441,7 +505,7 @@ def mark_as_returned(db: Session, request_id: int):
             detail=f"Can only mark Picked-Up requests as Returned"
         )
     
-    _update_equipment_availability(db, request_id, "increase")
+    _release_equipment(db, _request_quantities(db, request_id))
     
     req.status = "Returned"
     req.returned_at = datetime.now()
@@ -456,7 +520,9 @@ def mark_request_paid(db: Session, request_id: int):
     if not req:
         return False
     
+    before = revenue_entry(req)
     req.payment_status = "paid"
+    record_revenue_change(db, before, revenue_entry(req))
     db.commit()
     return True
 
@@ -466,7 +532,9 @@ def mark_request_unpaid(db: Session, request_id: int):
     if not req:
         return False
     
+    before = revenue_entry(req)
     req.payment_status = "unpaid"
+    record_revenue_change(db, before, revenue_entry(req))
     db.commit()
     return True
 
@@ -476,7 +544,9 @@ def toggle_refund_status(db: Session, request_id: int):
     if not req:
         return False
     
+    before = revenue_entry(req)
     req.is_refunded = not req.is_refunded
+    record_revenue_change(db, before, revenue_entry(req))
     db.commit()
     return True
 
@@ -503,7 +573,8 @@ def undo_equipment_request(db: Session, request_id: int):
     new_status = status_undo_map[old_status]
 
     if old_status in ("Rejected", "Returned"):
-        _update_equipment_availability(db, request_id, "decrease")
+        # The items are held again, so they must still be in stock
+        _reserve_equipment(db, _request_quantities(db, request_id))
 
     req.status = new_status
 
@@ -536,7 +607,10 @@ def bulk_undo_equipment_requests(db: Session, ids: list[int]):
         new_status = status_undo_map[old_status]
 
         if old_status in ("Rejected", "Returned"):
-            _update_equipment_availability(db, req.id, "decrease")
+            try:
+                _reserve_equipment(db, _request_quantities(db, req.id))
+            except HTTPException:
+                continue  # out of stock; this one stays as it is
 
         req.status = new_status
 
@@ -558,8 +632,9 @@ def delete_equipment_request(db: Session, request_id: int):
     # "Returned" and "Rejected" already restored availability during their
     # lifecycle transitions — restoring again would double-add stock.
     if req.status in ["Pending", "Approved", "Picked-Up"]:
-        _update_equipment_availability(db, request_id, "increase")
+        _release_equipment(db, _request_quantities(db, request_id))
 
+    record_revenue_change(db, revenue_entry(req), None)
     db.delete(req)
     db.commit()
     return True
@@ -568,13 +643,22 @@ def delete_equipment_request(db: Session, request_id: int):
 def bulk_delete_equipment_requests(db: Session, ids: list[int]):
     requests = db.query(EquipmentRequest).filter(EquipmentRequest.id.in_(ids)).all()
 
-    for req in requests:
-        if req.status in ["Pending", "Approved", "Picked-Up"]:
-            _update_equipment_availability(db, req.id, "increase")
+    # Everything still held by the deleted requests goes back in one statement
+    held = (
+        db.query(EquipmentRequestItem)
+        .join(EquipmentRequest, EquipmentRequest.id == EquipmentRequestItem.equipment_request_id)
+        .filter(
+            EquipmentRequest.id.in_(ids),
+            EquipmentRequest.status.in_(["Pending", "Approved", "Picked-Up"]),
+        )
+        .all()
+    )
+    _release_equipment(db, _quantities(held))
     
     count = len(requests)
     
     for req in requests:
+        record_revenue_change(db, revenue_entry(req), None)
         db.delete(req)
     
     db.commit()
@@ -0,0 +1,391 @@
+"""
+app/services/export_service.py
+
+Streaming CSV and XLSX exports of tabular data: financial transactions,
+transaction history, document requests and equipment requests.
+
+Each export is a single SELECT run on its own connection with a server-side
+cursor (stream_results) and fetched EXPORT_BATCH_ROWS at a time; rows are
+encoded as they arrive and handed to a StreamingResponse, so memory stays
+flat however much history is exported. XLSX is written directly as a zip
+stream (one worksheet, inline strings), which needs no seeking and no
+spreadsheet library.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, cast, func, select
+
+from app.db.session import engine
+from app.models.document import DocumentRequest, DocumentType
+from app.models.equipment import EquipmentInventory, EquipmentRequest, EquipmentRequestItem
+from app.models.resident import Resident
+from app.models.transaction import TransactionHistory
+from app.services.finance_service import financial_transactions_query
+from app.services.revenue_service import SERVICES
+
+EXPORT_FORMATS = {
+    "csv":  "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_ROWS = 1000
+
+# Encoded output is handed to the response once this much has accumulated
+_FLUSH_BYTES = 64 * 1024
+
+# Characters XML 1.0 does not allow, even escaped
+_XML_ILLEGAL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _validate(fmt: str, date_from: Optional[date], date_to: Optional[date]) -> None:
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format '{fmt}'. Use: csv, xlsx",
+        )
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must be on or before date_to",
+        )
+
+
+def _resident_name():
+    return func.coalesce(
+        func.nullif(func.concat_ws(" ", Resident.first_name, Resident.last_name), ""), "N/A"
+    )
+
+
+def _in_period(column, date_from: Optional[date], date_to: Optional[date]) -> list:
+    conditions = []
+    if date_from:
+        conditions.append(column >= datetime.combine(date_from, datetime.min.time()))
+    if date_to:
+        conditions.append(column <= datetime.combine(date_to, datetime.max.time()))
+    return conditions
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, datetime):
+        return value.astimezone().strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _stream_rows(stmt) -> Iterator[tuple]:
+    """Yields the statement's rows through a server-side cursor on a dedicated connection."""
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=EXPORT_BATCH_ROWS,
+        ).execute(stmt)
+        for row in result:
+            yield tuple(row)
+
+
+# =================================================================================
+# WRITERS
+# =================================================================================
+
+class _Sink:
+    """
+    Write-only buffer the encoders write into, drained after every row. It has
+    no tell()/seek(), so zipfile treats it as an unseekable stream.
+    """
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data) -> int:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self, force: bool = False) -> bytes | None:
+        if not self.chunks or (self.size < _FLUSH_BYTES and not force):
+            return None
+        data = b"".join(self.chunks)
+        self.chunks, self.size = [], 0
+        return data
+
+
+def _csv_chunks(headers: list[str], rows: Iterable[tuple]) -> Iterator[bytes]:
+    sink = _Sink()
+    line = io.StringIO()
+    writer = csv.writer(line)
+
+    def write_row(values) -> None:
+        writer.writerow(values)
+        sink.write(line.getvalue())
+        line.seek(0)
+        line.truncate()
+
+    # BOM so Excel opens the file as UTF-8 (resident names carry ñ and accents)
+    sink.write("\ufeff")
+    write_row(headers)
+    for row in rows:
+        write_row([_text(value) for value in row])
+        if (data := sink.drain()) is not None:
+            yield data
+    if (data := sink.drain(force=True)) is not None:
+        yield data
+
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+
+def _xlsx_cell(value) -> str:
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = escape(_XML_ILLEGAL.sub("", _text(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values) -> bytes:
+    return ("<row>" + "".join(_xlsx_cell(v) for v in values) + "</row>").encode("utf-8")
+
+
+def _xlsx_chunks(headers: list[str], rows: Iterable[tuple], sheet_name: str) -> Iterator[bytes]:
+    sink = _Sink()
+    # The sink cannot seek, so zipfile writes sizes and CRCs after each member's data
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(name=escape(sheet_name[:31])))
+
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b'<sheetData>'
+            )
+            sheet.write(_xlsx_row(headers))
+            for row in rows:
+                sheet.write(_xlsx_row(row))
+                if (data := sink.drain()) is not None:
+                    yield data
+            sheet.write(b"</sheetData></worksheet>")
+    if (data := sink.drain(force=True)) is not None:
+        yield data
+
+
+def _stream(stmt, headers: list[str], fmt: str, sheet_name: str) -> Iterator[bytes]:
+    rows = _stream_rows(stmt)
+    try:
+        if fmt == "xlsx":
+            yield from _xlsx_chunks(headers, rows, sheet_name)
+        else:
+            yield from _csv_chunks(headers, rows)
+    finally:
+        # Releases the cursor and connection at once if the client goes away
+        rows.close()
+
+
+# =================================================================================
+# DATASETS
+# =================================================================================
+
+def export_financial_transactions(
+    fmt: str,
+    date_from: date,
+    date_to: date,
+    service: Optional[str] = None,
+) -> Iterator[bytes]:
+    """The financial statement's transactions, one row each, across the selected services."""
+    _validate(fmt, date_from, date_to)
+    if service is not None and service not in SERVICES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid service filter '{service}'. Use: documents, id_services, equipment",
+        )
+    headers = [
+        "Requested At", "Service", "Transaction No.", "Resident", "Description",
+        "Status", "Payment Status", "Refunded", "Amount",
+    ]
+    return _stream(financial_transactions_query(date_from, date_to, service), headers, fmt, "Transactions")
+
+
+def export_transaction_history(
+    fmt: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    resident_id: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Completed and rejected transactions, optionally for one resident."""
+    _validate(fmt, date_from, date_to)
+    stmt = (
+        select(
+            TransactionHistory.created_at,
+            TransactionHistory.transaction_type,
+            TransactionHistory.transaction_no,
+            TransactionHistory.transaction_name,
+            _resident_name(),
+            TransactionHistory.rfid_uid,
+            TransactionHistory.status,
+        )
+        .outerjoin(Resident, Resident.id == TransactionHistory.resident_id)
+        .where(*_in_period(TransactionHistory.created_at, date_from, date_to))
+        .order_by(TransactionHistory.created_at, TransactionHistory.id)
+    )
+    if resident_id is not None:
+        stmt = stmt.where(TransactionHistory.resident_id == resident_id)
+    headers = ["Date", "Type", "Transaction No.", "Transaction", "Resident", "RFID", "Status"]
+    return _stream(stmt, headers, fmt, "Transaction History")
+
+
+def export_document_requests(
+    fmt: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    request_status: Optional[str] = None,
+) -> Iterator[bytes]:
+    """Document requests and I.D applications."""
+    _validate(fmt, date_from, date_to)
+    stmt = (
+        select(
+            DocumentRequest.requested_at,
+            DocumentRequest.transaction_no,
+            _resident_name(),
+            func.coalesce(DocumentType.doctype_name, "I.D Application"),
+            DocumentRequest.status,
+            DocumentRequest.payment_status,
+            DocumentRequest.price,
+            DocumentRequest.notes,
+        )
+        .outerjoin(Resident, Resident.id == DocumentRequest.resident_id)
+        .outerjoin(DocumentType, DocumentType.id == DocumentRequest.doctype_id)
+        .where(*_in_period(DocumentRequest.requested_at, date_from, date_to))
+        .order_by(DocumentRequest.requested_at, DocumentRequest.id)
+    )
+    if request_status:
+        stmt = stmt.where(DocumentRequest.status == request_status)
+    headers = [
+        "Requested At", "Transaction No.", "Resident", "Document",
+        "Status", "Payment Status", "Price", "Notes",
+    ]
+    return _stream(stmt, headers, fmt, "Document Requests")
+
+
+def export_equipment_requests(
+    fmt: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    request_status: Optional[str] = None,
+) -> Iterator[bytes]:
+    """Equipment borrowing requests with their items."""
+    _validate(fmt, date_from, date_to)
+    items = (
+        select(func.string_agg(
+            cast(EquipmentRequestItem.quantity, String) + "x " + EquipmentInventory.name, ", ",
+        ))
+        .select_from(EquipmentRequestItem)
+        .join(EquipmentInventory, EquipmentInventory.id == EquipmentRequestItem.item_id)
+        .where(EquipmentRequestItem.equipment_request_id == EquipmentRequest.id)
+        .correlate(EquipmentRequest)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(
+            EquipmentRequest.requested_at,
+            EquipmentRequest.transaction_no,
+            _resident_name(),
+            items,
+            EquipmentRequest.purpose,
+            EquipmentRequest.borrow_date,
+            EquipmentRequest.return_date,
+            EquipmentRequest.returned_at,
+            EquipmentRequest.status,
+            EquipmentRequest.payment_status,
+            EquipmentRequest.is_refunded,
+            EquipmentRequest.total_cost,
+        )
+        .outerjoin(Resident, Resident.id == EquipmentRequest.resident_id)
+        .where(*_in_period(EquipmentRequest.requested_at, date_from, date_to))
+        .order_by(EquipmentRequest.requested_at, EquipmentRequest.id)
+    )
+    if request_status:
+        stmt = stmt.where(EquipmentRequest.status == request_status)
+    headers = [
+        "Requested At", "Transaction No.", "Resident", "Items", "Purpose",
+        "Borrow Date", "Return Date", "Returned At", "Status", "Payment Status",
+        "Refunded", "Total Cost",
+    ]
+    return _stream(stmt, headers, fmt, "Equipment Requests")
+
+
+def spreadsheet_filename(name: str, fmt: str, date_from: Optional[date] = None, date_to: Optional[date] = None) -> str:
+    period = ""
+    if date_from or date_to:
+        period = f"_{date_from:%Y%m%d}" if date_from else "_"
+        period += f"-{date_to:%Y%m%d}" if date_to else "-"
+    return f"{name}{period}.{fmt}"
+
+
+def export_response(chunks: Iterator[bytes], fmt: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
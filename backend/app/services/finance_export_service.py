@@ -0,0 +1,257 @@
+"""
+app/services/finance_export_service.py
+
+Background generation and caching of financial statement PDFs.
+
+A statement is identified by its period, service filter and the data version
+of that period (revenue_service.get_data_version), and that identity is also
+its job id and cache key:
+
+    20250101-20250131_all_v42
+
+Starting an export either finds the PDF already in FINANCE_EXPORT_DIR or
+queues a job on a small thread pool and returns at once; the dashboard polls
+the job's status for progress and downloads the file when it is done. Status
+lives next to the PDF as <job_id>.json, so any API worker can answer for a
+job another one is running. A change to any day in the period bumps the
+version, so the next export is a new job; finished jobs evict older versions
+of the same period and filter.
+
+The version is read before the job queries the data, so a cached PDF is never
+older than its key.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.finance_service import generate_financial_statement_pdf
+from app.services.revenue_service import SERVICES, get_data_version
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = Path(settings.FINANCE_EXPORT_DIR)
+
+# A queued or running job whose status has not moved for this long is assumed
+# to have died with its worker and is started again
+STALE_JOB_SECONDS = 300
+
+_JOB_ID = re.compile(r"^(\d{8})-(\d{8})_(all|" + "|".join(SERVICES) + r")_v(\d+)$")
+
+_executor: ThreadPoolExecutor | None = None
+_active: set[str] = set()
+_active_lock = threading.Lock()
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _validate(date_from: date, date_to: date, service: Optional[str]) -> None:
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must be on or before date_to",
+        )
+    if service is not None and service not in SERVICES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid service filter '{service}'. Use: documents, id_services, equipment",
+        )
+
+
+def _job_id(db: Session, date_from: date, date_to: date, service: Optional[str]) -> str:
+    version = get_data_version(db, date_from, date_to)
+    return f"{date_from:%Y%m%d}-{date_to:%Y%m%d}_{service or 'all'}_v{version}"
+
+
+def _parse_job_id(job_id: str) -> re.Match:
+    match = _JOB_ID.match(job_id)
+    if not match:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+    return match
+
+
+def _pdf_path(job_id: str) -> Path:
+    return EXPORT_DIR / f"{job_id}.pdf"
+
+
+def _status_path(job_id: str) -> Path:
+    return EXPORT_DIR / f"{job_id}.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _write_status(job_id: str, state: str, progress: float = 0.0, error: Optional[str] = None) -> dict:
+    job = {
+        "job_id":     job_id,
+        "state":      state,
+        "progress":   round(progress, 3),
+        "error":      error,
+        "filename":   export_filename(job_id),
+        "updated_at": time.time(),
+    }
+    _write_atomic(_status_path(job_id), json.dumps(job).encode())
+    return job
+
+
+def _read_status(job_id: str) -> dict | None:
+    if _pdf_path(job_id).exists():
+        return {
+            "job_id":   job_id,
+            "state":    "done",
+            "progress": 1.0,
+            "error":    None,
+            "filename": export_filename(job_id),
+        }
+    try:
+        return json.loads(_status_path(job_id).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _public(job: dict) -> dict:
+    return {key: value for key, value in job.items() if key != "updated_at"}
+
+
+def _evict_older_versions(job_id: str) -> None:
+    prefix, version = job_id.rsplit("_v", 1)
+    for path in EXPORT_DIR.glob(f"{prefix}_v*"):
+        match = _JOB_ID.match(path.stem)
+        if match and int(match.group(4)) < int(version) and path.suffix in (".pdf", ".json"):
+            path.unlink(missing_ok=True)
+
+
+def _store(job_id: str, pdf_bytes: bytes) -> Path:
+    path = _pdf_path(job_id)
+    _write_atomic(path, pdf_bytes)
+    _status_path(job_id).unlink(missing_ok=True)
+    _evict_older_versions(job_id)
+    return path
+
+
+def _generate(db: Session, job_id: str, progress=None) -> bytes:
+    date_from, date_to, service, _ = _parse_job_id(job_id).groups()
+    return generate_financial_statement_pdf(
+        db=db,
+        date_from=datetime.strptime(date_from, "%Y%m%d").date(),
+        date_to=datetime.strptime(date_to, "%Y%m%d").date(),
+        service_filter=None if service == "all" else service,
+        progress=progress,
+    )
+
+
+def _run_job(job_id: str) -> None:
+    reported = [0.0]
+
+    def progress(fraction: float) -> None:
+        # Status is a file write; skip updates smaller than 5%
+        if fraction - reported[0] >= 0.05:
+            reported[0] = fraction
+            _write_status(job_id, "running", fraction)
+
+    db = SessionLocal()
+    try:
+        _write_status(job_id, "running")
+        _store(job_id, _generate(db, job_id, progress))
+        logger.info("Financial statement generated: %s", job_id)
+    except Exception as exc:
+        logger.exception("Financial statement export %s failed", job_id)
+        _write_status(job_id, "failed", reported[0], str(exc))
+    finally:
+        db.close()
+        with _active_lock:
+            _active.discard(job_id)
+
+
+def _submit(job_id: str) -> None:
+    global _executor
+    with _active_lock:
+        if job_id in _active:
+            return
+        _active.add(job_id)
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.FINANCE_EXPORT_WORKERS,
+                thread_name_prefix="finance-export",
+            )
+    _executor.submit(_run_job, job_id)
+
+
+# =================================================================================
+# PUBLIC API
+# =================================================================================
+
+def export_filename(job_id: str) -> str:
+    date_from, date_to, service, _ = _parse_job_id(job_id).groups()
+    service_slug = "all-services" if service == "all" else service
+    return f"financial-statement_{service_slug}_{date_from}-{date_to}.pdf"
+
+
+def start_export(db: Session, date_from: date, date_to: date, service: Optional[str] = None) -> dict:
+    """
+    Returns the export job for this statement, queueing it unless the PDF is
+    already cached or a live job is producing it.
+    """
+    _validate(date_from, date_to, service)
+    job_id = _job_id(db, date_from, date_to, service)
+
+    job = _read_status(job_id)
+    if job is not None and (
+        job["state"] == "done"
+        or (job["state"] in ("queued", "running") and time.time() - job["updated_at"] < STALE_JOB_SECONDS)
+    ):
+        return _public(job)
+
+    job = _write_status(job_id, "queued")
+    _submit(job_id)
+    return _public(job)
+
+
+def get_export_status(job_id: str) -> dict:
+    _parse_job_id(job_id)
+    job = _read_status(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+    return _public(job)
+
+
+def get_export_file(job_id: str) -> Path:
+    """Path of a finished export's PDF; 409 while the job is still running."""
+    _parse_job_id(job_id)
+    path = _pdf_path(job_id)
+    if path.exists():
+        return path
+    if _read_status(job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Export is not finished yet")
+
+
+def get_or_build_statement(db: Session, date_from: date, date_to: date, service: Optional[str] = None) -> Path:
+    """
+    The cached PDF for this statement, generating it on the calling thread
+    on a miss. For clients that download in one request instead of polling.
+    """
+    _validate(date_from, date_to, service)
+    job_id = _job_id(db, date_from, date_to, service)
+    path = _pdf_path(job_id)
+    if not path.exists():
+        path = _store(job_id, _generate(db, job_id))
+    return path
@@ -4,13 +4,20 @@ app/services/finance_service.py
 Service layer for financial statement PDF generation.
 Queries document requests, ID applications, and equipment borrowing records
 for a given date range, then assembles a styled multi-section PDF report
-using ReportLab.
+using ReportLab. Each section's rows come from one joined projection and
+the totals from the daily_revenue rollup (revenue_service), so the query
+count does not grow with the number of transactions.
+
+Exports normally run as background jobs (finance_export_service), which pass
+a progress callback and cache the result.
 """
 
 from datetime import date, datetime
 from decimal import Decimal
 from io import BytesIO
-from typing import Optional
+from typing import Callable, Optional
+from sqlalchemy import case, func, literal, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
@@ -26,8 +33,10 @@ from reportlab.platypus import (
     TableStyle,
     KeepTogether,
 )
-from app.models.document import DocumentRequest
-from app.models.equipment import EquipmentRequest
+from app.models.document import DocumentRequest, DocumentType
+from app.models.equipment import EquipmentInventory, EquipmentRequest, EquipmentRequestItem
+from app.models.resident import Resident
+from app.services.revenue_service import get_revenue_totals
 
 
 # =================================================================================
@@ -197,13 +206,57 @@ def _build_styles():
 # DATA QUERIES
 # =================================================================================
 
-def _get_document_data(db: Session, date_from: date, date_to: date) -> dict:
+def _period_bounds(date_from: date, date_to: date) -> tuple[datetime, datetime]:
+    return (
+        datetime.combine(date_from, datetime.min.time()),
+        datetime.combine(date_to,   datetime.max.time()),
+    )
+
+
+def _resident_name(include_middle: bool = False):
+    """'First [Middle] Last' built in SQL; 'N/A' when the request has no resident."""
+    parts = [Resident.first_name, Resident.last_name]
+    if include_middle:
+        parts.insert(1, func.nullif(Resident.middle_name, ""))
+    # concat_ws skips NULL parts, so a missing resident yields '' rather than NULL
+    return func.coalesce(func.nullif(func.concat_ws(" ", *parts), ""), "N/A")
+
+
+def _format_date(value: Optional[datetime]) -> str:
+    return value.strftime("%m/%d/%Y") if value else "—"
+
+
+def _equipment_item_names():
+    """Borrowed item names of the outer query's equipment request, aggregated in the same statement."""
+    return (
+        select(func.string_agg(
+            EquipmentInventory.name,
+            aggregate_order_by(literal_column("', '"), EquipmentRequestItem.id),
+        ))
+        .select_from(EquipmentRequestItem)
+        .join(EquipmentInventory, EquipmentInventory.id == EquipmentRequestItem.item_id)
+        .where(EquipmentRequestItem.equipment_request_id == EquipmentRequest.id)
+        .correlate(EquipmentRequest)
+        .scalar_subquery()
+    )
+
+
+def _get_document_data(db: Session, date_from: date, date_to: date, totals: dict) -> dict:
     """Fetch document service transactions (excludes ID applications) for the period."""
-    dt_from = datetime.combine(date_from, datetime.min.time())
-    dt_to   = datetime.combine(date_to,   datetime.max.time())
+    dt_from, dt_to = _period_bounds(date_from, date_to)
 
     rows = (
-        db.query(DocumentRequest)
+        db.query(
+            DocumentRequest.transaction_no,
+            _resident_name(include_middle=True).label("resident_name"),
+            func.coalesce(DocumentType.doctype_name, "Unknown").label("document_type"),
+            DocumentRequest.status,
+            DocumentRequest.payment_status,
+            func.coalesce(DocumentRequest.price, 0).label("amount"),
+            DocumentRequest.requested_at,
+        )
+        .outerjoin(Resident, Resident.id == DocumentRequest.resident_id)
+        .outerjoin(DocumentType, DocumentType.id == DocumentRequest.doctype_id)
         .filter(
             DocumentRequest.requested_at >= dt_from,
             DocumentRequest.requested_at <= dt_to,
@@ -213,50 +266,36 @@ def _get_document_data(db: Session, date_from: date, date_to: date) -> dict:
         .all()
     )
 
-    transactions    = []
-    total_collected = Decimal("0")
-    total_pending   = Decimal("0")
-
-    for r in rows:
-        doctype_name  = r.doctype.doctype_name if r.doctype else "Unknown"
-        resident_name = "N/A"
-        if r.resident:
-            parts         = filter(None, [r.resident.first_name, r.resident.middle_name, r.resident.last_name])
-            resident_name = " ".join(parts)
-
-        is_paid = r.payment_status == "paid"
-        price   = r.price or Decimal("0")
-
-        if is_paid:
-            total_collected += price
-        else:
-            total_pending += price
-
-        transactions.append({
+    transactions = [
+        {
             "transaction_no": r.transaction_no,
-            "resident_name":  resident_name,
-            "document_type":  doctype_name,
+            "resident_name":  r.resident_name,
+            "document_type":  r.document_type,
             "status":         r.status,
             "payment_status": r.payment_status,
-            "amount":         price,
-            "date":           r.requested_at.strftime("%m/%d/%Y") if r.requested_at else "—",
-        })
+            "amount":         r.amount,
+            "date":           _format_date(r.requested_at),
+        }
+        for r in rows
+    ]
 
-    return {
-        "transactions":    transactions,
-        "total_collected": total_collected,
-        "total_pending":   total_pending,
-        "count":           len(transactions),
-    }
+    return {"transactions": transactions, **totals}
 
 
-def _get_id_application_data(db: Session, date_from: date, date_to: date) -> dict:
+def _get_id_application_data(db: Session, date_from: date, date_to: date, totals: dict) -> dict:
     """Fetch ID application transactions (doctype_id IS NULL) for the period."""
-    dt_from = datetime.combine(date_from, datetime.min.time())
-    dt_to   = datetime.combine(date_to,   datetime.max.time())
+    dt_from, dt_to = _period_bounds(date_from, date_to)
 
     rows = (
-        db.query(DocumentRequest)
+        db.query(
+            DocumentRequest.transaction_no,
+            _resident_name().label("resident_name"),
+            DocumentRequest.status,
+            DocumentRequest.payment_status,
+            func.coalesce(DocumentRequest.price, 0).label("amount"),
+            DocumentRequest.requested_at,
+        )
+        .outerjoin(Resident, Resident.id == DocumentRequest.resident_id)
         .filter(
             DocumentRequest.requested_at >= dt_from,
             DocumentRequest.requested_at <= dt_to,
@@ -266,48 +305,39 @@ def _get_id_application_data(db: Session, date_from: date, date_to: date) -> dic
         .all()
     )
 
-    transactions    = []
-    total_collected = Decimal("0")
-    total_pending   = Decimal("0")
-
-    for r in rows:
-        resident_name = "N/A"
-        if r.resident:
-            parts         = filter(None, [r.resident.first_name, r.resident.last_name])
-            resident_name = " ".join(parts)
-
-        is_paid = r.payment_status == "paid"
-        price   = r.price or Decimal("0")
-
-        if is_paid:
-            total_collected += price
-        else:
-            total_pending += price
-
-        transactions.append({
+    transactions = [
+        {
             "transaction_no": r.transaction_no,
-            "resident_name":  resident_name,
+            "resident_name":  r.resident_name,
             "status":         r.status,
             "payment_status": r.payment_status,
-            "amount":         price,
-            "date":           r.requested_at.strftime("%m/%d/%Y") if r.requested_at else "—",
-        })
+            "amount":         r.amount,
+            "date":           _format_date(r.requested_at),
+        }
+        for r in rows
+    ]
 
-    return {
-        "transactions":    transactions,
-        "total_collected": total_collected,
-        "total_pending":   total_pending,
-        "count":           len(transactions),
-    }
+    return {"transactions": transactions, **totals}
 
 
-def _get_equipment_data(db: Session, date_from: date, date_to: date) -> dict:
+def _get_equipment_data(db: Session, date_from: date, date_to: date, totals: dict) -> dict:
     """Fetch equipment borrowing transactions for the period, including refunds."""
-    dt_from = datetime.combine(date_from, datetime.min.time())
-    dt_to   = datetime.combine(date_to,   datetime.max.time())
+    dt_from, dt_to = _period_bounds(date_from, date_to)
 
     rows = (
-        db.query(EquipmentRequest)
+        db.query(
+            EquipmentRequest.transaction_no,
+            _resident_name().label("resident_name"),
+            func.coalesce(_equipment_item_names(), "—").label("items"),
+            EquipmentRequest.borrow_date,
+            EquipmentRequest.return_date,
+            EquipmentRequest.status,
+            EquipmentRequest.payment_status,
+            EquipmentRequest.is_refunded,
+            func.coalesce(EquipmentRequest.total_cost, 0).label("amount"),
+            EquipmentRequest.requested_at,
+        )
+        .outerjoin(Resident, Resident.id == EquipmentRequest.resident_id)
         .filter(
             EquipmentRequest.requested_at >= dt_from,
             EquipmentRequest.requested_at <= dt_to,
@@ -316,53 +346,77 @@ def _get_equipment_data(db: Session, date_from: date, date_to: date) -> dict:
         .all()
     )
 
-    transactions    = []
-    total_collected = Decimal("0")
-    total_pending   = Decimal("0")
-    total_refunded  = Decimal("0")
-
-    for r in rows:
-        resident_name = "N/A"
-        if r.resident:
-            parts         = filter(None, [r.resident.first_name, r.resident.last_name])
-            resident_name = " ".join(parts)
-
-        item_names = ", ".join(
-            (item.inventory_item.name if item.inventory_item else "?")
-            for item in r.items
-        ) if r.items else "—"
-
-        is_paid     = r.payment_status == "paid"
-        is_refunded = r.is_refunded
-        cost        = r.total_cost or Decimal("0")
-
-        if is_refunded:
-            total_refunded += cost
-        elif is_paid:
-            total_collected += cost
-        else:
-            total_pending += cost
-
-        transactions.append({
+    transactions = [
+        {
             "transaction_no": r.transaction_no,
-            "resident_name":  resident_name,
-            "items":          item_names,
-            "borrow_date":    r.borrow_date.strftime("%m/%d/%Y") if r.borrow_date else "—",
-            "return_date":    r.return_date.strftime("%m/%d/%Y") if r.return_date else "—",
+            "resident_name":  r.resident_name,
+            "items":          r.items,
+            "borrow_date":    _format_date(r.borrow_date),
+            "return_date":    _format_date(r.return_date),
             "status":         r.status,
             "payment_status": r.payment_status,
-            "is_refunded":    is_refunded,
-            "amount":         cost,
-            "date":           r.requested_at.strftime("%m/%d/%Y") if r.requested_at else "—",
-        })
+            "is_refunded":    r.is_refunded,
+            "amount":         r.amount,
+            "date":           _format_date(r.requested_at),
+        }
+        for r in rows
+    ]
+
+    return {"transactions": transactions, **totals}
 
-    return {
-        "transactions":    transactions,
-        "total_collected": total_collected,
-        "total_pending":   total_pending,
-        "total_refunded":  total_refunded,
-        "count":           len(transactions),
-    }
+
+def financial_transactions_query(date_from: date, date_to: date, service_filter: Optional[str] = None):
+    """
+    Every transaction the statement covers, one row each in request order, as
+    a single SELECT for the spreadsheet exports (export_service) to stream.
+    """
+    dt_from, dt_to = _period_bounds(date_from, date_to)
+    selects = []
+
+    if service_filter in (None, "documents", "id_services"):
+        is_id = DocumentRequest.doctype_id.is_(None)
+        documents = (
+            select(
+                DocumentRequest.requested_at,
+                case((is_id, "I.D Services"), else_="Document Services").label("service"),
+                DocumentRequest.transaction_no,
+                _resident_name(include_middle=True).label("resident_name"),
+                case((is_id, "I.D Application"),
+                     else_=func.coalesce(DocumentType.doctype_name, "Unknown")).label("description"),
+                DocumentRequest.status,
+                DocumentRequest.payment_status,
+                literal(False).label("is_refunded"),
+                func.coalesce(DocumentRequest.price, 0).label("amount"),
+            )
+            .outerjoin(Resident, Resident.id == DocumentRequest.resident_id)
+            .outerjoin(DocumentType, DocumentType.id == DocumentRequest.doctype_id)
+            .where(DocumentRequest.requested_at >= dt_from, DocumentRequest.requested_at <= dt_to)
+        )
+        if service_filter == "documents":
+            documents = documents.where(~is_id)
+        elif service_filter == "id_services":
+            documents = documents.where(is_id)
+        selects.append(documents)
+
+    if service_filter in (None, "equipment"):
+        selects.append(
+            select(
+                EquipmentRequest.requested_at,
+                literal("Equipment Borrowing").label("service"),
+                EquipmentRequest.transaction_no,
+                _resident_name(include_middle=True).label("resident_name"),
+                func.coalesce(_equipment_item_names(), "—").label("description"),
+                EquipmentRequest.status,
+                EquipmentRequest.payment_status,
+                EquipmentRequest.is_refunded,
+                func.coalesce(EquipmentRequest.total_cost, 0).label("amount"),
+            )
+            .outerjoin(Resident, Resident.id == EquipmentRequest.resident_id)
+            .where(EquipmentRequest.requested_at >= dt_from, EquipmentRequest.requested_at <= dt_to)
+        )
+
+    combined = union_all(*selects).subquery() if len(selects) > 1 else selects[0].subquery()
+    return select(combined).order_by(combined.c.requested_at, combined.c.transaction_no)
 
 
 # =================================================================================
@@ -373,6 +427,11 @@ PAGE_W, PAGE_H = A4
 MARGIN    = 18 * mm
 CONTENT_W = PAGE_W - 2 * MARGIN
 
+# Progress reporting: share of the work taken by the data queries, and
+# roughly how many transaction rows fit on a page
+QUERY_PROGRESS = 0.2
+ROWS_PER_PAGE  = 30
+
 
 def _header_table(styles, date_from: date, date_to: date, service_filter: Optional[str]) -> Table:
     period_str = f"{date_from.strftime('%B %d, %Y')}  –  {date_to.strftime('%B %d, %Y')}"
@@ -685,12 +744,16 @@ def generate_financial_statement_pdf(
     date_from: date,
     date_to: date,
     service_filter: Optional[str] = None,
+    progress: Optional[Callable[[float], None]] = None,
 ) -> bytes:
     """
     Build and return a PDF financial statement as bytes.
 
     service_filter options: 'documents' | 'id_services' | 'equipment' | None (all)
+    progress, if given, is called with the fraction done (0.0–1.0): the data
+    queries count for the first QUERY_PROGRESS, layout for the rest.
     """
+    report = progress or (lambda fraction: None)
     styles = _build_styles()
     buf    = BytesIO()
 
@@ -717,8 +780,13 @@ def generate_financial_statement_pdf(
     grand_collected = Decimal("0")
     grand_pending   = Decimal("0")
 
+    totals = get_revenue_totals(db, date_from, date_to)
+    row_count = 0
+
     if include_docs:
-        doc_data = _get_document_data(db, date_from, date_to)
+        doc_data = _get_document_data(db, date_from, date_to, totals["documents"])
+        row_count += len(doc_data["transactions"])
+        report(QUERY_PROGRESS / 3)
         grand_collected += doc_data["total_collected"]
         grand_pending   += doc_data["total_pending"]
 
@@ -737,7 +805,9 @@ def generate_financial_statement_pdf(
             story.append(_empty_notice(styles, "No document requests found for this period."))
 
     if include_id:
-        id_data = _get_id_application_data(db, date_from, date_to)
+        id_data = _get_id_application_data(db, date_from, date_to, totals["id_services"])
+        row_count += len(id_data["transactions"])
+        report(QUERY_PROGRESS * 2 / 3)
         grand_collected += id_data["total_collected"]
         grand_pending   += id_data["total_pending"]
 
@@ -756,7 +826,8 @@ def generate_financial_statement_pdf(
             story.append(_empty_notice(styles, "No ID applications found for this period."))
 
     if include_equip:
-        eq_data = _get_equipment_data(db, date_from, date_to)
+        eq_data = _get_equipment_data(db, date_from, date_to, totals["equipment"])
+        row_count += len(eq_data["transactions"])
         grand_collected += eq_data["total_collected"]
         grand_pending   += eq_data["total_pending"]
 
@@ -823,5 +894,15 @@ def generate_financial_statement_pdf(
         styles["note"],
     ))
 
+    report(QUERY_PROGRESS)
+    # Layout progress is counted in pages against an estimate from the row count
+    expected_pages = 1 + row_count // ROWS_PER_PAGE
+
+    def on_layout(kind, value):
+        if kind == "PAGE":
+            report(QUERY_PROGRESS + (1 - QUERY_PROGRESS) * min(value / expected_pages, 0.99))
+
+    doc.setProgressCallBack(on_layout)
     doc.build(story, onFirstPage=_page_footer, onLaterPages=_page_footer)
+    report(1.0)
     return buf.getvalue()
\ No newline at end of file
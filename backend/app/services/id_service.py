@@ -8,7 +8,6 @@ PIN management, lost-card reporting, RFID report operations,
 and ID requirement eligibility checks.
 """
 
-import random
 import subprocess
 import tempfile
 import os
@@ -17,21 +16,27 @@ import base64
 from docxtpl import InlineImage
 from docx.shared import Mm
 from io import BytesIO
-from PIL import Image, ImageDraw
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from docxtpl import DocxTemplate
+from app.core.metrics import track_pdf_conversion
 from app.db.session import SessionLocal
 from app.models.resident import Resident, ResidentRFID
 from app.models.document import DocumentRequest, DocumentType
 from app.models.barangayid import BarangayID
 from app.models.misc import RFIDReport
-from app.models.systemconfig import SystemConfig
 from app.services.document_service import _convert_docx_to_pdf
+from app.services.systemconfig_service import get_config
+from app.services.image_service import process_image, read_variant
+from app.services.revenue_service import record_revenue_change, revenue_entry
+from app.services.numbering_service import (
+    next_transaction_no,
+    next_brgy_id_number,
+    peek_brgy_id_number,
+)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -73,24 +78,11 @@ def _get_active_rfid(resident: Resident) -> ResidentRFID | None:
 
 
 def _generate_transaction_no(db: Session) -> str:
-    while True:
-        number = random.randint(1000, 9999)
-        tx_no = f"ID-{number}"
-        exists = db.query(DocumentRequest).filter_by(transaction_no=tx_no).first()
-        if not exists:
-            return tx_no
+    return next_transaction_no(db, "ID")
 
 
 def _generate_brgy_id_number(db: Session) -> str:
-    max_number = db.query(func.max(BarangayID.brgy_id_number)).scalar()
-    if max_number is None:
-        next_number = 1
-    else:
-        try:
-            next_number = int(max_number) + 1
-        except (ValueError, TypeError):
-            next_number = 1
-    return str(next_number).zfill(5)
+    return next_brgy_id_number(db)
 
 
 # =================================================================================
@@ -119,19 +111,20 @@ def _convert_docx_to_pdf(docx_bytes: bytes) -> bytes:
         else:
             soffice_cmd = "soffice"
 
-        try:
-            subprocess.run(
-                [soffice_cmd, "--headless", "--convert-to", "pdf",
-                 "--outdir", temp_dir, docx_path],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=30
-            )
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"LibreOffice conversion failed: {e.stderr.decode()}")
-        except FileNotFoundError:
-            raise Exception("LibreOffice not found. Install with: sudo apt-get install libreoffice")
+        with track_pdf_conversion("barangay_id"):
+            try:
+                subprocess.run(
+                    [soffice_cmd, "--headless", "--convert-to", "pdf",
+                     "--outdir", temp_dir, docx_path],
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=30
+                )
+            except subprocess.CalledProcessError as e:
+                raise Exception(f"LibreOffice conversion failed: {e.stderr.decode()}")
+            except FileNotFoundError:
+                raise Exception("LibreOffice not found. Install with: sudo apt-get install libreoffice")
 
         pdf_path = os.path.join(temp_dir, "document.pdf")
         if not os.path.exists(pdf_path):
@@ -141,37 +134,15 @@ def _convert_docx_to_pdf(docx_bytes: bytes) -> bytes:
             return f.read()
 
 
-def _make_circle_photo(photo_bytes: bytes, size: int = 300) -> bytes:
-    img = Image.open(BytesIO(photo_bytes)).convert("RGBA")
-
-    w, h = img.size
-    min_side = min(w, h)
-    left = (w - min_side) // 2
-    top = (h - min_side) // 2
-    img = img.crop((left, top, left + min_side, top + min_side))
-    img = img.resize((size, size), Image.LANCZOS)
-
-    mask = Image.new("L", (size, size), 0)
-    draw = ImageDraw.Draw(mask)
-    draw.ellipse((0, 0, size, size), fill=255)
-
-    result = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    result.paste(img, (0, 0), mask=mask)
-
-    out = BytesIO()
-    result.save(out, format="PNG")
-    return out.getvalue()
-
-
 def _generate_id_pdf(template_bytes: bytes, context: dict) -> bytes:
 
     tpl = DocxTemplate(BytesIO(template_bytes))
 
+    # context["photo"] is the pre-rendered circular PNG from image_service
     if context.get("photo") is not None:
-        photo_bytes = context["photo"] 
+        photo_bytes = context["photo"]
         if isinstance(photo_bytes, bytes):
-            circle_bytes = _make_circle_photo(photo_bytes)
-            context["photo"] = InlineImage(tpl, BytesIO(circle_bytes), width=Mm(24))
+            context["photo"] = InlineImage(tpl, BytesIO(photo_bytes), width=Mm(24))
 
     tpl.render(context)
 
@@ -201,7 +172,8 @@ def _save_id_pdf(transaction_no: str, pdf_bytes: bytes) -> str:
 # =================================================================================
 
 def generate_brgy_id_number(db: Session) -> str:
-    return _generate_brgy_id_number(db)
+    # Preview only — the number is allocated when the application is submitted
+    return peek_brgy_id_number(db)
 
 
 def get_id_application_fields(db: Session) -> list:
@@ -302,12 +274,15 @@ def apply_for_id(
         try:
             if "," in photo:
                 photo = photo.split(",", 1)[1]
-            applicant.photo = base64.b64decode(photo)
+            photo_bytes = base64.b64decode(photo)
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid photo data."
             )
+        # Render the display sizes and the circular ID crop once, at upload
+        applicant.photo_hash = process_image(photo_bytes, "resident_photo")
+        applicant.photo = photo_bytes
 
     active_rfid = _get_active_rfid(requester)
     display_rfid = rfid_uid or (active_rfid.rfid_uid if active_rfid else None) or "Guest Mode"
@@ -335,13 +310,14 @@ def apply_for_id(
             "session_rfid":    display_rfid,
             "requested_date":  now.isoformat(),
             "use_manual_data": use_manual_data,
+            **field_values,
             "brgy_id_number":  brgy_id_number,
-            **field_values, 
         },
         requested_at=now,
     )
 
     db.add(request)
+    record_revenue_change(db, None, revenue_entry(request))
     db.commit()
     db.refresh(request)
 
@@ -364,7 +340,10 @@ def apply_for_id(
                 if k not in _FORM_DATA_META_KEYS
             }
             context["id_num"] = context.get("brgy_id_number", "")
-            context["photo"] = bytes(applicant.photo) if applicant.photo else None
+            context["photo"] = (
+                read_variant(db, applicant.photo_hash, "photo_circle")
+                if applicant.photo_hash else None
+            )
 
             name_parts = [applicant.first_name]
             if applicant.middle_name:
@@ -373,8 +352,7 @@ def apply_for_id(
             context.setdefault("last_name", applicant.last_name.upper())
 
             try:
-                sys_config = db.query(SystemConfig).filter(SystemConfig.id == 1).first()
-                expiry_days = (sys_config.rfid_expiry_days if sys_config else None) or 365
+                expiry_days = get_config(db).rfid_expiry_days or 365
                 context["validity"] = (date.today() + timedelta(days=expiry_days)).strftime("%B %d, %Y")
             except Exception as ve:
                 print(f"⚠️ Could not compute validity date: {ve}")
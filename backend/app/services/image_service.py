@@ -0,0 +1,197 @@
+"""
+app/services/image_service.py
+
+Service layer for uploaded image processing.
+Decodes an uploaded image once, renders the resized variants each consumer
+needs (kiosk display, thumbnails, the circular ID photo) and stores them on disk under a content
+hash, so they can be served by URL with long-lived cache headers instead of
+being base64-encoded into every JSON response.
+
+Announcement variants are public and served under /kiosk/images; resident
+photo variants are personal data and only served to signed-in admins under
+/admin/residents/photos. Each route resolves only its own kind's variants.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageOps, UnidentifiedImageError, features
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.models.announcement import Announcement
+from app.models.resident import Resident
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+IMAGE_STORAGE_DIR = BASE_DIR / "storage" / "images"
+
+
+_WEBP_SUPPORTED = features.check("webp")
+
+# variant -> rendering spec; "fit" keeps the aspect ratio inside the box,
+# "cover" center-crops to fill it, "circle" is a cover crop with a round mask
+VARIANTS = {
+    "kiosk":        {"size": (1280, 720), "mode": "fit", "quality": 80},
+    "thumb":        {"size": (320, 180), "mode": "fit", "quality": 75},
+    "photo":        {"size": (600, 600), "mode": "cover", "quality": 85},
+    "photo_thumb":  {"size": (160, 160), "mode": "cover", "quality": 75},
+    "photo_circle": {"size": (300, 300), "mode": "circle", "format": "PNG"},
+}
+
+# which variants are rendered for each kind of upload
+KIND_VARIANTS = {
+    "announcement":   ("kiosk", "thumb"),
+    "resident_photo": ("photo", "photo_thumb", "photo_circle"),
+}
+
+# where each kind's variants are served, and the column pair they render from
+KIND_URL_PREFIXES = {
+    "announcement":   "/kiosk/images",
+    "resident_photo": "/admin/residents/photos",
+}
+_KIND_SOURCES = {
+    "announcement":   (Announcement.image, Announcement.image_hash),
+    "resident_photo": (Resident.photo, Resident.photo_hash),
+}
+_VARIANT_KINDS = {variant: kind for kind, variants in KIND_VARIANTS.items() for variant in variants}
+
+_FILENAME_RE = re.compile(r"^(?P<hash>[0-9a-f]{64})_(?P<variant>[a-z_]+)\.(?P<ext>webp|jpg|png)$")
+
+_MEDIA_TYPES = {"webp": "image/webp", "jpg": "image/jpeg", "png": "image/png"}
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _variant_format(variant: str) -> tuple[str, str]:
+    """Returns (Pillow format, file extension) for a variant."""
+    spec = VARIANTS[variant]
+    if spec.get("format") == "PNG":
+        return "PNG", "png"
+    return ("WEBP", "webp") if _WEBP_SUPPORTED else ("JPEG", "jpg")
+
+
+def _open_image(data: bytes) -> Image.Image:
+    try:
+        img = Image.open(BytesIO(data))
+        img.load()
+    except (UnidentifiedImageError, OSError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file is not a valid image."
+        )
+    return ImageOps.exif_transpose(img)
+
+
+def _render_variant(img: Image.Image, variant: str) -> bytes:
+    spec = VARIANTS[variant]
+    fmt, _ = _variant_format(variant)
+    width, height = spec["size"]
+
+    if spec["mode"] == "fit":
+        out_img = img.copy()
+        out_img.thumbnail((width, height), Image.LANCZOS)
+    else:
+        out_img = ImageOps.fit(img, (width, height), Image.LANCZOS)
+
+    if spec["mode"] == "circle":
+        mask = Image.new("L", (width, height), 0)
+        ImageDraw.Draw(mask).ellipse((0, 0, width, height), fill=255)
+        circle = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        circle.paste(out_img.convert("RGBA"), (0, 0), mask=mask)
+        out_img = circle
+
+    if fmt == "PNG":
+        out_img = out_img.convert("RGBA")
+    else:
+        out_img = out_img.convert("RGB")
+
+    save_kwargs = {"optimize": True} if fmt == "PNG" else {"quality": spec.get("quality", 80)}
+    out = BytesIO()
+    out_img.save(out, format=fmt, **save_kwargs)
+    return out.getvalue()
+
+
+def _variant_path(image_hash: str, variant: str) -> Path:
+    _, ext = _variant_format(variant)
+    return IMAGE_STORAGE_DIR / image_hash[:2] / f"{image_hash}_{variant}.{ext}"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _find_source_image(db: Session, image_hash: str, variant: str) -> bytes | None:
+    blob_column, hash_column = _KIND_SOURCES[_VARIANT_KINDS[variant]]
+    image = db.query(blob_column).filter(hash_column == image_hash).limit(1).scalar()
+    return bytes(image) if image else None
+
+
+def _ensure_variant(db: Session, image_hash: str, variant: str) -> Path:
+    path = _variant_path(image_hash, variant)
+    if not path.exists():
+        source = _find_source_image(db, image_hash, variant)
+        if source is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+        _write_atomic(path, _render_variant(_open_image(source), variant))
+    return path
+
+
+# =================================================================================
+# PUBLIC API
+# =================================================================================
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def process_image(data: bytes, kind: str) -> str:
+    """
+    Renders and stores every variant for the given kind of upload.
+    Returns the content hash that identifies the stored variants.
+    """
+    image_hash = content_hash(data)
+    pending = [v for v in KIND_VARIANTS[kind] if not _variant_path(image_hash, v).exists()]
+    if not pending:
+        return image_hash
+
+    img = _open_image(data)
+    for variant in pending:
+        _write_atomic(_variant_path(image_hash, variant), _render_variant(img, variant))
+    return image_hash
+
+
+def image_url(image_hash: str | None, variant: str) -> str | None:
+    if not image_hash:
+        return None
+    _, ext = _variant_format(variant)
+    return f"{KIND_URL_PREFIXES[_VARIANT_KINDS[variant]]}/{image_hash}_{variant}.{ext}"
+
+
+def resolve_variant_file(db: Session, filename: str, kind: str) -> tuple[Path, str]:
+    """
+    Maps a variant filename of the given kind to its file on disk,
+    re-rendering it from the stored original if the cache directory was
+    cleared. Variants of any other kind are not found.
+    """
+    match = _FILENAME_RE.match(filename)
+    if not match or match["variant"] not in KIND_VARIANTS[kind]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+
+    image_hash, variant = match["hash"], match["variant"]
+    if _variant_path(image_hash, variant).name != filename:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+
+    return _ensure_variant(db, image_hash, variant), _MEDIA_TYPES[match["ext"]]
+
+
+def read_variant(db: Session, image_hash: str, variant: str) -> bytes:
+    """Returns the stored bytes of a variant, rendering it first if missing."""
+    return _ensure_variant(db, image_hash, variant).read_bytes()
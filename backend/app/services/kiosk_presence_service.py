@@ -0,0 +1,108 @@
+"""
+app/services/kiosk_presence_service.py
+
+Service layer for kiosk fleet presence.
+Records when each kiosk's websocket connects, answers heartbeats and
+disconnects, so admins can see which kiosks are online and how responsive
+they are. Rows live in Postgres because a kiosk may be connected to any
+uvicorn worker.
+
+The record_* functions open their own session and block; the websocket
+manager calls them from a worker thread.
+"""
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.kiosk import KioskPresence
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _execute(stmt) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(stmt)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _is_online(presence: KioskPresence, now: datetime) -> bool:
+    # A worker that died without closing its sockets leaves is_online set;
+    # the heartbeat timestamp is what actually proves the kiosk is alive
+    stale_after = timedelta(seconds=settings.WS_PING_TIMEOUT)
+    return bool(
+        presence.is_online
+        and presence.last_seen_at
+        and now - presence.last_seen_at <= stale_after
+    )
+
+
+def _to_presence_dict(presence: KioskPresence, now: datetime) -> dict:
+    return {
+        "kiosk_id":     presence.kiosk_id,
+        "app_version":  presence.app_version,
+        "ip_address":   presence.ip_address,
+        "online":       _is_online(presence, now),
+        "connected_at": presence.connected_at,
+        "last_seen_at": presence.last_seen_at,
+        "latency_ms":   presence.latency_ms,
+    }
+
+
+# =================================================================================
+# RECORDING
+# =================================================================================
+
+def record_connect(kiosk_id: str, app_version: str | None, ip_address: str | None,
+                   connected_at: datetime) -> None:
+    values = {
+        "app_version":  app_version,
+        "ip_address":   ip_address,
+        "is_online":    True,
+        "connected_at": connected_at,
+        "last_seen_at": connected_at,
+        "latency_ms":   None,
+    }
+    stmt = (
+        insert(KioskPresence)
+        .values(kiosk_id=kiosk_id, **values)
+        .on_conflict_do_update(index_elements=["kiosk_id"], set_=values)
+    )
+    _execute(stmt)
+
+
+def record_heartbeat(kiosk_id: str, connected_at: datetime, latency_ms: int | None) -> None:
+    stmt = (
+        update(KioskPresence)
+        .where(KioskPresence.kiosk_id == kiosk_id, KioskPresence.connected_at == connected_at)
+        .values(last_seen_at=datetime.now(timezone.utc), latency_ms=latency_ms, is_online=True)
+    )
+    _execute(stmt)
+
+
+def record_disconnect(kiosk_id: str, connected_at: datetime) -> None:
+    # Matching connected_at keeps a late disconnect from marking a kiosk
+    # offline after it has already reconnected elsewhere
+    stmt = (
+        update(KioskPresence)
+        .where(KioskPresence.kiosk_id == kiosk_id, KioskPresence.connected_at == connected_at)
+        .values(is_online=False)
+    )
+    _execute(stmt)
+
+
+# =================================================================================
+# FLEET STATUS
+# =================================================================================
+
+def get_fleet_status(db: Session) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    rows = db.query(KioskPresence).order_by(KioskPresence.kiosk_id).all()
+    return [_to_presence_dict(row, now) for row in rows]
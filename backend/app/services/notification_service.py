@@ -3,18 +3,140 @@ app/services/notification_service.py
  
 Service layer for in-app notification management.
 Handles saving, retrieving, marking as read, and deleting notifications.
+
+New notifications are written by a background task: callers get a uid and
+timestamp right away for the live websocket event, and the rows are
+bulk-inserted every few hundred milliseconds. The dashboard therefore acts
+on notifications by uid: the uid-based updates report which uids have no row
+yet, and the dashboard retries those once the writer has caught up.
 """
 
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.notification import Notification
 
+logger = logging.getLogger(__name__)
 
-def save_notification(db: Session, type: str, msg: str, event: str = "") -> Notification:
-    notif = Notification(type=type, msg=msg, event=event)
-    db.add(notif)
-    db.commit()
-    db.refresh(notif)
-    return notif
+FLUSH_RETRIES = 3
+
+_queue: asyncio.Queue | None = None
+_writer: asyncio.Task | None = None
+
+
+# =================================================================================
+# BACKGROUND WRITER
+# =================================================================================
+
+def _insert_batch(rows: list[dict]) -> None:
+    db = SessionLocal()
+    try:
+        # uid makes a retried batch idempotent
+        db.execute(insert(Notification).on_conflict_do_nothing(index_elements=["uid"]), rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _flush(rows: list[dict]) -> None:
+    for attempt in range(1, FLUSH_RETRIES + 1):
+        try:
+            await asyncio.to_thread(_insert_batch, rows)
+            return
+        except Exception:
+            if attempt == FLUSH_RETRIES:
+                logger.exception("Dropping %d notifications after %d failed writes", len(rows), attempt)
+                return
+            await asyncio.sleep(attempt)
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+async def _run_writer(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    flush_seconds = settings.NOTIFICATION_FLUSH_MS / 1000
+    stopping = False
+
+    while not stopping:
+        row = await queue.get()
+        if row is None:
+            break
+        batch = [row]
+        deadline = loop.time() + flush_seconds
+
+        while len(batch) < settings.NOTIFICATION_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if row is None:
+                stopping = True
+                break
+            batch.append(row)
+
+        await _flush(batch)
+
+
+def start_notification_writer() -> None:
+    global _queue, _writer
+    if _writer and not _writer.done():
+        return
+    _queue = asyncio.Queue()
+    _writer = asyncio.create_task(_run_writer(_queue), name="notification-writer")
+
+
+async def stop_notification_writer() -> None:
+    """Flushes everything still queued, then stops the writer."""
+    global _queue, _writer
+    if _writer is None:
+        return
+    _queue.put_nowait(None)
+    await _writer
+    # Anything enqueued after the stop marker is written directly
+    leftover = [row for row in _drain(_queue) if row is not None]
+    if leftover:
+        await _flush(leftover)
+    _queue = _writer = None
+
+
+def enqueue_notification(type: str, msg: str, event: str = "") -> dict:
+    """
+    Queues a notification for the background writer and returns the fields
+    the live websocket event needs (uid, created_at) without touching the DB.
+    """
+    row = {
+        "uid":        uuid.uuid4(),
+        "type":       type,
+        "msg":        msg,
+        "event":      event,
+        "is_read":    False,
+        "created_at": datetime.now(timezone.utc),
+    }
+    if _queue is not None:
+        _queue.put_nowait(row)
+    else:
+        # No writer running (e.g. scripts outside the app) — write through
+        _insert_batch([row])
+    return row
+
+
+# =================================================================================
+# READ / UPDATE / DELETE
+# =================================================================================
 
 
 def get_all_notifications(db: Session) -> list[Notification]:
@@ -47,4 +169,27 @@ def delete_many(db: Session, ids: list[int]) -> int:
         .delete(synchronize_session=False)
     )
     db.commit()
-    return count
\ No newline at end of file
+    return count
+
+
+def mark_read_by_uid(db: Session, uids: list[uuid.UUID]) -> list[uuid.UUID]:
+    """Marks notifications read by uid; returns the uids with no row yet."""
+    found = db.execute(
+        update(Notification)
+        .where(Notification.uid.in_(uids))
+        .values(is_read=True)
+        .returning(Notification.uid)
+    ).scalars().all()
+    db.commit()
+    return sorted(set(uids) - set(found), key=str)
+
+
+def delete_by_uid(db: Session, uids: list[uuid.UUID]) -> list[uuid.UUID]:
+    """Deletes notifications by uid; returns the uids with no row yet."""
+    found = db.execute(
+        delete(Notification)
+        .where(Notification.uid.in_(uids))
+        .returning(Notification.uid)
+    ).scalars().all()
+    db.commit()
+    return sorted(set(uids) - set(found), key=str)
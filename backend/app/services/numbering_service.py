@@ -0,0 +1,141 @@
+"""
+app/services/numbering_service.py
+
+Service layer for allocating reference numbers.
+Transaction numbers (DR-, ID-, ER-), Barangay ID numbers and per-year
+blotter numbers are drawn from Postgres sequences, so allocation is a single
+nextval() call that never collides, even across concurrent kiosks.
+"""
+
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+# =================================================================================
+# SEQUENCE DEFINITIONS
+# =================================================================================
+
+# prefix -> (sequence name, table holding previously issued numbers)
+TRANSACTION_SEQUENCES = {
+    "DR": ("document_request_no_seq", "document_requests"),
+    "ID": ("id_request_no_seq", "document_requests"),
+    "ER": ("equipment_request_no_seq", "equipment_requests"),
+}
+
+BRGY_ID_SEQUENCE = "brgy_id_number_seq"
+
+# Sequences this process has already created/aligned — checked before any DDL
+_ready_sequences: set[str] = set()
+
+
+def _blotter_sequence(year: int) -> str:
+    return f"blotter_no_{year}_seq"
+
+
+def _transaction_floor_sql(prefix: str, table: str) -> str:
+    return (
+        f"SELECT MAX(CAST(SUBSTRING(transaction_no FROM {len(prefix) + 2}) AS INTEGER)) "
+        f"FROM {table} WHERE transaction_no ~ '^{prefix}-[0-9]+$'"
+    )
+
+
+def _brgy_id_floor_sql() -> str:
+    return (
+        "SELECT MAX(CAST(brgy_id_number AS INTEGER)) "
+        "FROM barangay_ids WHERE brgy_id_number ~ '^[0-9]+$'"
+    )
+
+
+def _blotter_floor_sql(year: int) -> str:
+    return (
+        "SELECT MAX(CAST(SUBSTRING(blotter_no FROM 6) AS INTEGER)) "
+        f"FROM blotter_records WHERE blotter_no ~ '^{year}-[0-9]+$'"
+    )
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _align_sequence(conn, sequence: str, floor_sql: str) -> None:
+    """
+    Moves the sequence past the highest number already stored in the table.
+    Never moves it backwards, so numbers handed out by in-flight transactions
+    are not re-issued.
+    """
+    conn.execute(text(
+        f"SELECT setval('{sequence}', GREATEST(f.floor, s.last_value), f.floor > 0 OR s.is_called) "
+        f"FROM {sequence} s, (SELECT COALESCE(({floor_sql}), 0) AS floor) f"
+    ))
+
+
+def _ensure_sequence(db: Session, sequence: str, floor_sql: str) -> None:
+    if sequence in _ready_sequences:
+        return
+
+    # DDL runs on its own connection so the caller's transaction stays untouched
+    with db.get_bind().connect() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": sequence})
+        conn.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {sequence}"))
+        _align_sequence(conn, sequence, floor_sql)
+        conn.commit()
+
+    _ready_sequences.add(sequence)
+
+
+def _nextval(db: Session, sequence: str) -> int:
+    return db.execute(text(f"SELECT nextval('{sequence}')")).scalar_one()
+
+
+# =================================================================================
+# ALLOCATION
+# =================================================================================
+
+def next_transaction_no(db: Session, prefix: str) -> str:
+    sequence, table = TRANSACTION_SEQUENCES[prefix]
+    _ensure_sequence(db, sequence, _transaction_floor_sql(prefix, table))
+    return f"{prefix}-{_nextval(db, sequence):04d}"
+
+
+def next_brgy_id_number(db: Session) -> str:
+    _ensure_sequence(db, BRGY_ID_SEQUENCE, _brgy_id_floor_sql())
+    return str(_nextval(db, BRGY_ID_SEQUENCE)).zfill(5)
+
+
+def peek_brgy_id_number(db: Session) -> str:
+    """Returns the number the next allocation will most likely receive, without consuming it."""
+    _ensure_sequence(db, BRGY_ID_SEQUENCE, _brgy_id_floor_sql())
+    last_value, is_called = db.execute(
+        text(f"SELECT last_value, is_called FROM {BRGY_ID_SEQUENCE}")
+    ).one()
+    return str(last_value + 1 if is_called else last_value).zfill(5)
+
+
+def next_blotter_no(db: Session, year: int | None = None) -> str:
+    year = year or datetime.now().year
+    sequence = _blotter_sequence(year)
+    _ensure_sequence(db, sequence, _blotter_floor_sql(year))
+    return f"{year}-{_nextval(db, sequence):05d}"
+
+
+# =================================================================================
+# MAINTENANCE
+# =================================================================================
+
+def sync_sequences(db: Session) -> None:
+    """
+    Re-aligns every sequence with the numbers already stored in the database.
+    Run after bulk imports or seeding that insert numbers directly.
+    """
+    year = datetime.now().year
+    targets = [
+        (sequence, _transaction_floor_sql(prefix, table))
+        for prefix, (sequence, table) in TRANSACTION_SEQUENCES.items()
+    ]
+    targets.append((BRGY_ID_SEQUENCE, _brgy_id_floor_sql()))
+    targets.append((_blotter_sequence(year), _blotter_floor_sql(year)))
+
+    for sequence, floor_sql in targets:
+        _ready_sequences.discard(sequence)
+        _ensure_sequence(db, sequence, floor_sql)
@@ -0,0 +1,271 @@
+"""
+app/services/pitr_service.py
+
+Service layer for incremental backups and point-in-time recovery (PITR).
+Postgres copies every completed WAL segment into WAL_ARCHIVE_DIR
+(archive_command, configured by backend/postgres/pitr-entrypoint.sh). On
+top of that archive this module:
+
+  - takes periodic base backups with pg_basebackup (tar, compressed, no WAL —
+    the archive already has it) and prunes WAL no base backup still needs.
+    They run in the job runner only; an on-demand backup is requested with
+    a NOTIFY the runner listens for, so pg_basebackup never runs in a
+    uvicorn worker,
+  - reports the restorable window, base backups and named restore points,
+  - creates named restore points (pg_create_restore_point),
+  - stages a restore to a timestamp. A running server cannot rewind itself,
+    so the plan is written to PITR_STAGING_DIR and applied by the database
+    container's entrypoint the next time it starts.
+"""
+
+import json
+import logging
+import re
+import shutil
+import subprocess
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pg_listener import notify
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+WAL_ARCHIVE_DIR  = Path(settings.WAL_ARCHIVE_DIR)
+BASE_BACKUP_DIR  = Path(settings.BASE_BACKUP_DIR)
+PITR_STAGING_DIR = Path(settings.PITR_STAGING_DIR)
+
+MANIFEST_FILE       = "pitr.json"
+RESTORE_POINTS_FILE = BASE_BACKUP_DIR / "restore_points.json"
+STAGED_RESTORE_FILE = PITR_STAGING_DIR / "restore.env"
+
+BASE_BACKUP_CHANNEL = "pitr_base_backup_requested"
+
+# Keeps a requested and a scheduled base backup (and their pruning) from overlapping
+_base_backup_lock = threading.Lock()
+
+# WAL segment file names: timeline + log + segment, 24 hex digits
+_WAL_SEGMENT = re.compile(r"^[0-9A-F]{24}$")
+
+
+# =================================================================================
+# INTERNAL HELPERS
+# =================================================================================
+
+def _require_enabled() -> None:
+    if not settings.PITR_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Point-in-time recovery is not enabled on this server.",
+        )
+
+
+def _read_json(path: Path, default):
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def _base_backups() -> list[dict]:
+    """Completed base backups, oldest first."""
+    backups = []
+    for directory in sorted(BASE_BACKUP_DIR.glob("base_*")):
+        manifest = _read_json(directory / MANIFEST_FILE, None)
+        if manifest is None:
+            continue  # still running, or failed half-way
+        manifest["name"] = directory.name
+        manifest["size_bytes"] = sum(f.stat().st_size for f in directory.iterdir() if f.is_file())
+        backups.append(manifest)
+    return backups
+
+
+def _latest_archived_at(db: Session) -> datetime | None:
+    last = db.execute(text("SELECT last_archived_time FROM pg_stat_archiver")).scalar()
+    if last is not None:
+        return last
+    segments = [p for p in WAL_ARCHIVE_DIR.glob("*") if _WAL_SEGMENT.match(p.name)]
+    if not segments:
+        return None
+    newest = max(p.stat().st_mtime for p in segments)
+    return datetime.fromtimestamp(newest, tz=timezone.utc)
+
+
+def _prune(keep: int) -> None:
+    """Drops base backups past *keep* and WAL segments older than the oldest one left."""
+    backups = _base_backups()
+    for old in backups[:-keep] if keep else []:
+        shutil.rmtree(BASE_BACKUP_DIR / old["name"], ignore_errors=True)
+        logger.info("Pruned base backup: %s", old["name"])
+
+    remaining = backups[-keep:] if keep else backups
+    if not remaining:
+        return
+    oldest_needed = remaining[0]["start_wal"]
+    for segment in WAL_ARCHIVE_DIR.iterdir():
+        # Segment names sort in WAL order; .backup/.history files are tiny and kept
+        if _WAL_SEGMENT.match(segment.name) and segment.name < oldest_needed:
+            segment.unlink(missing_ok=True)
+
+
+# =================================================================================
+# BASE BACKUPS
+# =================================================================================
+
+def take_base_backup() -> dict:
+    """
+    Runs pg_basebackup into BASE_BACKUP_DIR/base_<timestamp>/ and prunes
+    old base backups and WAL. Raises RuntimeError if pg_basebackup fails.
+    """
+    from app.services.backup_service import pg_command
+
+    BASE_BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    started_at = datetime.now(timezone.utc)
+    name = f"base_{started_at:%Y%m%d_%H%M%S}"
+    dest = BASE_BACKUP_DIR / name
+
+    db = SessionLocal()
+    try:
+        # Nothing before the current segment is needed to replay this backup
+        start_wal = db.execute(text("SELECT pg_walfile_name(pg_current_wal_lsn())")).scalar()
+    finally:
+        db.close()
+
+    args, env, _ = pg_command("pg_basebackup")
+    args += ["-D", str(dest), "-F", "t", "-z", "-X", "none", "-c", "fast", "-l", name, "--no-password"]
+    result = subprocess.run(args, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        shutil.rmtree(dest, ignore_errors=True)
+        raise RuntimeError(f"pg_basebackup failed: {result.stderr.strip()}")
+
+    db = SessionLocal()
+    try:
+        # Close the current segment so the backup's end WAL is archived right away
+        db.execute(text("SELECT pg_switch_wal()"))
+        db.commit()
+    finally:
+        db.close()
+
+    manifest = {
+        "started_at":  started_at.isoformat(),
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "start_wal":   start_wal,
+    }
+    (dest / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    logger.info("Base backup saved: %s", dest)
+
+    _prune(max(1, settings.BASE_BACKUPS_KEPT))
+    return {"name": name, **manifest}
+
+
+def run_scheduled_base_backup() -> None:
+    if not _base_backup_lock.acquire(blocking=False):
+        logger.info("Base backup already running — skipped.")
+        return
+    try:
+        take_base_backup()
+    except Exception as exc:
+        logger.error("Scheduled base backup failed: %s", exc)
+    finally:
+        _base_backup_lock.release()
+
+
+def request_base_backup() -> None:
+    """
+    Asks the job runner for a base backup now. Blocking (it sends the NOTIFY
+    on its own connection); the backup shows up in get_pitr_status when done.
+    """
+    _require_enabled()
+    notify(BASE_BACKUP_CHANNEL, "requested")
+
+
+# =================================================================================
+# RESTORE POINTS
+# =================================================================================
+
+def create_restore_point(db: Session, name: str) -> dict:
+    _require_enabled()
+    lsn = db.execute(text("SELECT pg_create_restore_point(:name)::text"), {"name": name}).scalar()
+    db.commit()
+
+    point = {"name": name, "lsn": lsn, "created_at": datetime.now(timezone.utc).isoformat()}
+    points = _read_json(RESTORE_POINTS_FILE, [])
+    points.append(point)
+    BASE_BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    RESTORE_POINTS_FILE.write_text(json.dumps(points, indent=2))
+    return point
+
+
+def get_pitr_status(db: Session) -> dict:
+    _require_enabled()
+    backups = _base_backups()
+    archiver = db.execute(text("""
+        SELECT archived_count, last_archived_wal, last_archived_time,
+               failed_count, last_failed_wal, last_failed_time
+        FROM pg_stat_archiver
+    """)).mappings().one()
+    latest = _latest_archived_at(db)
+    earliest = datetime.fromisoformat(backups[0]["finished_at"]) if backups else None
+
+    points = [
+        p for p in _read_json(RESTORE_POINTS_FILE, [])
+        if earliest and datetime.fromisoformat(p["created_at"]) >= earliest
+    ]
+    return {
+        "archiver":       dict(archiver),
+        "earliest":       earliest,
+        "latest":         latest,
+        "base_backups":   backups,
+        "restore_points": points,
+        "staged_restore": get_staged_restore(),
+    }
+
+
+# =================================================================================
+# STAGED RESTORE
+# =================================================================================
+
+def get_staged_restore() -> dict | None:
+    try:
+        lines = STAGED_RESTORE_FILE.read_text().splitlines()
+    except FileNotFoundError:
+        return None
+    values = dict(line.split("=", 1) for line in lines if "=" in line)
+    return {"base_backup": values.get("BASE_BACKUP"), "target_time": values.get("TARGET_TIME")}
+
+
+def stage_restore(db: Session, target_time: datetime) -> dict:
+    """
+    Picks the newest base backup finished before *target_time* and writes
+    the restore plan for the database container's entrypoint.
+    """
+    _require_enabled()
+    if target_time.tzinfo is None:
+        raise HTTPException(status_code=400, detail="target_time must include a timezone offset.")
+
+    candidates = [b for b in _base_backups() if datetime.fromisoformat(b["finished_at"]) <= target_time]
+    if not candidates:
+        raise HTTPException(status_code=400, detail="No base backup exists before that time.")
+    latest = _latest_archived_at(db)
+    if latest is None or target_time > latest:
+        raise HTTPException(status_code=400, detail="Target time is after the latest archived WAL.")
+
+    base = candidates[-1]
+    PITR_STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    STAGED_RESTORE_FILE.write_text(
+        f"BASE_BACKUP={base['name']}\n"
+        f"TARGET_TIME={target_time.astimezone(timezone.utc).isoformat()}\n"
+    )
+    logger.warning("Point-in-time restore staged: %s from %s", target_time.isoformat(), base["name"])
+    return get_staged_restore()
+
+
+def cancel_staged_restore() -> None:
+    _require_enabled()
+    STAGED_RESTORE_FILE.unlink(missing_ok=True)
@@ -8,13 +8,14 @@ and purok listing.
 """
 
 from datetime import date
-import base64
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, defer
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.models.resident import Resident, Address, ResidentRFID, Purok
 from app.models.barangayid import BarangayID
+from app.services.image_service import image_url, process_image
+from app.services.revenue_service import record_revenue_change, revenue_entry
 from app.schemas.resident import (
     ResidentCreate,
     ResidentUpdate,
@@ -176,6 +177,7 @@ def get_resident_by_id(db: Session, resident_id: int) -> Optional[Resident]:
     return (
         db.query(Resident)
         .options(
+            defer(Resident.photo),  # served by URL from photo_hash
             joinedload(Resident.addresses).joinedload(Address.purok),
             joinedload(Resident.rfids),
             joinedload(Resident.barangay_ids),  # needed for brgy_id_number + expiry
@@ -214,7 +216,8 @@ def get_resident_detail(db: Session, resident_id: int) -> Optional[Dict]:
         "gender":     resident.gender,
         "birthdate":  resident.birthdate.strftime("%m/%d/%Y"),
         "age":        age,
-        "photo":      base64.b64encode(resident.photo).decode("utf-8") if resident.photo else None,
+        "photo_url":           image_url(resident.photo_hash, "photo"),
+        "photo_thumbnail_url": image_url(resident.photo_hash, "photo_thumb"),
 
         # Contact info
         "email":        resident.email,
@@ -423,6 +426,10 @@ def update_resident(db: Session, resident_id: int, resident_data: ResidentUpdate
     for field, value in update_data.items():
         setattr(resident, field, value)
 
+    if "photo" in update_data:
+        photo = update_data["photo"]
+        resident.photo_hash = process_image(photo, "resident_photo") if photo else None
+
     db.commit()
     db.refresh(resident)
     return resident
@@ -497,6 +504,9 @@ def delete_resident(db: Session, resident_id: int) -> bool:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f"Resident with ID {resident_id} not found")
     try:
+        # The resident's requests go with it (ORM cascade); take them out of the rollup too
+        for req in [*resident.document_requests, *resident.equipment_requests]:
+            record_revenue_change(db, revenue_entry(req), None)
         db.delete(resident)
         db.commit()
         return True
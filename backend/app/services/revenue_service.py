@@ -0,0 +1,391 @@
+"""
+app/services/revenue_service.py
+
+Service layer for the daily_revenue rollup: per-day request totals by
+service, document type and payment status. The request lifecycle functions
+(create, mark paid/unpaid, refund, delete) call record_revenue_change()
+with a request's entry before and after the change, and the difference is
+applied as an upsert in the same transaction. rebuild_daily_revenue()
+recomputes any range from the request tables.
+
+Finance summaries and the financial statement totals read this table, so
+a year of figures is at most a few thousand rows rather than every request.
+
+It also keeps finance_data_versions, a per-day counter bumped by ORM session
+events whenever anything a financial statement shows for that day changes: a
+request dated that day, its items, or the resident, document type or
+equipment name printed next to it. get_data_version() sums the counters over
+a period, so a cached statement (finance_export_service) stays valid until
+one of its own days changes, however old that day is.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+from sqlalchemy import TIMESTAMP, Date, cast, event, func, inspect, literal, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.document import DocumentRequest, DocumentType
+from app.models.equipment import EquipmentInventory, EquipmentRequest, EquipmentRequestItem
+from app.models.resident import Resident
+from app.models.revenue import DailyRevenue, FinanceDataVersion
+
+SERVICES = ("documents", "id_services", "equipment")
+
+SUMMARY_PERIODS = ("day", "month", "year")
+
+
+class RevenueEntry(NamedTuple):
+    # Bucketed by requested_at::date in the database session's TimeZone, like
+    # the rebuild, never by the API process's local zone. None means the row
+    # has not been stored yet and takes its server default, now()
+    requested_at:   Optional[datetime]
+    service:        str
+    doctype_id:     int
+    payment_status: str
+    amount:         Decimal
+
+
+# Same bucketing as revenue_entry(), for rebuilding from the request tables
+_REBUILD_SQL = """
+    INSERT INTO daily_revenue (day, service, doctype_id, payment_status, amount, request_count)
+    SELECT requested_at::date,
+           CASE WHEN doctype_id IS NULL THEN 'id_services' ELSE 'documents' END,
+           COALESCE(doctype_id, 0),
+           CASE WHEN payment_status = 'paid' THEN 'paid' ELSE 'unpaid' END,
+           SUM(COALESCE(price, 0)),
+           COUNT(*)
+    FROM document_requests
+    WHERE requested_at >= :day_from AND requested_at <= :day_to
+    GROUP BY 1, 2, 3, 4
+    UNION ALL
+    SELECT requested_at::date,
+           'equipment',
+           0,
+           CASE WHEN is_refunded THEN 'refunded'
+                WHEN payment_status = 'paid' THEN 'paid'
+                ELSE 'unpaid' END,
+           SUM(COALESCE(total_cost, 0)),
+           COUNT(*)
+    FROM equipment_requests
+    WHERE requested_at >= :day_from AND requested_at <= :day_to
+    GROUP BY 1, 4
+"""
+
+_BUMP_VERSIONS_SQL = """
+    INSERT INTO finance_data_versions (day, version)
+    SELECT day, 1 FROM ({days}) AS changed (day)
+    GROUP BY day ORDER BY day
+    ON CONFLICT (day) DO UPDATE SET version = finance_data_versions.version + 1
+"""
+
+# Which request days a changed row touches, keyed by the row's id
+_AFFECTED_DAYS_SQL = {
+    "document_request":  "SELECT requested_at::date FROM document_requests WHERE id = ANY(:ids)",
+    "equipment_request": "SELECT requested_at::date FROM equipment_requests WHERE id = ANY(:ids)",
+    "resident": """
+        SELECT requested_at::date FROM document_requests WHERE resident_id = ANY(:ids)
+        UNION SELECT requested_at::date FROM equipment_requests WHERE resident_id = ANY(:ids)
+    """,
+    "document_type": "SELECT requested_at::date FROM document_requests WHERE doctype_id = ANY(:ids)",
+    "equipment_item": """
+        SELECT r.requested_at::date FROM equipment_requests r
+        JOIN equipment_request_items i ON i.equipment_request_id = r.id
+        WHERE i.item_id = ANY(:ids)
+    """,
+}
+
+# Days the rollup holds in a rebuilt range, before and after the rebuild
+_ROLLUP_DAYS_SQL = "SELECT day FROM daily_revenue WHERE day >= :day_from AND day <= :day_to"
+
+# Names a statement prints; other edits to these rows leave statements alone
+_PRINTED_NAMES = {
+    Resident:           ("first_name", "middle_name", "last_name"),
+    DocumentType:       ("doctype_name",),
+    EquipmentInventory: ("name",),
+}
+
+
+# =================================================================================
+# INCREMENTAL MAINTENANCE
+# =================================================================================
+
+def revenue_entry(req: DocumentRequest | EquipmentRequest) -> RevenueEntry:
+    """The rollup bucket a request currently counts towards, and its amount."""
+    requested_at = req.requested_at
+
+    if isinstance(req, EquipmentRequest):
+        if req.is_refunded:
+            payment_status = "refunded"
+        else:
+            payment_status = "paid" if req.payment_status == "paid" else "unpaid"
+        return RevenueEntry(requested_at, "equipment", 0, payment_status, req.total_cost or Decimal("0"))
+
+    return RevenueEntry(
+        requested_at,
+        "id_services" if req.doctype_id is None else "documents",
+        req.doctype_id or 0,
+        "paid" if req.payment_status == "paid" else "unpaid",
+        req.price or Decimal("0"),
+    )
+
+
+def _day_of(requested_at: Optional[datetime]):
+    if requested_at is None:
+        return cast(func.now(), Date)
+    return cast(literal(requested_at, TIMESTAMP(timezone=True)), Date)
+
+
+def record_revenue_change(
+    db: Session,
+    before: Optional[RevenueEntry],
+    after: Optional[RevenueEntry],
+) -> None:
+    """
+    Moves a request's amount from its old bucket to its new one. Pass
+    before=None for a new request and after=None for a deleted one. Does
+    not commit; the caller's commit covers the request and the rollup.
+    """
+    if before == after:
+        return
+
+    deltas = []
+    if before is not None:
+        deltas.append((before, -before.amount, -1))
+    if after is not None:
+        deltas.append((after, after.amount, 1))
+
+    for entry, amount, count in deltas:
+        stmt = pg_insert(DailyRevenue).values(
+            day=_day_of(entry.requested_at),
+            service=entry.service,
+            doctype_id=entry.doctype_id,
+            payment_status=entry.payment_status,
+            amount=amount,
+            request_count=count,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "service", "doctype_id", "payment_status"],
+            set_={
+                "amount":        DailyRevenue.amount + stmt.excluded.amount,
+                "request_count": DailyRevenue.request_count + stmt.excluded.request_count,
+            },
+        )
+        db.execute(stmt)
+
+
+def rebuild_daily_revenue(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> int:
+    """
+    Recomputes the rollup for [date_from, date_to] (everything if omitted)
+    from the request tables, bumps the data version of each day it touches
+    and commits. Returns the number of rows written.
+    """
+    day_from = date_from or date.min
+    day_to   = date_to or date.max
+
+    # Keeps concurrent lifecycle changes from landing between the delete and the insert
+    db.execute(text("LOCK TABLE daily_revenue IN SHARE ROW EXCLUSIVE MODE"))
+
+    # Cached statements of every day the rebuild may change go stale with it:
+    # days that lose their rows now, days that gain them after the insert
+    bump_rollup_days = text(_BUMP_VERSIONS_SQL.format(days=_ROLLUP_DAYS_SQL))
+    days = {"day_from": day_from, "day_to": day_to}
+    db.execute(bump_rollup_days, days)
+    db.query(DailyRevenue).filter(
+        DailyRevenue.day >= day_from,
+        DailyRevenue.day <= day_to,
+    ).delete(synchronize_session=False)
+
+    written = db.execute(text(_REBUILD_SQL), {
+        "day_from": datetime.combine(day_from, datetime.min.time()),
+        "day_to":   datetime.combine(day_to, datetime.max.time()),
+    }).rowcount
+    db.execute(bump_rollup_days, days)
+    db.commit()
+    return written
+
+
+# =================================================================================
+# DATA VERSIONS
+# =================================================================================
+
+def _names_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _PRINTED_NAMES[type(obj)])
+
+
+def _affected(objects, deleting: bool = False) -> dict[str, set[int]]:
+    affected: dict[str, set[int]] = {}
+
+    def add(kind: str, id_):
+        if id_ is not None:
+            affected.setdefault(kind, set()).add(id_)
+
+    for obj in objects:
+        if isinstance(obj, DocumentRequest):
+            add("document_request", obj.id)
+        elif isinstance(obj, EquipmentRequest):
+            add("equipment_request", obj.id)
+        elif isinstance(obj, EquipmentRequestItem):
+            add("equipment_request", obj.equipment_request_id)
+        elif type(obj) in _PRINTED_NAMES and (deleting or _names_changed(obj)):
+            kind = {Resident: "resident", DocumentType: "document_type",
+                    EquipmentInventory: "equipment_item"}[type(obj)]
+            add(kind, obj.id)
+    return affected
+
+
+def _bump_affected(session: Session, affected: dict[str, set[int]]) -> None:
+    for kind, ids in affected.items():
+        session.connection().execute(
+            text(_BUMP_VERSIONS_SQL.format(days=_AFFECTED_DAYS_SQL[kind])),
+            {"ids": list(ids)},
+        )
+
+
+def bump_data_versions(db: Session, kind: str, ids) -> None:
+    """
+    Marks the days of the given rows as changed; kind is a key of
+    _AFFECTED_DAYS_SQL ("document_request", "equipment_request", ...). The
+    session events cover ORM writes; call this before a bulk
+    query.delete()/update() on those tables.
+    """
+    ids = set(ids)
+    if ids:
+        _bump_affected(db, {kind: ids})
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_before_flush(session, flush_context, instances):
+    # Rows about to change or go: bump the days they are dated now
+    changed = [obj for obj in session.dirty if session.is_modified(obj)]
+    _bump_affected(session, _affected(changed))
+    _bump_affected(session, _affected(session.deleted, deleting=True))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session, flush_context):
+    # New rows, and rows whose date moved, count towards the day they are dated now
+    moved = [
+        obj for obj in session.dirty
+        if isinstance(obj, (DocumentRequest, EquipmentRequest))
+        and inspect(obj).attrs.requested_at.history.has_changes()
+    ]
+    _bump_affected(session, _affected([*session.new, *moved]))
+
+
+def get_data_version(db: Session, date_from: date, date_to: date) -> int:
+    """Sum of the day counters in [date_from, date_to]; changes whenever any of those days does."""
+    return db.query(func.coalesce(func.sum(FinanceDataVersion.version), 0)).filter(
+        FinanceDataVersion.day >= date_from,
+        FinanceDataVersion.day <= date_to,
+    ).scalar()
+
+
+# =================================================================================
+# READS
+# =================================================================================
+
+def _service_totals(collected=Decimal("0"), pending=Decimal("0"), refunded=Decimal("0"), count=0) -> dict:
+    return {
+        "total_collected": collected,
+        "total_pending":   pending,
+        "total_refunded":  refunded,
+        "count":           count,
+    }
+
+
+def _combined(totals) -> dict:
+    totals = list(totals)
+    return _service_totals(
+        sum(t["total_collected"] for t in totals),
+        sum(t["total_pending"] for t in totals),
+        sum(t["total_refunded"] for t in totals),
+        sum(t["count"] for t in totals),
+    )
+
+
+def _sums():
+    return (
+        func.coalesce(func.sum(DailyRevenue.amount).filter(DailyRevenue.payment_status == "paid"), 0).label("collected"),
+        func.coalesce(func.sum(DailyRevenue.amount).filter(DailyRevenue.payment_status == "unpaid"), 0).label("pending"),
+        func.coalesce(func.sum(DailyRevenue.amount).filter(DailyRevenue.payment_status == "refunded"), 0).label("refunded"),
+        func.coalesce(func.sum(DailyRevenue.request_count), 0).label("count"),
+    )
+
+
+def get_revenue_totals(db: Session, date_from: date, date_to: date) -> dict:
+    """Collected / pending / refunded totals and request counts per service."""
+    rows = (
+        db.query(DailyRevenue.service, *_sums())
+        .filter(DailyRevenue.day >= date_from, DailyRevenue.day <= date_to)
+        .group_by(DailyRevenue.service)
+        .all()
+    )
+    totals = {service: _service_totals() for service in SERVICES}
+    for row in rows:
+        totals[row.service] = _service_totals(row.collected, row.pending, row.refunded, row.count)
+    return totals
+
+
+def get_revenue_summary(db: Session, date_from: date, date_to: date, group_by: str = "month") -> dict:
+    """Per-period, per-service totals plus a breakdown by document type."""
+    period = func.date_trunc(group_by, DailyRevenue.day).label("period")
+    in_range = (DailyRevenue.day >= date_from, DailyRevenue.day <= date_to)
+
+    rows = (
+        db.query(period, DailyRevenue.service, *_sums())
+        .filter(*in_range)
+        .group_by(period, DailyRevenue.service)
+        .order_by(period)
+        .all()
+    )
+
+    periods: dict[str, dict] = {}
+    fmt = {"day": "%Y-%m-%d", "month": "%Y-%m", "year": "%Y"}[group_by]
+    for row in rows:
+        key = row.period.strftime(fmt)
+        entry = periods.setdefault(key, {
+            "period":   key,
+            "services": {service: _service_totals() for service in SERVICES},
+        })
+        entry["services"][row.service] = _service_totals(row.collected, row.pending, row.refunded, row.count)
+
+    for entry in periods.values():
+        entry.update(_combined(entry["services"].values()))
+
+    by_type = (
+        db.query(
+            DailyRevenue.doctype_id,
+            func.coalesce(DocumentType.doctype_name, "Unknown").label("doctype_name"),
+            *_sums(),
+        )
+        .outerjoin(DocumentType, DocumentType.id == DailyRevenue.doctype_id)
+        .filter(*in_range, DailyRevenue.service == "documents")
+        .group_by(DailyRevenue.doctype_id, DocumentType.doctype_name)
+        .order_by(func.sum(DailyRevenue.amount).desc())
+        .all()
+    )
+
+    totals = get_revenue_totals(db, date_from, date_to)
+    return {
+        "date_from": date_from,
+        "date_to":   date_to,
+        "group_by":  group_by,
+        "periods":   list(periods.values()),
+        "by_document_type": [
+            {
+                "doctype_id":   row.doctype_id,
+                "doctype_name": row.doctype_name,
+                **_service_totals(row.collected, row.pending, row.refunded, row.count),
+            }
+            for row in by_type
+        ],
+        "totals":    {"services": totals, **_combined(totals.values())},
+    }
@@ -17,6 +17,7 @@ from typing import List, Dict, Any
 import serial
 
 from app.core.config import settings
+from app.core.metrics import SMS_MESSAGES
 
 log = logging.getLogger(__name__)
 
@@ -184,6 +185,7 @@ class A7670EGateway:
             ser = self._open()
         except Exception as exc:
             log.error("%s Could not open modem: %s", _ts(), exc)
+            SMS_MESSAGES.labels("failed").inc(total)
             if on_progress:
                 on_progress(0, total, None, False, error=str(exc))
             return {
@@ -200,6 +202,7 @@ class A7670EGateway:
             for i, number in enumerate(phone_numbers, 1):
                 log.info("%s --- %d of %d: %s ---", _ts(), i, total, number)
                 ok = self._send_one(ser, number, message)
+                SMS_MESSAGES.labels("sent" if ok else "failed").inc()
                 if ok:
                     sent += 1
                 else:
@@ -1,20 +1,56 @@
 """
 app/services/systemconfig_service.py
- 
+
 Service layer for system configuration management.
 Handles reading, updating, and persisting the single SystemConfig row (id=1).
-Also manages the barangay logo and last backup timestamp.
+Also manages the barangay logo and the outcome of the last backup.
+
+Reads are served from an in-process snapshot (without the logo blob) that is
+invalidated on every write. Writes NOTIFY the other uvicorn workers so their
+snapshots are dropped as soon as the change commits.
 """
 
-from sqlalchemy.orm import Session
+import threading
+import time
+from sqlalchemy.orm import Session, defer
 from fastapi import HTTPException, status
 from datetime import datetime, timezone
+from app.core.config import settings
+from app.core.pg_listener import publish, subscribe
 from app.models.systemconfig import SystemConfig
-from app.schemas.systemconfig import SystemConfigUpdate
+from app.schemas.systemconfig import SystemConfigSnapshot, SystemConfigUpdate
+
+CONFIG_CHANNEL = "system_config_changed"
+
+_cache_lock = threading.Lock()
+_cached_config: SystemConfigSnapshot | None = None
+_cached_at = 0.0
+_cached_logo: tuple[bytes, str] | None = None
+_generation = 0
+
+
+# =================================================================================
+# CACHE
+# =================================================================================
 
+def invalidate_config_cache(_payload: str | None = None) -> None:
+    global _cached_config, _cached_logo, _generation
+    with _cache_lock:
+        _cached_config = None
+        _cached_logo = None
+        _generation += 1
 
-def get_config(db: Session) -> SystemConfig:
-    config = db.query(SystemConfig).filter(SystemConfig.id == 1).first()
+
+subscribe(CONFIG_CHANNEL, invalidate_config_cache)
+
+
+def _get_config_row(db: Session) -> SystemConfig:
+    config = (
+        db.query(SystemConfig)
+        .options(defer(SystemConfig.brgy_logo))
+        .filter(SystemConfig.id == 1)
+        .first()
+    )
     if not config:
         config = SystemConfig(id=1)
         db.add(config)
@@ -23,43 +59,121 @@ def get_config(db: Session) -> SystemConfig:
     return config
 
 
-def update_config(db: Session, data: SystemConfigUpdate) -> SystemConfig:
-    config = get_config(db)
+def _load_snapshot(db: Session) -> SystemConfigSnapshot:
+    config = _get_config_row(db)
+    has_logo = (
+        db.query(SystemConfig.brgy_logo.isnot(None))
+        .filter(SystemConfig.id == 1)
+        .scalar()
+    )
+    values = {
+        column.key: getattr(config, column.key)
+        for column in SystemConfig.__table__.columns
+        if column.key != "brgy_logo"
+    }
+    return SystemConfigSnapshot(**values, has_logo=bool(has_logo))
+
+
+def _commit_and_publish(db: Session) -> None:
+    publish(db, CONFIG_CHANNEL)
+    db.commit()
+    invalidate_config_cache()
+
+
+# =================================================================================
+# READ / UPDATE
+# =================================================================================
+
+def get_config(db: Session) -> SystemConfigSnapshot:
+    global _cached_config, _cached_at
+    with _cache_lock:
+        if _cached_config is not None and time.monotonic() - _cached_at < settings.CONFIG_CACHE_TTL:
+            return _cached_config
+        generation = _generation
+
+    snapshot = _load_snapshot(db)
+
+    # Only keep the snapshot if no invalidation arrived while it was loading
+    with _cache_lock:
+        if generation == _generation:
+            _cached_config = snapshot
+            _cached_at = time.monotonic()
+    return snapshot
+
+
+def update_config(db: Session, data: SystemConfigUpdate) -> SystemConfigSnapshot:
+    config = _get_config_row(db)
 
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(config, field, value)
 
-    db.commit()
-    db.refresh(config)
-    return config
+    _commit_and_publish(db)
+    return get_config(db)
+
+
+def set_last_backup(db: Session) -> SystemConfigSnapshot:
+    config = _get_config_row(db)
+    config.last_backup_at = datetime.now(timezone.utc)
+    config.last_backup_status = "success"
+    config.last_backup_error = None
+    _commit_and_publish(db)
+    return get_config(db)
+
+
+def set_backup_failed(db: Session, error: str) -> SystemConfigSnapshot:
+    """Records a failed scheduled backup; last_backup_at keeps the last good one."""
+    config = _get_config_row(db)
+    config.last_backup_status = "failed"
+    config.last_backup_error = error[:2000]
+    _commit_and_publish(db)
+    return get_config(db)
+
+
+# =================================================================================
+# BARANGAY LOGO
+# =================================================================================
+
+def _detect_content_type(raw: bytes) -> str:
+    if raw[:4] == b'\x89PNG':
+        return "image/png"
+    elif raw[:2] in (b'\xff\xd8',):
+        return "image/jpeg"
+    elif raw[:4] == b'RIFF' and raw[8:12] == b'WEBP':
+        return "image/webp"
+    elif raw[:5] in (b'<?xml', b'<svg '):
+        return "image/svg+xml"
+    return "image/png"
 
 
 def get_logo_bytes(db: Session) -> tuple[bytes, str]:
-    config = get_config(db)
-    if not config.brgy_logo:
+    global _cached_logo
+    with _cache_lock:
+        if _cached_logo is not None:
+            return _cached_logo
+        generation = _generation
+
+    raw = db.query(SystemConfig.brgy_logo).filter(SystemConfig.id == 1).scalar()
+    if not raw:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No logo uploaded."
         )
 
-    raw = config.brgy_logo
-    if raw[:4] == b'\x89PNG':
-        content_type = "image/png"
-    elif raw[:2] in (b'\xff\xd8',):
-        content_type = "image/jpeg"
-    elif raw[:4] == b'RIFF' and raw[8:12] == b'WEBP':
-        content_type = "image/webp"
-    elif raw[:5] in (b'<?xml', b'<svg '):
-        content_type = "image/svg+xml"
-    else:
-        content_type = "image/png"
-    return raw, content_type
+    logo = (bytes(raw), _detect_content_type(raw))
+    with _cache_lock:
+        if generation == _generation:
+            _cached_logo = logo
+    return logo
 
 
-def set_last_backup(db: Session) -> SystemConfig:
-    config = get_config(db)
-    config.last_backup_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(config)
-    return config
\ No newline at end of file
+def set_logo(db: Session, contents: bytes) -> None:
+    config = _get_config_row(db)
+    config.brgy_logo = contents
+    _commit_and_publish(db)
+
+
+def clear_logo(db: Session) -> None:
+    config = _get_config_row(db)
+    config.brgy_logo = None
+    _commit_and_publish(db)
@@ -6,16 +6,36 @@ Supports admin, resident, kiosk, and system actors. Logs are written
 to the SystemLog table with optional request context (IP, endpoint, method).
 Convenience wrappers (log_info, log_warning, log_error, log_critical) are
 provided for the most common log levels.
+
+log_action only builds the row and appends it to an in-memory ring buffer;
+a background thread bulk-inserts the buffer every SYSTEM_LOG_BATCH_SIZE
+records or SYSTEM_LOG_FLUSH_MS, whichever comes first. When the buffer is
+full the oldest pending entries are dropped and counted, so logging never
+blocks the request that triggered it. Each flush also bumps the per-day,
+per-level counters in system_log_daily_counts in the same transaction.
+
+system_logs is partitioned by month; run_log_maintenance (daily, and once at
+startup) creates upcoming partitions and drops those past the retention
+period.
 """
 
 import json
 import logging
+import threading
+import re
+import time
+from collections import deque
+from datetime import date, datetime, timezone
 from typing import Optional, TYPE_CHECKING
 
 from fastapi import Request
+from sqlalchemy import Date, DateTime, String, cast, column, func, insert, select, text, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.models.systemlogs import SystemLog, LogSource, LogLevel, LogCategory
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.systemlogs import SystemLog, SystemLogDailyCount, LogSource, LogLevel, LogCategory
 
 if TYPE_CHECKING:
     from app.models.admin import Admin
@@ -23,6 +43,23 @@ if TYPE_CHECKING:
 
 _logger = logging.getLogger("system_logs")
 
+PARTITIONS_AHEAD = 3
+_PARTITION_RE = re.compile(r"^system_logs_(\d{4})_(\d{2})$")
+
+_buffer: deque[dict] = deque(maxlen=settings.SYSTEM_LOG_BUFFER_SIZE)
+_buffer_ready = threading.Condition()
+_stop = threading.Event()
+_flusher: threading.Thread | None = None
+
+_metrics = {
+    "enqueued":       0,
+    "written":        0,
+    "dropped":        0,   # evicted from a full buffer before being written
+    "failed":         0,   # lost to a failed bulk insert
+    "flushes":        0,
+    "last_flush_ms":  0.0,
+}
+
 
 # =================================================================================
 # ACTOR NAME HELPERS
@@ -45,12 +82,185 @@ def get_resident_actor_name(resident: "Resident") -> str:
         return f"Resident #{resident.id}"
 
 
+# =================================================================================
+# BUFFERED WRITER
+# =================================================================================
+
+def _level_name(level) -> str:
+    return level.name if isinstance(level, LogLevel) else str(level)
+
+
+def _insert_rows(rows: list[dict]) -> None:
+    # Bucketed by created_at::date in the database session's TimeZone, like the
+    # backfill and the partition bounds, never by the API process's local zone
+    batch = values(
+        column("created_at", DateTime(timezone=True)),
+        column("level", String),
+        name="batch",
+    ).data([(row["created_at"], _level_name(row["level"])) for row in rows])
+    day = cast(batch.c.created_at, Date)
+    level = cast(batch.c.level, SystemLogDailyCount.level.type)
+    rollup = pg_insert(SystemLogDailyCount).from_select(
+        ["day", "level", "count"],
+        select(day, level, func.count()).select_from(batch).group_by(day, level),
+    )
+    rollup = rollup.on_conflict_do_update(
+        index_elements=["day", "level"],
+        set_={"count": SystemLogDailyCount.count + rollup.excluded.count},
+    )
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(SystemLog), rows)
+        db.execute(rollup)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _flush(max_rows: int | None = None) -> int:
+    """Writes up to max_rows buffered entries (all of them if None)."""
+    with _buffer_ready:
+        count = len(_buffer) if max_rows is None else min(len(_buffer), max_rows)
+        rows = [_buffer.popleft() for _ in range(count)]
+    if not rows:
+        return 0
+
+    started = time.perf_counter()
+    try:
+        _insert_rows(rows)
+    except Exception as exc:
+        _logger.error(f"[SystemLog] Failed to write {len(rows)} log entries: {exc}", exc_info=True)
+        with _buffer_ready:
+            _metrics["failed"] += len(rows)
+        return 0
+
+    with _buffer_ready:
+        _metrics["written"] += len(rows)
+        _metrics["flushes"] += 1
+        _metrics["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return len(rows)
+
+
+def _run_flusher() -> None:
+    flush_seconds = settings.SYSTEM_LOG_FLUSH_MS / 1000
+    while not _stop.is_set():
+        with _buffer_ready:
+            if len(_buffer) < settings.SYSTEM_LOG_BATCH_SIZE:
+                _buffer_ready.wait(flush_seconds)
+        while _flush(settings.SYSTEM_LOG_BATCH_SIZE) == settings.SYSTEM_LOG_BATCH_SIZE:
+            pass
+
+
+def _enqueue(row: dict) -> None:
+    if _flusher is None:
+        # No flusher running (e.g. scripts outside the app) — write through
+        with _buffer_ready:
+            _buffer.append(row)
+        _flush()
+        return
+
+    with _buffer_ready:
+        if len(_buffer) == _buffer.maxlen:
+            _metrics["dropped"] += 1
+        _buffer.append(row)
+        _metrics["enqueued"] += 1
+        if len(_buffer) >= settings.SYSTEM_LOG_BATCH_SIZE:
+            _buffer_ready.notify()
+
+
+def start_log_writer() -> None:
+    global _flusher
+    if _flusher and _flusher.is_alive():
+        return
+    _stop.clear()
+    _flusher = threading.Thread(target=_run_flusher, name="system-log-flusher", daemon=True)
+    _flusher.start()
+
+
+def stop_log_writer() -> None:
+    """Stops the flusher and writes everything still buffered."""
+    global _flusher
+    if _flusher is None:
+        return
+    _stop.set()
+    with _buffer_ready:
+        _buffer_ready.notify()
+    _flusher.join(timeout=settings.SYSTEM_LOG_FLUSH_MS / 1000 + 5)
+    _flusher = None
+    _flush()
+
+
+def get_log_writer_metrics() -> dict:
+    with _buffer_ready:
+        return {**_metrics, "buffered": len(_buffer)}
+
+
+# =================================================================================
+# PARTITION MAINTENANCE
+# =================================================================================
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_log_partitions(db: Session, months_ahead: int = PARTITIONS_AHEAD) -> None:
+    """Creates the monthly partitions from this month through months_ahead."""
+    this_month = date.today().replace(day=1)
+    for offset in range(months_ahead + 1):
+        start = _add_months(this_month, offset)
+        end = _add_months(start, 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS system_logs_{start:%Y_%m} PARTITION OF system_logs "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+
+
+def drop_expired_log_partitions(db: Session, retention_months: int) -> list[str]:
+    """Drops whole monthly partitions that ended before the retention window."""
+    cutoff = _add_months(date.today().replace(day=1), -retention_months)
+    partitions = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'system_logs'::regclass"
+    )).scalars().all()
+
+    dropped = []
+    for name in partitions:
+        match = _PARTITION_RE.match(name)
+        if not match:
+            continue
+        end = _add_months(date(int(match[1]), int(match[2]), 1), 1)
+        if end <= cutoff:
+            db.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    return dropped
+
+
+def run_log_maintenance() -> None:
+    db = SessionLocal()
+    try:
+        # Serialize across workers so concurrent CREATE/DROP never collide
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext('system_logs_maintenance'))"))
+        ensure_log_partitions(db)
+        dropped = drop_expired_log_partitions(db, settings.SYSTEM_LOG_RETENTION_MONTHS)
+        db.commit()
+        if dropped:
+            _logger.info(f"[SystemLog] Dropped expired partitions: {', '.join(dropped)}")
+    except Exception as exc:
+        db.rollback()
+        _logger.error(f"[SystemLog] Partition maintenance failed: {exc}", exc_info=True)
+    finally:
+        db.close()
+
+
 # =================================================================================
 # CORE LOG WRITER
 # =================================================================================
 
 def log_action(
-    db: Session,
+    db: Optional[Session] = None,
     *,
     action: str,
     source: LogSource,
@@ -73,7 +283,11 @@ def log_action(
     endpoint: Optional[str] = None,
     http_method: Optional[str] = None,
     status_code: Optional[int] = None,
-) -> Optional[SystemLog]:
+) -> bool:
+    """
+    Queues a log entry and returns whether it was accepted. The caller's
+    session (db) is no longer written to; it is kept for existing call sites.
+    """
     try:
         if admin is not None:
             actor_id = actor_id or admin.id
@@ -105,35 +319,29 @@ def log_action(
         elif isinstance(details, str):
             details_str = details
 
-        log_entry = SystemLog(
-            actor_id=actor_id,
-            actor_name=actor_name,
-            actor_role=actor_role,
-            action=action,
-            category=category,
-            level=level,
-            source=source,
-            target_type=target_type,
-            target_id=target_id,
-            details=details_str,
-            ip_address=ip_address,
-            endpoint=endpoint,
-            http_method=http_method,
-            status_code=status_code,
-        )
-
-        db.add(log_entry)
-        db.commit()
-        db.refresh(log_entry)
-        return log_entry
+        _enqueue({
+            "actor_id":    actor_id,
+            "actor_name":  actor_name,
+            "actor_role":  actor_role,
+            "action":      action,
+            "category":    category,
+            "level":       level,
+            "source":      source,
+            "target_type": target_type,
+            "target_id":   target_id,
+            "details":     details_str,
+            "ip_address":  ip_address,
+            "endpoint":    endpoint,
+            "http_method": http_method,
+            "status_code": status_code,
+            # Stamped now, not at flush time, so ordering reflects the event
+            "created_at":  datetime.now(timezone.utc),
+        })
+        return True
 
     except Exception as exc:
-        _logger.error(f"[SystemLog] Failed to write log: {exc}", exc_info=True)
-        try:
-            db.rollback()
-        except Exception:
-            pass
-        return None
+        _logger.error(f"[SystemLog] Failed to queue log: {exc}", exc_info=True)
+        return False
 
 
 # =================================================================================
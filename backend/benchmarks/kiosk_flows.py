@@ -0,0 +1,364 @@
+"""
+benchmarks/kiosk_flows.py
+
+Load test that replays realistic kiosk and admin flows against a running
+backend and reports throughput and p50/p95/p99 latency per endpoint.
+
+Flows (picked at random by weight for every iteration):
+  - rfid_login        RFID scan → PIN verify → transaction history
+  - document_request  document types → submit request (PDF rendered in-request)
+  - equipment_request inventory → autofill → submit request
+  - id_application    ID fields → apply with a photo
+  - admin_browse      admin login (once) → resident, document and equipment
+                      lists → global search
+
+Fixtures (residents with an active RFID card, document types, inventory)
+are read straight from DATABASE_URL, so point it at the same database as
+the backend. Seed it first (seeds/seed_all.py), or pass --generate to bulk-load
+a large synthetic dataset with seeds/generate_dataset.py before the run —
+the flows write requests, so use a disposable database.
+
+Usage:
+    python -m benchmarks.kiosk_flows --base-url http://localhost:8000 \\
+        --concurrency 8 --duration 60 --save-baseline
+    python -m benchmarks.kiosk_flows --compare          # exit 1 on regression
+    python -m benchmarks.kiosk_flows --generate --residents 100000 --transactions 1000000
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import requests
+from sqlalchemy import create_engine, text
+
+DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    "postgresql://admin:admin7890@db:5432/kioskdb"
+)
+
+BENCH_DIR     = Path(__file__).resolve().parent
+RESULTS_DIR   = BENCH_DIR / "results"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+
+FLOW_WEIGHTS = {
+    "rfid_login":        40,
+    "document_request":  25,
+    "equipment_request": 10,
+    "id_application":     5,
+    "admin_browse":      20,
+}
+
+SEARCH_TERMS = ["dela", "cruz", "ramos", "mar", "jo", "an", "BRGY", "clearance"]
+
+
+# =================================================================================
+# FIXTURES
+# =================================================================================
+
+def load_fixtures() -> dict:
+    """Reads the ids the flows need from the benchmark database."""
+    engine = create_engine(DATABASE_URL)
+    with engine.connect() as conn:
+        cards = conn.execute(text("""
+            SELECT r.id, c.rfid_uid
+            FROM residents r
+            JOIN resident_rfid c ON c.resident_id = r.id AND c.is_active
+            WHERE r.rfid_pin IS NOT NULL
+        """)).all()
+        residents = conn.execute(text("SELECT id FROM residents")).scalars().all()
+        doctypes = conn.execute(text("""
+            SELECT id FROM document_types WHERE is_available AND file IS NOT NULL
+        """)).scalars().all()
+        items = conn.execute(text("""
+            SELECT id FROM equipment_inventory WHERE available_quantity > 0
+        """)).scalars().all()
+    engine.dispose()
+
+    if not cards or not doctypes or not items:
+        sys.exit("Benchmark database needs residents with RFID cards, document "
+                 "templates and equipment — run the seeders first.")
+    return {
+        "cards":     [tuple(row) for row in cards],
+        "residents": list(residents),
+        "doctypes":  list(doctypes),
+        "items":     list(items),
+    }
+
+
+def _sample_photo() -> str:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (480, 640), (180, 150, 130)).save(buffer, "JPEG", quality=85)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+# =================================================================================
+# RECORDING
+# =================================================================================
+
+class Recorder:
+    """Thread-safe per-endpoint latency and outcome samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.rejected: dict[str, int] = defaultdict(int)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def call(self, session: requests.Session, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=60, **kwargs)
+        except requests.RequestException:
+            response = None
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.latencies[name].append(elapsed)
+            if response is None or response.status_code >= 500:
+                self.errors[name] += 1
+            elif response.status_code >= 400:
+                # Business rejections (duplicate application, no stock, ...)
+                self.rejected[name] += 1
+        return response if response is not None and response.ok else None
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, wall_seconds: float) -> dict:
+    endpoints = {}
+    for name, samples in sorted(recorder.latencies.items()):
+        ordered = sorted(samples)
+        endpoints[name] = {
+            "requests":   len(ordered),
+            "throughput": round(len(ordered) / wall_seconds, 2),
+            "p50_ms":     round(_percentile(ordered, 50) * 1000, 1),
+            "p95_ms":     round(_percentile(ordered, 95) * 1000, 1),
+            "p99_ms":     round(_percentile(ordered, 99) * 1000, 1),
+            "rejected":   recorder.rejected[name],
+            "errors":     recorder.errors[name],
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "recorded_at":  datetime.now().isoformat(timespec="seconds"),
+        "wall_seconds": round(wall_seconds, 1),
+        "throughput":   round(total / wall_seconds, 2),
+        "endpoints":    endpoints,
+    }
+
+
+# =================================================================================
+# FLOWS
+# =================================================================================
+
+class Flows:
+    def __init__(self, base_url: str, fixtures: dict, recorder: Recorder, args):
+        self.base = base_url.rstrip("/")
+        self.fx = fixtures
+        self.rec = recorder
+        self.pin = args.pin
+        self.admin_credentials = {"username": args.admin_user, "password": args.admin_password}
+        self.photo = _sample_photo()
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _admin_session(self) -> requests.Session:
+        session = getattr(self._local, "admin", None)
+        if session is None:
+            session = requests.Session()
+            response = self.rec.call(
+                session, "POST /admin/auth/login", "POST",
+                f"{self.base}/admin/auth/login", json=self.admin_credentials,
+            )
+            if response is not None:
+                session.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+            self._local.admin = session
+        return session
+
+    def rfid_login(self):
+        s = self._session()
+        resident_id, rfid_uid = random.choice(self.fx["cards"])
+        if self.rec.call(s, "POST /kiosk/auth/rfid", "POST",
+                         f"{self.base}/kiosk/auth/rfid", json={"rfid_uid": rfid_uid}) is None:
+            return
+        self.rec.call(s, "POST /kiosk/auth/verify-pin", "POST",
+                      f"{self.base}/kiosk/auth/verify-pin",
+                      json={"resident_id": resident_id, "pin": self.pin})
+        self.rec.call(s, "GET /kiosk/transactions/history/{resident_id}", "GET",
+                      f"{self.base}/kiosk/transactions/history/{resident_id}")
+
+    def document_request(self):
+        s = self._session()
+        resident_id, _ = random.choice(self.fx["cards"])
+        self.rec.call(s, "GET /kiosk/documents/types", "GET", f"{self.base}/kiosk/documents/types")
+        self.rec.call(s, "POST /kiosk/documents/requests", "POST",
+                      f"{self.base}/kiosk/documents/requests",
+                      json={
+                          "resident_id": resident_id,
+                          "doctype_id":  random.choice(self.fx["doctypes"]),
+                          "form_data":   {"purpose": "Benchmark"},
+                      })
+
+    def equipment_request(self):
+        s = self._session()
+        resident_id, _ = random.choice(self.fx["cards"])
+        borrow = datetime.now() + timedelta(days=random.randint(1, 30))
+        self.rec.call(s, "GET /kiosk/equipment/inventory", "GET", f"{self.base}/kiosk/equipment/inventory")
+        self.rec.call(s, "GET /kiosk/equipment/autofill/{resident_id}", "GET",
+                      f"{self.base}/kiosk/equipment/autofill/{resident_id}")
+        self.rec.call(s, "POST /kiosk/equipment/requests", "POST",
+                      f"{self.base}/kiosk/equipment/requests",
+                      json={
+                          "resident_id":  resident_id,
+                          "use_autofill": True,
+                          "purpose":      "Benchmark",
+                          "borrow_date":  borrow.isoformat(),
+                          "return_date":  (borrow + timedelta(days=1)).isoformat(),
+                          "items":        [{"item_id": random.choice(self.fx["items"]), "quantity": 1}],
+                      })
+
+    def id_application(self):
+        s = self._session()
+        self.rec.call(s, "GET /kiosk/id-services/apply/fields", "GET",
+                      f"{self.base}/kiosk/id-services/apply/fields")
+        self.rec.call(s, "POST /kiosk/id-services/apply", "POST",
+                      f"{self.base}/kiosk/id-services/apply",
+                      json={
+                          "applicant_resident_id": random.choice(self.fx["residents"]),
+                          "photo":                 self.photo,
+                      })
+
+    def admin_browse(self):
+        s = self._admin_session()
+        self.rec.call(s, "GET /admin/residents/", "GET", f"{self.base}/admin/residents/")
+        self.rec.call(s, "GET /admin/documents/requests", "GET", f"{self.base}/admin/documents/requests")
+        self.rec.call(s, "GET /admin/equipment/requests", "GET", f"{self.base}/admin/equipment/requests")
+        self.rec.call(s, "GET /admin/search", "GET", f"{self.base}/admin/search",
+                      params={"q": random.choice(SEARCH_TERMS)})
+
+
+# =================================================================================
+# RUNNER
+# =================================================================================
+
+def run(args) -> dict:
+    random.seed(args.seed)
+    fixtures = load_fixtures()
+    recorder = Recorder()
+    flows = Flows(args.base_url, fixtures, recorder, args)
+
+    names = list(FLOW_WEIGHTS)
+    weights = [FLOW_WEIGHTS[n] for n in names]
+    deadline = time.monotonic() + args.duration
+
+    def worker(worker_id: int):
+        rng = random.Random(args.seed + worker_id)
+        while time.monotonic() < deadline:
+            getattr(flows, rng.choices(names, weights)[0])()
+
+    # Warm-up: connection pools, caches and LibreOffice start-up are not measured
+    for name in names:
+        getattr(flows, name)()
+    recorder = flows.rec = Recorder()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(worker, range(args.concurrency)))
+    return summarize(recorder, time.perf_counter() - started)
+
+
+def print_report(results: dict):
+    print(f"\n{'endpoint':<44}{'req':>7}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'rej':>6}{'err':>6}")
+    print("-" * 99)
+    for name, e in results["endpoints"].items():
+        print(f"{name:<44}{e['requests']:>7}{e['throughput']:>9}"
+              f"{e['p50_ms']:>9}{e['p95_ms']:>9}{e['p99_ms']:>9}{e['rejected']:>6}{e['errors']:>6}")
+    print(f"\nTotal throughput: {results['throughput']} req/s over {results['wall_seconds']} s")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lists every endpoint whose p95 or throughput regressed past the tolerance."""
+    regressions = []
+    for name, base in baseline["endpoints"].items():
+        current = results["endpoints"].get(name)
+        if current is None:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} → {current['p95_ms']} ms")
+        if current["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput']} → {current['throughput']} req/s")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} → {current['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay kiosk flows and report latency percentiles.")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of measured load")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--pin", default="0000", help="PIN set on the seeded residents")
+    parser.add_argument("--admin-user", default="superadmin")
+    parser.add_argument("--admin-password", default="superadmin123")
+    parser.add_argument("--save-baseline", action="store_true", help=f"store results as {BASELINE_FILE.name}")
+    parser.add_argument("--compare", action="store_true", help="compare against the stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="allowed regression ratio")
+    parser.add_argument("--generate", action="store_true", help="bulk-load a synthetic dataset first")
+    parser.add_argument("--residents", type=int, default=100_000)
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    if args.generate:
+        from seeds.generate_dataset import generate_dataset
+        generate_dataset(args.residents, args.transactions, args.seed)
+
+    results = run(args)
+    print_report(results)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out = RESULTS_DIR / f"kiosk_flows_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {out}")
+
+    if args.save_baseline:
+        BASELINE_FILE.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {BASELINE_FILE}")
+
+    if args.compare:
+        if not BASELINE_FILE.exists():
+            sys.exit(f"No baseline at {BASELINE_FILE} — run with --save-baseline first.")
+        regressions = compare(results, json.loads(BASELINE_FILE.read_text()), args.tolerance)
+        if regressions:
+            print("\n❌  Regressions against baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n✅  No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -104,7 +104,23 @@ start_server() {
     exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
 }
 
+# Function to start the scheduled job runner (backups, log maintenance)
+start_job_runner() {
+    echo ""
+    echo "================================================"
+    echo "🗓️  Starting Scheduled Job Runner"
+    echo "================================================"
+    echo ""
+
+    exec python -m app.job_runner
+}
+
 # Main execution
+if [ "$1" = "jobs" ]; then
+    wait_for_db
+    start_job_runner
+fi
+
 wait_for_db
 run_migrations
 seed_database
@@ -0,0 +1,3 @@
+#!/bin/bash
+# Lets the job runner connect for pg_basebackup on a freshly initialised cluster
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,61 @@
+#!/bin/bash
+#
+# backend/postgres/pitr-entrypoint.sh
+#
+# Wraps the stock postgres image entrypoint to:
+#   - archive every completed WAL segment into /backups/wal,
+#   - allow replication connections so the job runner can run pg_basebackup,
+#   - apply a point-in-time restore staged from the admin dashboard
+#     (/backups/pitr/restore.env, written by app/services/pitr_service.py).
+
+set -e
+
+BACKUPS=/backups
+WAL_DIR="$BACKUPS/wal"
+STAGED="$BACKUPS/pitr/restore.env"
+PGDATA="${PGDATA:-/var/lib/postgresql/data}"
+MARKER="# managed by pitr-entrypoint"
+
+mkdir -p "$WAL_DIR" "$BACKUPS/base" "$BACKUPS/pitr"
+chown postgres:postgres "$WAL_DIR"
+
+# Existing clusters never re-run initdb scripts, so the rule is added here
+if [ -f "$PGDATA/pg_hba.conf" ] && ! grep -q "^host replication all all" "$PGDATA/pg_hba.conf"; then
+    echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
+fi
+
+if [ -f "$STAGED" ]; then
+    # shellcheck disable=SC1090
+    . "$STAGED"
+    BASE="$BACKUPS/base/$BASE_BACKUP"
+    if [ ! -f "$BASE/base.tar.gz" ]; then
+        echo "❌ Staged restore references a missing base backup: $BASE" >&2
+        exit 1
+    fi
+
+    echo "⏪ Restoring to $TARGET_TIME from $BASE_BACKUP"
+    # Keep the current cluster until the restore has been checked by hand
+    ASIDE="$BACKUPS/pitr/pre-restore-$(date +%Y%m%d_%H%M%S)"
+    mkdir -p "$ASIDE"
+    find "$PGDATA" -mindepth 1 -maxdepth 1 -exec mv {} "$ASIDE"/ \;
+
+    tar -xzf "$BASE/base.tar.gz" -C "$PGDATA"
+    touch "$PGDATA/recovery.signal"
+    sed -i "/$MARKER/d" "$PGDATA/postgresql.auto.conf"
+    {
+        echo "restore_command = 'cp $WAL_DIR/%f %p' $MARKER"
+        echo "recovery_target_time = '$TARGET_TIME' $MARKER"
+        echo "recovery_target_action = 'promote' $MARKER"
+    } >> "$PGDATA/postgresql.auto.conf"
+    chown -R postgres:postgres "$PGDATA"
+    chmod 700 "$PGDATA"
+
+    mv "$STAGED" "$STAGED.applied-$(date +%Y%m%d_%H%M%S)"
+fi
+
+exec docker-entrypoint.sh postgres \
+    -c wal_level=replica \
+    -c archive_mode=on \
+    -c "archive_command=test ! -f $WAL_DIR/%f && cp %p $WAL_DIR/%f" \
+    -c archive_timeout=300 \
+    "$@"
@@ -0,0 +1,372 @@
+"""
+seeds/generate_dataset.py
+
+High-volume synthetic dataset for scaling tests and benchmarks.
+Where seed_all.py builds the small, hand-curated demo dataset one ORM object
+at a time, this generates residents (with addresses and RFID cards),
+document and equipment requests and their transaction history in bulk:
+
+  - deterministic: the same --seed and counts always produce the same rows
+  - values are drawn a whole chunk at a time (Random.choices(k=...)) from
+    precomputed pools instead of per-row Faker calls
+  - rows are streamed into Postgres with COPY, inside one transaction
+  - ids are assigned up front from each table's current MAX(id), so foreign
+    keys line up without reading anything back; sequences are moved past
+    the new ids (and the DR-/ER- numbering sequences re-synced) at the end
+
+Reference data (puroks, document types, equipment inventory) is created by
+the regular seeders first if it is missing. Existing rows are left alone, so
+the generator can run on top of seed_all.py or on an empty schema.
+
+Usage:
+    python -m seeds.generate_dataset --residents 100000 --transactions 1000000
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from seeds.utils import FIRST_NAMES_M, FIRST_NAMES_F, LAST_NAMES, MIDDLE_NAMES, STREETS
+
+DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    "postgresql://admin:admin7890@db:5432/kioskdb"
+)
+
+CHUNK = 50_000
+
+# Requests are spread over the year before this date
+DATASET_END = datetime(2026, 4, 13, 17, 30, tzinfo=timezone.utc)
+DATASET_DAYS = 365
+
+DOCUMENT_SHARE = 0.75
+CARD_SHARE = 0.7
+
+DOCUMENT_STATUSES  = (("Released", 55), ("Rejected", 10), ("Pending", 15), ("Approved", 10), ("Ready", 10))
+EQUIPMENT_STATUSES = (("Returned", 50), ("Rejected", 10), ("Pending", 15), ("Approved", 10), ("Picked-Up", 15))
+PURPOSES = ["Employment", "School Requirement", "Scholarship", "Bank Requirement",
+            "Travel", "Medical Assistance", "Loan Application", "Personal Record"]
+EQUIPMENT_PURPOSES = ["Birthday Celebration", "Town Fiesta Preparation", "Wedding Reception",
+                      "Graduation Party", "Purok Meeting", "Barangay Sports Event", "Wake / Lamay"]
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# =================================================================================
+# COPY HELPERS
+# =================================================================================
+
+def _copy(cursor, table: str, columns: tuple[str, ...], rows) -> int:
+    """Streams *rows* into *table* with COPY, CHUNK rows per round trip."""
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+
+    def flush():
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+        buffer.seek(0)
+        buffer.truncate()
+
+    for row in rows:
+        # csv writes None as an unquoted empty field, which COPY reads as NULL
+        writer.writerow(row)
+        count += 1
+        if count % CHUNK == 0:
+            flush()
+    if buffer.tell():
+        flush()
+    return count
+
+
+def _next_id(cursor, table: str) -> int:
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def _next_number(cursor, prefix: str, table: str) -> int:
+    cursor.execute(
+        f"SELECT COALESCE(MAX(CAST(SUBSTRING(transaction_no FROM {len(prefix) + 2}) AS INTEGER)), 0) + 1 "
+        f"FROM {table} WHERE transaction_no ~ '^{prefix}-[0-9]+$'"
+    )
+    return cursor.fetchone()[0]
+
+
+def _chunks(total: int):
+    for start in range(0, total, CHUNK):
+        yield start, min(CHUNK, total - start)
+
+
+def _weighted(rng: random.Random, pairs, k: int) -> list:
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights, k=k)
+
+
+def _timestamps(rng: random.Random, k: int) -> list[datetime]:
+    start = DATASET_END - timedelta(days=DATASET_DAYS)
+    offsets = rng.choices(range(DATASET_DAYS * 86400), k=k)
+    return [start + timedelta(seconds=s) for s in offsets]
+
+
+# =================================================================================
+# ROW GENERATORS
+# =================================================================================
+
+def _resident_rows(rng, first_id, count, purok_ids, pin_hash, state):
+    birth_range = range(date(1940, 1, 1).toordinal(), date(2008, 12, 31).toordinal())
+    since_range = range(date(2000, 1, 1).toordinal(), date(2026, 3, 1).toordinal())
+
+    addresses, cards = state["addresses"], state["cards"]
+    for start, n in _chunks(count):
+        genders  = rng.choices(("male", "female"), k=n)
+        males    = rng.choices(FIRST_NAMES_M, k=n)
+        females  = rng.choices(FIRST_NAMES_F, k=n)
+        lasts    = rng.choices(LAST_NAMES, k=n)
+        middles  = rng.choices(MIDDLE_NAMES, k=n)
+        births   = rng.choices(birth_range, k=n)
+        sinces   = rng.choices(since_range, k=n)
+        phones   = rng.choices(range(900000000, 999999999), k=n)
+        puroks   = rng.choices(purok_ids, k=n)
+        streets  = rng.choices(STREETS, k=n)
+        houses   = rng.choices(range(1, 400), k=n)
+        carded   = [r < CARD_SHARE for r in (rng.random() for _ in range(n))]
+
+        for i in range(n):
+            resident_id = first_id + start + i
+            first = males[i] if genders[i] == "male" else females[i]
+            since = date.fromordinal(sinces[i])
+            addresses.append((resident_id, f"{houses[i]:03d} {streets[i]}", puroks[i]))
+            if carded[i]:
+                cards[resident_id] = f"SYN{resident_id:09d}"
+            yield (
+                resident_id, lasts[i], first, middles[i], genders[i],
+                date.fromordinal(births[i]), since,
+                f"{first.lower()}.{lasts[i].lower().replace(' ', '')}.{resident_id}@example.com",
+                f"09{phones[i]}", pin_hash, datetime.combine(since, datetime.min.time()),
+            )
+
+
+def _document_rows(rng, first_id, first_no, count, resident_ids, doctypes, cards, history):
+    doctype_ids = list(doctypes)
+    for start, n in _chunks(count):
+        residents = rng.choices(resident_ids, k=n)
+        types     = rng.choices(doctype_ids, k=n)
+        statuses  = _weighted(rng, DOCUMENT_STATUSES, n)
+        purposes  = rng.choices(PURPOSES, k=n)
+        requested = _timestamps(rng, n)
+
+        for i in range(n):
+            name, price = doctypes[types[i]]
+            transaction_no = f"DR-{first_no + start + i:04d}"
+            if statuses[i] in ("Released", "Rejected"):
+                history.append((
+                    "document", name, transaction_no, residents[i], cards.get(residents[i]),
+                    "Completed" if statuses[i] == "Released" else "Rejected",
+                    requested[i] + timedelta(hours=rng.randint(1, 72)),
+                ))
+            yield (
+                first_id + start + i, transaction_no, residents[i], types[i], price,
+                statuses[i], "paid" if statuses[i] == "Released" else "unpaid",
+                json.dumps({"purpose": purposes[i]}), requested[i],
+            )
+
+
+def _equipment_rows(rng, first_id, first_item_id, first_no, count, resident_ids, items, cards, history, item_rows):
+    item_ids = list(items)
+    item_id = first_item_id
+    for start, n in _chunks(count):
+        residents = rng.choices(resident_ids, k=n)
+        statuses  = _weighted(rng, EQUIPMENT_STATUSES, n)
+        purposes  = rng.choices(EQUIPMENT_PURPOSES, k=n)
+        requested = _timestamps(rng, n)
+
+        for i in range(n):
+            request_id = first_id + start + i
+            transaction_no = f"ER-{first_no + start + i:04d}"
+            borrow = requested[i] + timedelta(days=rng.randint(1, 7))
+            days = rng.randint(1, 3)
+            total = 0.0
+            for chosen in rng.sample(item_ids, rng.randint(1, min(3, len(item_ids)))):
+                quantity = rng.randint(1, 2)
+                total += items[chosen][1] * quantity * days
+                item_rows.append((item_id, request_id, chosen, quantity))
+                item_id += 1
+
+            returned_at = borrow + timedelta(days=days) if statuses[i] == "Returned" else None
+            if statuses[i] in ("Returned", "Rejected"):
+                history.append((
+                    "equipment", items[item_rows[-1][2]][0], transaction_no, residents[i],
+                    cards.get(residents[i]),
+                    "Completed" if statuses[i] == "Returned" else "Rejected",
+                    returned_at or requested[i] + timedelta(hours=rng.randint(24, 96)),
+                ))
+            yield (
+                request_id, transaction_no, residents[i], purposes[i], statuses[i],
+                borrow, borrow + timedelta(days=days), returned_at, round(total, 2),
+                "paid" if statuses[i] in ("Picked-Up", "Returned") else "unpaid",
+                False, requested[i],
+            )
+
+
+# =================================================================================
+# REFERENCE DATA
+# =================================================================================
+
+def _ensure_reference_data(db):
+    from seeds.seed_puroks import seed_puroks
+    from seeds.seed_document_types import seed_document_types
+    from seeds.seed_equipment import EQUIPMENT_CATALOGUE
+    from app.models.equipment import EquipmentInventory
+
+    seed_puroks(db)
+    seed_document_types(db)
+    if db.query(EquipmentInventory).count() == 0:
+        db.add_all(
+            EquipmentInventory(
+                name=item["name"], total_quantity=item["total"],
+                available_quantity=item["total"], rate_per_day=item["rate"],
+            )
+            for item in EQUIPMENT_CATALOGUE
+        )
+        db.commit()
+
+
+# =================================================================================
+# ENTRY POINT
+# =================================================================================
+
+def generate_dataset(residents: int, transactions: int, seed: int = 42):
+    engine = create_engine(DATABASE_URL)
+    SessionLocal = sessionmaker(bind=engine)
+
+    db = SessionLocal()
+    try:
+        _ensure_reference_data(db)
+    finally:
+        db.close()
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+
+        cursor.execute("SELECT id FROM puroks ORDER BY id")
+        purok_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT id, doctype_name, COALESCE(price, 0) FROM document_types
+            WHERE NOT is_id_application ORDER BY id
+        """)
+        doctypes = {row[0]: (row[1], float(row[2])) for row in cursor.fetchall()}
+        cursor.execute("SELECT id, name, rate_per_day FROM equipment_inventory ORDER BY id")
+        items = {row[0]: (row[1], float(row[2])) for row in cursor.fetchall()}
+        cursor.execute("SELECT id FROM residents ORDER BY id")
+        resident_ids = [row[0] for row in cursor.fetchall()]
+
+        state = {"addresses": [], "cards": {}}
+        first_resident = _next_id(cursor, "residents")
+        pin_hash = pwd_context.hash("0000")
+
+        # ── Residents, addresses, RFID cards ─────────────────────────
+        print(f"[dataset] residents: {residents:,}")
+        _copy(cursor, "residents", (
+            "id", "last_name", "first_name", "middle_name", "gender", "birthdate",
+            "residency_start_date", "email", "phone_number", "rfid_pin", "registered_at",
+        ), _resident_rows(rng, first_resident, residents, purok_ids, pin_hash, state))
+        resident_ids.extend(range(first_resident, first_resident + residents))
+
+        first_address = _next_id(cursor, "addresses")
+        _copy(cursor, "addresses", ("id", "resident_id", "house_no_street", "purok_id"), (
+            (first_address + i, *row) for i, row in enumerate(state["addresses"])
+        ))
+        first_card = _next_id(cursor, "resident_rfid")
+        _copy(cursor, "resident_rfid", ("id", "resident_id", "rfid_uid"), (
+            (first_card + i, resident_id, uid)
+            for i, (resident_id, uid) in enumerate(state["cards"].items())
+        ))
+
+        # ── Requests and history ─────────────────────────────────────
+        if not resident_ids:
+            sys.exit("No residents to attach requests to.")
+        history, item_rows = [], []
+        documents = int(transactions * DOCUMENT_SHARE)
+        equipment = transactions - documents
+
+        print(f"[dataset] document requests: {documents:,}")
+        _copy(cursor, "document_requests", (
+            "id", "transaction_no", "resident_id", "doctype_id", "price",
+            "status", "payment_status", "form_data", "requested_at",
+        ), _document_rows(
+            rng, _next_id(cursor, "document_requests"), _next_number(cursor, "DR", "document_requests"),
+            documents, resident_ids, doctypes, state["cards"], history,
+        ))
+
+        print(f"[dataset] equipment requests: {equipment:,}")
+        _copy(cursor, "equipment_requests", (
+            "id", "transaction_no", "resident_id", "purpose", "status", "borrow_date",
+            "return_date", "returned_at", "total_cost", "payment_status", "is_refunded", "requested_at",
+        ), _equipment_rows(
+            rng, _next_id(cursor, "equipment_requests"), _next_id(cursor, "equipment_request_items"),
+            _next_number(cursor, "ER", "equipment_requests"),
+            equipment, resident_ids, items, state["cards"], history, item_rows,
+        ))
+        _copy(cursor, "equipment_request_items",
+              ("id", "equipment_request_id", "item_id", "quantity"), item_rows)
+
+        print(f"[dataset] transaction history: {len(history):,}")
+        first_history = _next_id(cursor, "transaction_history")
+        _copy(cursor, "transaction_history", (
+            "id", "transaction_type", "transaction_name", "transaction_no",
+            "resident_id", "rfid_uid", "status", "created_at",
+        ), ((first_history + i, *row) for i, row in enumerate(history)))
+
+        # ── Move id sequences past the explicit ids ──────────────────
+        for table in ("residents", "addresses", "resident_rfid", "document_requests",
+                      "equipment_requests", "equipment_request_items", "transaction_history"):
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), MAX(id)) FROM {table}"
+            )
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+    db = SessionLocal()
+    try:
+        from app.services.numbering_service import sync_sequences
+        from app.services.revenue_service import rebuild_daily_revenue
+        sync_sequences(db)
+        # COPY bypasses the lifecycle hooks that keep the rollup current
+        rebuild_daily_revenue(db)
+    finally:
+        db.close()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+    engine.dispose()
+    print(f"\n✅  Dataset generated in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load a synthetic dataset with COPY.")
+    parser.add_argument("--residents", type=int, default=100_000)
+    parser.add_argument("--transactions", type=int, default=1_000_000,
+                        help="document + equipment requests to create")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate_dataset(args.residents, args.transactions, args.seed)
@@ -55,6 +55,14 @@ def seed_all():
         seed_audit(db)            # 14. Audit logs
         seed_transactions(db)     # 15. Financial transactions (reads Released records)
 
+        # ── Move number sequences past the seeded reference numbers ────
+        from app.services.numbering_service import sync_sequences
+        sync_sequences(db)
+
+        # ── Seeded requests bypass the lifecycle hooks; build the rollup ─
+        from app.services.revenue_service import rebuild_daily_revenue
+        rebuild_daily_revenue(db)
+
         # ── Backfill PDFs for Released/Approved requests ───────────────
         print("\n[backdate_pdfs] Backfilling missing PDFs …")
         _run_backdate_pdfs(db)
@@ -0,0 +1,65 @@
+"""
+tests/test_metrics.py
+
+Route labels of the request metrics must carry the router prefix, so the
+admin and kiosk endpoints that share a sub-path stay separate series.
+"""
+
+import asyncio
+
+from fastapi import APIRouter, FastAPI
+
+from app.core.metrics import HTTP_DB_QUERIES, MetricsMiddleware
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    for prefix in ("/admin", "/kiosk"):
+        parent = APIRouter()
+        child = APIRouter(prefix="/label-check")
+
+        @child.get("/{item_id}")
+        def read_item(item_id: int):
+            return {"item_id": item_id}
+
+        parent.include_router(child)
+        app.include_router(parent, prefix=prefix)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def _get(app: FastAPI, path: str) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [],
+        "client": ("test", 0), "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+
+
+def _observations(route: str) -> float:
+    for metric in HTTP_DB_QUERIES.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels.get("route") == route:
+                return sample.value
+    return 0.0
+
+
+def test_admin_and_kiosk_routes_get_distinct_labels():
+    app = _build_app()
+    before = {p: _observations(f"{p}/label-check/{{item_id}}") for p in ("/admin", "/kiosk")}
+
+    _get(app, "/admin/label-check/1")
+    _get(app, "/kiosk/label-check/2")
+    _get(app, "/kiosk/label-check/3")
+
+    assert _observations("/admin/label-check/{item_id}") - before["/admin"] == 1
+    assert _observations("/kiosk/label-check/{item_id}") - before["/kiosk"] == 2
+    assert _observations("/label-check/{item_id}") == 0
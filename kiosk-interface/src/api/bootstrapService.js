@@ -0,0 +1,28 @@
+import api from './http';
+
+let cachedEtag = null;
+
+/**
+ * Fetches the kiosk bootstrap bundle (config, document types, equipment,
+ * FAQs, contact info and announcements) in a single request.
+ * Sends the last ETag so unchanged data comes back as an empty 304, in which
+ * case this resolves to null and the stores keep what they already hold.
+ */
+const getKioskBootstrap = async () => {
+  const headers = cachedEtag ? { 'If-None-Match': cachedEtag } : {};
+  const response = await api.get('/kiosk/bootstrap', {
+    headers,
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+  });
+
+  if (response.status === 304) {
+    return null;
+  }
+
+  cachedEtag = response.headers.etag || null;
+  return response.data;
+};
+
+export default {
+  getKioskBootstrap,
+};
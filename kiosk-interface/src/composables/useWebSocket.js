@@ -7,6 +7,17 @@ import { useEquipmentInventoryStore } from '@/stores/equipmentInventory'
 let socket = null
 let reconnectTimer = null
 
+// Stable per-device id so the admin fleet view can tell kiosks apart
+function getKioskId() {
+  if (import.meta.env.VITE_KIOSK_ID) return import.meta.env.VITE_KIOSK_ID
+  let id = localStorage.getItem('kiosk_id')
+  if (!id) {
+    id = `kiosk-${Math.random().toString(36).slice(2, 10)}`
+    localStorage.setItem('kiosk_id', id)
+  }
+  return id
+}
+
 export function useWebSocket() {
   const notificationStore = useNotificationStore()
   const systemConfigStore = useSystemConfigStore()
@@ -18,7 +29,11 @@ export function useWebSocket() {
 
     const host     = window.location.hostname
     const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws'
-    socket = new WebSocket(`${protocol}://${host}:8000/ws/kiosk`)
+    const params   = new URLSearchParams({
+      kiosk_id: getKioskId(),
+      version:  import.meta.env.VITE_APP_VERSION || 'dev',
+    })
+    socket = new WebSocket(`${protocol}://${host}:8000/ws/kiosk?${params}`)
 
     socket.onopen = () => {
       console.log('[WS] Kiosk connected')
@@ -29,6 +44,12 @@ export function useWebSocket() {
       try {
         const { event: type, data } = JSON.parse(event.data)
 
+        // Heartbeat — echo the server timestamp so it can measure latency
+        if (type === 'ping') {
+          socket.send(JSON.stringify({ event: 'pong', data }))
+          return
+        }
+
         if (type === 'config_updated') {
           if (systemConfigStore.config) {
             Object.assign(systemConfigStore.config, data) 
@@ -23,6 +23,12 @@ export const useDocumentTypesStore = defineStore('documentTypes', () => {
     }
   }
 
+  // Types that arrived with the kiosk bootstrap bundle
+  function setTypes(data) {
+    types.value   = data
+    fetched.value = true
+  }
+
   function handleWebSocketEvent(action, data) {
     if (action === 'created') {
       types.value.push(data)
@@ -34,5 +40,5 @@ export const useDocumentTypesStore = defineStore('documentTypes', () => {
     }
   }
 
-  return { types, loading, error, fetched, fetchTypes, handleWebSocketEvent }
+  return { types, loading, error, fetched, fetchTypes, setTypes, handleWebSocketEvent }
 })
\ No newline at end of file
@@ -23,6 +23,12 @@ export const useEquipmentInventoryStore = defineStore('equipmentInventory', () =
     }
   }
 
+  // Inventory that arrived with the kiosk bootstrap bundle
+  function setInventory(data) {
+    inventory.value = data
+    fetched.value   = true
+  }
+
   function handleWebSocketEvent(action, data) {
     if (action === 'created') {
       inventory.value.push(data)
@@ -34,5 +40,5 @@ export const useEquipmentInventoryStore = defineStore('equipmentInventory', () =
     }
   }
 
-  return { inventory, loading, error, fetched, fetchInventory, handleWebSocketEvent }
+  return { inventory, loading, error, fetched, fetchInventory, setInventory, handleWebSocketEvent }
 })
\ No newline at end of file
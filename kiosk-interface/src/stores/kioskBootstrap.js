@@ -0,0 +1,40 @@
+import { defineStore } from 'pinia'
+import { ref } from 'vue'
+import bootstrapService from '@/api/bootstrapService'
+import { useSystemConfigStore } from '@/stores/systemConfig'
+import { useDocumentTypesStore } from '@/stores/documentTypes'
+import { useEquipmentInventoryStore } from '@/stores/equipmentInventory'
+
+export const useKioskBootstrapStore = defineStore('kioskBootstrap', () => {
+  const generatedAt = ref(null)
+
+  let inFlight = null
+
+  // One conditional request on start-up and on every idle refresh; a 304
+  // leaves the stores untouched. If the bundle cannot be fetched the config
+  // is still polled so the maintenance wall keeps working, and the other
+  // stores fall back to their own fetch when a screen needs them.
+  async function refresh() {
+    if (inFlight) return inFlight
+    inFlight = _refresh().finally(() => { inFlight = null })
+    return inFlight
+  }
+
+  async function _refresh() {
+    const systemConfigStore = useSystemConfigStore()
+    try {
+      const bundle = await bootstrapService.getKioskBootstrap()
+      if (!bundle) return
+
+      useDocumentTypesStore().setTypes(bundle.document_types)
+      useEquipmentInventoryStore().setInventory(bundle.equipment)
+      generatedAt.value = bundle.generated_at
+      await systemConfigStore.setConfig(bundle.config)
+    } catch (err) {
+      console.error('[kioskBootstrap] Refresh failed:', err)
+      await systemConfigStore.pollConfig()
+    }
+  }
+
+  return { generatedAt, refresh }
+})
@@ -44,21 +44,27 @@ export const useSystemConfigStore = defineStore('systemConfig', () => {
 
   async function pollConfig() {
     try {
-      const response   = await http.get('/kiosk/settings')
-      const prev       = config.value?.has_logo
-      config.value     = response.data
-      fetched.value    = true
-
-      if (config.value.has_logo && !prev) {
-        await _fetchLogoBlobUrl()
-      } else if (!config.value.has_logo && prev) {
-        _revokeLogo()
-      }
+      const response = await http.get('/kiosk/settings')
+      await setConfig(response.data)
     } catch (err) {
       console.error('[systemConfig] Poll failed:', err)
     }
   }
 
+  // Replaces the config (from a poll or the kiosk bootstrap bundle), fetching
+  // or dropping the logo only when has_logo flipped
+  async function setConfig(data) {
+    const prev    = config.value?.has_logo
+    config.value  = data
+    fetched.value = true
+
+    if (config.value.has_logo && !prev) {
+      await _fetchLogoBlobUrl()
+    } else if (!config.value.has_logo && prev) {
+      _revokeLogo()
+    }
+  }
+
   async function _fetchLogoBlobUrl() {
     try {
       const res = await http.get('/kiosk/settings/logo', { responseType: 'blob' })
@@ -91,6 +97,6 @@ export const useSystemConfigStore = defineStore('systemConfig', () => {
     config, loading, error, fetched,
     brgyName, brgySubname, hasLogo, logoBlobUrl,
     maintenanceMode, maintenanceMessage,
-    fetchConfig, pollConfig, refreshLogo,
+    fetchConfig, pollConfig, setConfig, refreshLogo,
   }
 })
\ No newline at end of file